@@ -0,0 +1,141 @@
+"""
+Simulated engine for kernel benchmarks.
+
+FakeEngine implements EnginePort like the real engines do: status changes on
+the kernel thread, output from a QThread worker that checks the shared
+GenerationGate before every emit. Nothing is computed, so whatever time a
+benchmark measures beyond the profile's own latencies is kernel overhead.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+
+from core.state import AppState, SystemStatus
+from core.trace import TraceEvent, TraceLevel
+from engine.gate import GenerationGate
+
+
+@dataclass(frozen=True)
+class FakeEngineProfile:
+    tokens: int = 32  # tokens per generate, unless payload["config"]["max_tokens"] is set
+    tokens_per_sec: float | None = None  # None emits as fast as the worker can
+    first_token_latency: float = 0.0  # seconds before the first token
+    load_latency: float = 0.0  # seconds spent in load_model
+    token_text: str = "tok "
+
+    def model_seconds(self, tokens: int) -> float:
+        """Time the simulated model itself spends on one generation."""
+        rate = tokens / self.tokens_per_sec if self.tokens_per_sec else 0.0
+        return self.first_token_latency + rate
+
+
+class FakeGenerator(QThread):
+    token = Signal(str)
+    usage = Signal(int)
+    done = Signal(bool)
+
+    def __init__(self, profile: FakeEngineProfile, tokens: int, gate: GenerationGate, gen_id: int):
+        super().__init__()
+        self.profile = profile
+        self.tokens = tokens
+        self.gate = gate
+        self.gen_id = gen_id
+
+    def _superseded(self) -> bool:
+        if self.gate.is_current(self.gen_id):
+            return False
+        self.gate.discard()
+        return True
+
+    def run(self) -> None:
+        completed = False
+        interval = 1.0 / self.profile.tokens_per_sec if self.profile.tokens_per_sec else 0.0
+        try:
+            if self.profile.first_token_latency:
+                time.sleep(self.profile.first_token_latency)
+            start = time.perf_counter()
+            for count in range(1, self.tokens + 1):
+                if self.isInterruptionRequested() or self._superseded():
+                    return
+                if interval:
+                    # Pace against the start time so emit overhead does not accumulate.
+                    delay = start + (count - 1) * interval - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                self.token.emit(self.profile.token_text)
+                self.usage.emit(count)
+            completed = True
+        finally:
+            self.done.emit(completed)
+
+
+class FakeEngine(QObject):
+    sig_token = Signal(str)
+    sig_trace = Signal(str)
+    sig_trace_event = Signal(object)
+    sig_status = Signal(SystemStatus)
+    sig_usage = Signal(int)
+    sig_finished = Signal()
+
+    def __init__(self, state: AppState | None = None, profile: FakeEngineProfile | None = None):
+        super().__init__()
+        self.state = state
+        self.profile = profile or FakeEngineProfile()
+        self.gate = GenerationGate()
+        self.worker: FakeGenerator | None = None
+        self.generations = 0
+
+    def set_model_path(self, payload: dict) -> None:
+        pass
+
+    def load_model(self) -> None:
+        self.sig_status.emit(SystemStatus.LOADING)
+        QTimer.singleShot(
+            int(self.profile.load_latency * 1000), lambda: self.sig_status.emit(SystemStatus.READY)
+        )
+
+    def unload_model(self) -> None:
+        self.sig_status.emit(SystemStatus.UNLOADING)
+        QTimer.singleShot(0, lambda: self.sig_status.emit(SystemStatus.READY))
+
+    def generate(self, payload: dict) -> None:
+        if self.worker is not None and self.worker.isRunning():
+            self._trace(TraceLevel.ERROR, "fake.generate.busy", "Busy. Wait for completion.")
+            self.sig_status.emit(SystemStatus.ERROR)
+            return
+        tokens = int(payload.get("config", {}).get("max_tokens", self.profile.tokens))
+        self.generations += 1
+        self.sig_status.emit(SystemStatus.RUNNING)
+        self.worker = FakeGenerator(self.profile, tokens, self.gate, self.gate.active)
+        self.worker.token.connect(self.sig_token)
+        self.worker.usage.connect(self.sig_usage)
+        self.worker.done.connect(self._on_done)
+        self.worker.start()
+
+    def stop_generation(self) -> None:
+        if self.worker is not None and self.worker.isRunning():
+            self.worker.requestInterruption()
+
+    def _on_done(self, completed: bool) -> None:
+        worker, self.worker = self.worker, None
+        if worker is not None:
+            worker.wait()
+            worker.deleteLater()
+        if completed:
+            self.sig_finished.emit()
+        self.sig_status.emit(SystemStatus.READY)
+
+    def _trace(self, level: TraceLevel, code: str, message: str) -> None:
+        event = TraceEvent(level, code, message)
+        self.sig_trace_event.emit(event)
+        self.sig_trace.emit(event.text())
+
+    def shutdown(self) -> None:
+        if self.worker is not None:
+            self.worker.requestInterruption()
+            self.worker.wait(1500)
+            self.worker = None
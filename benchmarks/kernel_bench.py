@@ -0,0 +1,377 @@
+"""
+Kernel throughput benchmarks against simulated engines.
+
+Measures the MonoBridge -> MonoDock -> MonoGuard -> EngineBridge -> subscriber
+path with FakeEngine, so model speed drops out of the numbers:
+
+    python -m benchmarks.kernel_bench --out results.json
+    python -m benchmarks.kernel_bench --scenario stop_storm --scale 0.2
+    python -m benchmarks.kernel_bench --compare baseline.json
+
+Results are JSON ({"meta", "scale", "results": {scenario: {metric: value}}});
+--compare prints the change of every metric against an earlier run and flags
+the ones that moved the wrong way by more than --threshold.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import platform
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from PySide6 import __version__ as pyside_version
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from benchmarks.fake_engine import FakeEngine, FakeEngineProfile
+from core.kernel_config import DEFAULT_KERNEL_CONFIG
+from core.state import AppState
+from core.task import Task, TaskStatus
+from engine.bridge import EngineBridge
+from monokernel.bridge import MonoBridge
+from monokernel.dock import MonoDock
+from monokernel.guard import MonoGuard
+from monokernel.metrics import LatencyWindow
+from monokernel.relay import TaskRelay
+
+SCHEMA_VERSION = 1
+TERMINAL_STATUSES = (TaskStatus.DONE, TaskStatus.FAILED, TaskStatus.CANCELLED)
+# Metrics where a larger value is an improvement; everything else is a cost.
+HIGHER_IS_BETTER = {"tasks_per_sec", "tokens_per_sec", "completed"}
+
+# Storms measure kernel cost, not admission control.
+UNLIMITED_CONFIG = copy.deepcopy(DEFAULT_KERNEL_CONFIG)
+UNLIMITED_CONFIG["queue_limits"] = {
+    "engine": {"max_depth": None},
+    "addon": {"max_depth": None},
+    "engines": {},
+    "addons": {},
+}
+
+
+@dataclass
+class BenchKernel:
+    fakes: dict[str, FakeEngine]
+    engines: dict[str, EngineBridge]
+    guard: MonoGuard
+    dock: MonoDock
+    bridge: MonoBridge
+    relay: TaskRelay
+
+    def submit(self, source: str, target: str = "llm", priority: int = 2, **payload) -> Task:
+        task = self.bridge.wrap(source, "generate", target, payload=payload, priority=priority)
+        self.bridge.submit(task)
+        return task
+
+    def shutdown(self) -> None:
+        self.guard.stop()
+        for engine in self.engines.values():
+            engine.shutdown()
+
+
+def build_bench_kernel(
+    profiles: dict[str, FakeEngineProfile], config: dict | None = None
+) -> BenchKernel:
+    """The production kernel stack over fake engines; no journal, nothing on disk."""
+    state = AppState()
+    fakes = {key: FakeEngine(state, profile) for key, profile in profiles.items()}
+    engines = {key: EngineBridge(fake, name=key) for key, fake in fakes.items()}
+    guard = MonoGuard(state, engines)
+    dock = MonoDock(guard, None, config or UNLIMITED_CONFIG)
+    bridge = MonoBridge(dock)
+    relay = TaskRelay(guard, bridge)
+    return BenchKernel(fakes, engines, guard, dock, bridge, relay)
+
+
+def run_until(
+    kernel: BenchKernel, predicate: Callable[[], bool], timeout: float, on_token: bool = False
+) -> bool:
+    """
+    Spin the Qt loop until predicate holds. It is checked on every kernel
+    status change, and on every token with on_token (which adds to the cost
+    being measured, so only use it to wait for first output).
+    """
+    if predicate():
+        return True
+    loop = QEventLoop()
+
+    def _check(*_args) -> None:
+        if predicate():
+            loop.quit()
+
+    signals = [kernel.guard.sig_status, kernel.guard.sig_engine_ready]
+    if on_token:
+        signals.append(kernel.guard.sig_token)
+    for signal in signals:
+        signal.connect(_check)
+    QTimer.singleShot(int(timeout * 1000), loop.quit)
+    loop.exec()
+    for signal in signals:
+        signal.disconnect(_check)
+    return predicate()
+
+
+def _all_finished(tasks: list[Task]) -> Callable[[], bool]:
+    # Finished tasks are popped once, so checking after every READY of a
+    # 10k-task drain stays linear overall.
+    remaining = list(tasks)
+
+    def _check() -> bool:
+        while remaining and remaining[-1].status in TERMINAL_STATUSES:
+            remaining.pop()
+        return not remaining
+
+    return _check
+
+
+def _ms_percentiles(values: list[float | None], prefix: str) -> dict[str, float | None]:
+    window = LatencyWindow(max(1, len(values)))
+    for value in values:
+        window.add(value)
+    return {
+        f"{prefix}_{name}_ms": None if value is None else round(value * 1000, 3)
+        for name, value in window.percentiles().items()
+    }
+
+
+def _counts(tasks: list[Task]) -> dict[str, int]:
+    counts = {status.value.lower(): 0 for status in TERMINAL_STATUSES}
+    for task in tasks:
+        if task.status in TERMINAL_STATUSES:
+            counts[task.status.value.lower()] += 1
+    return counts
+
+
+# ---- scenarios ----
+
+
+def bench_enqueue_storm(scale: float) -> dict:
+    """Many small generates from several addons submitted in one burst."""
+    count = max(10, int(5000 * scale))
+    addons = 8
+    kernel = build_bench_kernel({"llm": FakeEngineProfile(tokens=4)})
+    try:
+        started = time.perf_counter()
+        tasks = [kernel.submit(f"bench:{i % addons}", prompt="x") for i in range(count)]
+        enqueued = time.perf_counter()
+        finished = run_until(kernel, _all_finished(tasks), timeout=120)
+        drained = time.perf_counter()
+        result = {
+            "tasks": count,
+            "completed": int(finished),
+            "enqueue_us": round((enqueued - started) / count * 1e6, 3),
+            "drain_seconds": round(drained - enqueued, 4),
+            "tasks_per_sec": round(count / (drained - started), 1),
+        }
+        result.update(_counts(tasks))
+        result.update(_ms_percentiles([task.queue_wait() for task in tasks], "queue_wait"))
+        result.update(_ms_percentiles([task.run_time() for task in tasks], "run_time"))
+        return result
+    finally:
+        kernel.shutdown()
+
+
+def bench_stop_storm(scale: float) -> dict:
+    """Repeated STOP of a streaming generation while more work is queued behind it."""
+    rounds = max(5, int(300 * scale))
+    profile = FakeEngineProfile(tokens=1_000_000, tokens_per_sec=20_000)
+    kernel = build_bench_kernel({"llm": profile})
+    latencies: list[float | None] = []
+    leaked = 0
+    try:
+        for _round in range(rounds):
+            task = kernel.submit("bench", prompt="x")
+            queued = [kernel.submit("bench:queued", prompt="x") for _ in range(3)]
+            if not run_until(kernel, lambda: task.first_output_at is not None, timeout=10, on_token=True):
+                break
+            after_stop = [0]
+
+            def _count(_token: str) -> None:
+                after_stop[0] += 1
+
+            kernel.guard.task_channel(str(task.id)).sig_token.connect(_count)
+            stopped = time.perf_counter()
+            kernel.bridge.stop("llm")
+            finished = run_until(kernel, _all_finished([task, *queued]), timeout=10)
+            latencies.append(time.perf_counter() - stopped if finished else None)
+            leaked += after_stop[0]
+            kernel.guard.release_task_channel(str(task.id))
+        discarded = kernel.engines["llm"].discard_stats()
+        done = [value for value in latencies if value is not None]
+        result = {
+            "rounds": rounds,
+            "completed": len(done),
+            "tokens_after_stop": leaked,
+            "discarded_source": discarded["source"],
+            "discarded_bridge": discarded["bridge"],
+        }
+        result.update(_ms_percentiles(done, "stop_to_idle"))
+        return result
+    finally:
+        kernel.shutdown()
+
+
+def bench_subscribers(scale: float) -> dict:
+    """One long unthrottled generation fanned out to growing numbers of subscribers."""
+    tokens = max(1000, int(20_000 * scale))
+    result: dict = {"tokens": tokens}
+    for subscribers in (1, 16, 128):
+        kernel = build_bench_kernel({"llm": FakeEngineProfile(tokens=tokens)})
+        try:
+            received = [0]
+
+            def _count(_token: str) -> None:
+                received[0] += 1
+
+            # Spread over the three channel scopes the UI actually uses.
+            task = kernel.bridge.wrap("bench", "generate", "llm", payload={"prompt": "x"})
+            scopes = (
+                kernel.guard.task_channel(str(task.id)),
+                kernel.guard.addon_channel("bench"),
+                kernel.guard.engine_channel("llm"),
+            )
+            for index in range(subscribers):
+                scopes[index % len(scopes)].sig_token.connect(_count)
+            started = time.perf_counter()
+            kernel.bridge.submit(task)
+            run_until(kernel, _all_finished([task]), timeout=120)
+            elapsed = time.perf_counter() - started
+            delivered = received[0] / subscribers
+            result[f"s{subscribers}_tokens_per_sec"] = round(delivered / elapsed, 1)
+            result[f"s{subscribers}_us_per_token"] = round(elapsed / max(1, delivered) * 1e6, 3)
+            result[f"s{subscribers}_lost"] = tokens * subscribers - received[0]
+        finally:
+            kernel.shutdown()
+    return result
+
+
+def bench_long_queue(scale: float) -> dict:
+    """Insert, interactive latency and drain against a deep mixed-priority backlog."""
+    depth = max(100, int(10_000 * scale))
+    kernel = build_bench_kernel({"llm": FakeEngineProfile(tokens=1)})
+    try:
+        tasks: list[Task] = []
+        chunk = max(1, depth // 10)
+        chunk_times = []
+        for start in range(0, depth, chunk):
+            began = time.perf_counter()
+            for i in range(start, min(depth, start + chunk)):
+                priority = 3 if i % 4 == 0 else 2
+                tasks.append(kernel.submit(f"batch:{i % 3}", priority=priority, prompt="x"))
+            chunk_times.append((time.perf_counter() - began) / chunk)
+        interactive = kernel.submit("terminal:bench", prompt="x")
+        position = list(kernel.dock.queues["llm"]).index(interactive)
+
+        began = time.perf_counter()
+        kernel.dock.queue_snapshot()
+        snapshot_time = time.perf_counter() - began
+
+        began = time.perf_counter()
+        finished = run_until(kernel, _all_finished([*tasks, interactive]), timeout=300)
+        drain = time.perf_counter() - began
+        return {
+            "depth": depth,
+            "completed": int(finished),
+            "insert_first_us": round(chunk_times[0] * 1e6, 3),
+            "insert_last_us": round(chunk_times[-1] * 1e6, 3),
+            "snapshot_us": round(snapshot_time * 1e6, 3),
+            "interactive_position": position,
+            "interactive_wait_ms": round((interactive.queue_wait() or 0.0) * 1000, 3),
+            "drain_seconds": round(drain, 4),
+            "tasks_per_sec": round((depth + 1) / drain, 1),
+        }
+    finally:
+        kernel.shutdown()
+
+
+SCENARIOS: dict[str, Callable[[float], dict]] = {
+    "enqueue_storm": bench_enqueue_storm,
+    "stop_storm": bench_stop_storm,
+    "subscribers": bench_subscribers,
+    "long_queue": bench_long_queue,
+}
+
+
+# ---- reporting ----
+
+
+def run_suite(names: list[str], scale: float) -> dict:
+    results = {}
+    for name in names:
+        began = time.perf_counter()
+        results[name] = SCENARIOS[name](scale)
+        results[name]["wall_seconds"] = round(time.perf_counter() - began, 4)
+        print(f"bench: {name} done in {results[name]['wall_seconds']:.2f}s", file=sys.stderr, flush=True)
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pyside6": pyside_version,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "scale": scale,
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Per-metric changes; lines for regressions beyond threshold start with '!'."""
+    lines = []
+    if baseline.get("scale") != current.get("scale"):
+        lines.append(f"! scale differs: baseline {baseline.get('scale')} vs {current.get('scale')}")
+    for name, metrics in current["results"].items():
+        before = baseline.get("results", {}).get(name, {})
+        for metric, value in metrics.items():
+            old = before.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            change = (value - old) / abs(old)
+            worse = -change if metric.endswith(tuple(HIGHER_IS_BETTER)) else change
+            flag = "!" if worse > threshold and metric != "wall_seconds" else " "
+            lines.append(f"{flag} {name}.{metric}: {old} -> {value} ({change:+.1%})")
+    return lines
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.kernel_bench")
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), help="run only this scenario (repeatable)"
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply task/token counts (default: 1.0)")
+    parser.add_argument("--out", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="earlier results JSON to diff against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="relative change counted as a regression (default: 0.10)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    report = run_suite(args.scenario or list(SCENARIOS), args.scale)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        lines = compare(baseline, report, args.threshold)
+        for line in lines:
+            print(line, file=sys.stderr)
+        if any(line.startswith("!") for line in lines):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
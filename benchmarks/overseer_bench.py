@@ -0,0 +1,211 @@
+"""
+OverseerDB query benchmark on a synthetic log.
+
+Fills a throwaway overseer database with --rows events and --rows traces
+(10M by default; a few minutes and a few GB of disk), then times every query
+shape the overseer uses (including full-text search), first without the
+secondary indexes and then with them:
+
+    python -m benchmarks.overseer_bench --out overseer.json
+    python -m benchmarks.overseer_bench --rows 1000000 --path /tmp/overseer.sqlite3 --keep
+
+Results are JSON in the kernel_bench layout, one scenario per phase
+("unindexed", "indexed"), each metric the median of --repeat runs in ms.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from core.overseer_db import _INDEXES, OverseerDB
+
+SCHEMA_VERSION = 1
+ENGINES = ("llm", "vision", "audio", "llm#0", "llm#1")
+LEVELS = ("DEBUG", "INFO", "INFO", "INFO", "WARNING")
+CODES = ("engine.token", "dock.enqueue", "dock.dispatch", "guard.status", "relay.done")
+ROWS_PER_TASK = 50
+# One row in RARE_EVERY is a rare kind (error event, ERROR trace, engine.load code).
+RARE_EVERY = 10_000
+FILL_BATCH = 50_000
+BASE_TS = datetime(2026, 1, 1, tzinfo=timezone.utc)
+RETENTION_OFF = {"interval": 0}
+
+
+def _event_rows(start: int, count: int):
+    for i in range(start, start + count):
+        ts = (BASE_TS + timedelta(milliseconds=100 * i)).isoformat()
+        event = "error" if i % RARE_EVERY == 0 else ("finished" if i % 7 == 0 else "status")
+        yield ts, ENGINES[i % len(ENGINES)], event, '{"status": "READY"}'
+
+
+def _trace_rows(start: int, count: int):
+    for i in range(start, start + count):
+        ts = (BASE_TS + timedelta(milliseconds=100 * i)).isoformat()
+        rare = i % RARE_EVERY == 0
+        yield (
+            ts,
+            "ERROR" if rare else LEVELS[i % len(LEVELS)],
+            ENGINES[i % len(ENGINES)],
+            f"{i // ROWS_PER_TASK:032x}",
+            "engine.load.failed" if rare else CODES[i % len(CODES)],
+            "synthetic trace line",
+            None,
+        )
+
+
+def drop_indexes(path: Path) -> None:
+    conn = sqlite3.connect(path)
+    for name in _INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.close()
+
+
+def fill(path: Path, rows: int) -> float:
+    """Create the schema and insert rows events and traces, indexes added afterwards."""
+    OverseerDB(retention=RETENTION_OFF, path=path).close()
+    drop_indexes(path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA synchronous=OFF")
+    began = time.perf_counter()
+    for start in range(0, rows, FILL_BATCH):
+        count = min(FILL_BATCH, rows - start)
+        with conn:
+            conn.executemany(
+                "INSERT INTO events(ts, engine_key, event, payload) VALUES(?, ?, ?, ?)", _event_rows(start, count)
+            )
+            conn.executemany(
+                "INSERT INTO traces(ts, level, engine_key, task_id, code, message, fields) "
+                "VALUES(?, ?, ?, ?, ?, ?, ?)",
+                _trace_rows(start, count),
+            )
+        print(f"bench: filled {start + count}/{rows}", file=sys.stderr, end="\r", flush=True)
+    print(file=sys.stderr)
+    conn.close()
+    return time.perf_counter() - began
+
+
+def _median_ms(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - began) * 1000)
+    return round(statistics.median(times), 3)
+
+
+def _stream_rate(db: OverseerDB, limit: int) -> float:
+    began = time.perf_counter()
+    count = 0
+    for _row in db.iter_events(engine_key="vision"):
+        count += 1
+        if count >= limit:
+            break
+    return round(count / (time.perf_counter() - began), 1)
+
+
+def measure(db: OverseerDB, rows: int, repeat: int) -> dict:
+    middle = rows // 2
+    window_start = (BASE_TS + timedelta(milliseconds=100 * middle)).isoformat()
+    window_end = (BASE_TS + timedelta(milliseconds=100 * middle, hours=1)).isoformat()
+    middle_task = f"{middle // ROWS_PER_TASK:032x}"
+    queries: dict[str, Callable[[], object]] = {
+        "recent_events_ms": lambda: db.get_recent_events(500),
+        "events_by_engine_ms": lambda: db.query_events(engine_key="vision"),
+        "events_by_engine_event_ms": lambda: db.query_events(engine_key="audio", event="finished"),
+        "events_rare_event_ms": lambda: db.query_events(event="error"),
+        "events_time_window_ms": lambda: db.query_events(after=window_start, before=window_end),
+        "events_keyset_deep_page_ms": lambda: db.query_events(engine_key="llm", before_id=middle),
+        "traces_by_task_ms": lambda: db.query_traces(task_id=middle_task),
+        "traces_error_level_ms": lambda: db.query_traces(level="ERROR"),
+        "traces_code_prefix_ms": lambda: db.query_traces(code_prefix="engine.load"),
+        "traces_engine_level_ms": lambda: db.query_traces(engine_key="audio", level="WARNING"),
+        "search_common_ms": lambda: db.search("synthetic"),
+        "search_rare_ms": lambda: db.search("engine.load"),
+    }
+    results = {}
+    for name, query in queries.items():
+        results[name] = _median_ms(query, repeat)
+        print(f"bench: {name} {results[name]} ms", file=sys.stderr, flush=True)
+    results["stream_events_per_second"] = _stream_rate(db, min(rows // len(ENGINES), 200_000))
+    return results
+
+
+def run(path: Path, rows: int, repeat: int) -> dict:
+    fill_seconds = fill(path, rows)
+
+    # Opening an OverseerDB creates its indexes, so drop them again for this phase.
+    db = OverseerDB(retention=RETENTION_OFF, path=path)
+    drop_indexes(path)
+    unindexed = measure(db, rows, repeat)
+    db.close()
+
+    began = time.perf_counter()
+    db = OverseerDB(retention=RETENTION_OFF, path=path)
+    index_seconds = time.perf_counter() - began
+    conn = sqlite3.connect(path)
+    conn.execute("ANALYZE")
+    conn.close()
+    indexed = measure(db, rows, repeat)
+    db.close()
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "rows": rows,
+        "results": {
+            "fill": {"seconds": round(fill_seconds, 3), "index_build_seconds": round(index_seconds, 3)},
+            "unindexed": unindexed,
+            "indexed": indexed,
+        },
+    }
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.overseer_bench")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="events and traces rows each (default: 10M)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query; the median is reported (default: 5)")
+    parser.add_argument("--path", help="database file to create (default: a temporary file)")
+    parser.add_argument("--keep", action="store_true", help="keep the database file afterwards")
+    parser.add_argument("--out", help="write the JSON results here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    with tempfile.TemporaryDirectory() as scratch:
+        path = Path(args.path) if args.path else Path(scratch) / "overseer.sqlite3"
+        if path.exists():
+            print(f"bench: {path} exists; refusing to overwrite", file=sys.stderr)
+            return 1
+        try:
+            report = run(path, args.rows, args.repeat)
+        finally:
+            if not args.keep:
+                for suffix in ("", "-wal", "-shm"):
+                    Path(f"{path}{suffix}").unlink(missing_ok=True)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,10 @@
+import os
 import sys
 
 from PySide6.QtWidgets import QApplication
 
-from core.state import AppState
-from engine.bridge import EngineBridge
-from engine.llm import LLMEngine
-from engine.vision import VisionEngine
-from monokernel.bridge import MonoBridge
-from monokernel.dock import MonoDock
-from monokernel.guard import MonoGuard
+from core.shutdown import ShutdownManager
+from headless import build_kernel
 from ui.addons.builtin import build_builtin_registry
 from ui.addons.context import AddonContext
 from ui.addons.host import AddonHost
@@ -17,20 +13,32 @@ from ui.main_window import MonolithUI
 from ui.overseer import OverseerWindow
 
 
+def _attach_daemon():
+    """RemoteKernel for a running kernel daemon, or None to run the kernel in-process."""
+    if "--local" in sys.argv[1:]:
+        return None
+    from services.remote import RemoteKernel
+
+    remote = RemoteKernel()
+    return remote if remote.attach(timeout_ms=500) else None
+
+
 def main():
     app = QApplication(sys.argv)
-    state = AppState()
-    engine_impl = LLMEngine(state)
-    engine = EngineBridge(engine_impl)
-    vision_engine_impl = VisionEngine(state)
-    vision_engine = EngineBridge(vision_engine_impl)
-    guard = MonoGuard(state, {"llm": engine, "vision": vision_engine})
-    dock = MonoDock(guard)
-    bridge = MonoBridge(dock)
+    remote = _attach_daemon()
+    if remote is not None:
+        # The daemon owns the engines; this window is one client of it.
+        runtime = None
+        state, guard, bridge, dock = remote.state, remote.guard, remote.bridge, remote.dock
+        overseer_db = recorder = None
+    else:
+        runtime = build_kernel()
+        state, guard, bridge, dock = runtime.state, runtime.guard, runtime.bridge, runtime.dock
+        overseer_db, recorder = runtime.overseer_db, runtime.recorder
 
     ui_bridge = UIBridge()
     ui = MonolithUI(state, ui_bridge)
-    overseer = OverseerWindow(guard, ui_bridge)
+    overseer = OverseerWindow(guard, ui_bridge, dock, db=overseer_db, recorder=recorder)
 
     registry = build_builtin_registry()
     ctx = AddonContext(state=state, guard=guard, bridge=bridge, ui=ui, host=None, ui_bridge=ui_bridge)
@@ -43,13 +51,28 @@ def main():
     # global chrome-only wiring stays here
     guard.sig_status.connect(ui.update_status)
     guard.sig_usage.connect(ui.update_ctx)
-    app.aboutToQuit.connect(guard.stop)
-    app.aboutToQuit.connect(overseer.db.close)
-    app.aboutToQuit.connect(lambda: guard.enable_viztracer(False) if guard._viztracer is not None else None)
-    app.aboutToQuit.connect(engine.shutdown)
-    app.aboutToQuit.connect(vision_engine.shutdown)
+    if runtime is not None:
+        shutdown = runtime.shutdown_plan()
+    else:
+        shutdown = ShutdownManager(trace=guard.trace)
+        shutdown.add("remote", remote.close)
+        shutdown.add_final("overseer_db", overseer.db.close)
+    api_port = os.environ.get("MONOLITH_API_PORT")
+    if api_port and runtime is not None:
+        from services.openai_api import OpenAIServer
+
+        api = OpenAIServer(runtime.relay, port=int(api_port))
+        api.start()
+        shutdown.add("api", api.stop)
+
+    app.aboutToQuit.connect(shutdown.run)
 
     ui.show()
+    if runtime is not None:
+        # After the UI is wired so replayed output reaches its subscribers.
+        runtime.dock.replay_journal()
+    else:
+        remote.replay_status()
     return app.exec()
 
 
@@ -0,0 +1,75 @@
+import copy
+import json
+
+from core.paths import CONFIG_DIR
+
+# Queue limits apply to queued generate tasks. "engine" and "addon" are the
+# defaults; "engines" / "addons" override them per engine key and per addon
+# (full addon_pid or its group, e.g. "terminal" for "terminal:1a2b").
+# policy is one of "reject_newest", "drop_oldest" or "block".
+#
+# engine_pools runs an engine as N replicas in worker processes, each with
+# its own compute thread budget, e.g. {"llm": {"replicas": 2, "threads": 8}};
+# "process": true isolates a single instance the same way.
+#
+# Within a priority class each addon gets a share of an engine proportional
+# to its weight (looked up by addon_pid, then group, then default_weight).
+#
+# overseer_retention bounds logs/overseer.sqlite3: every interval seconds rows
+# older than max_age_days, beyond max_rows per table or beyond max_bytes for
+# the whole file are deleted oldest first (0 disables a limit). With archive
+# set they are first appended to logs/overseer_archive/<table>-<day>.jsonl.gz.
+# Its "metrics" maps a time-series resolution (seconds per bucket) to how
+# many seconds of buckets at that resolution are kept.
+DEFAULT_KERNEL_CONFIG = {
+    "queue_limits": {
+        "engine": {"max_depth": 256, "policy": "reject_newest"},
+        "addon": {"max_depth": 64, "policy": "reject_newest"},
+        "engines": {},
+        "addons": {
+            "script": {"max_depth": 64, "policy": "block"},
+            "batch": {"max_depth": 64, "policy": "block"},
+        },
+    },
+    "engine_pools": {},
+    "fair_queuing": {
+        "default_weight": 1.0,
+        "weights": {
+            "terminal": 4.0,
+            "vision": 2.0,
+            "audio": 2.0,
+            "api": 2.0,
+        },
+    },
+    "overseer_retention": {
+        "max_age_days": 30,
+        "max_rows": 500000,
+        "max_bytes": 256 * 1024 * 1024,
+        "interval": 600,
+        "archive": False,
+        "metrics": {"1": 6 * 3600, "60": 14 * 86400, "3600": 365 * 86400},
+    },
+}
+
+KERNEL_CONFIG_PATH = CONFIG_DIR / "kernel_config.json"
+
+
+def _merge(base: dict, override: dict) -> None:
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _merge(base[key], value)
+        else:
+            base[key] = value
+
+
+def load_kernel_config():
+    config = copy.deepcopy(DEFAULT_KERNEL_CONFIG)
+    if KERNEL_CONFIG_PATH.exists():
+        try:
+            with KERNEL_CONFIG_PATH.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+                if isinstance(data, dict):
+                    _merge(config, data)
+        except Exception:
+            pass
+    return config
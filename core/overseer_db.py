@@ -1,21 +1,200 @@
 from __future__ import annotations
 
+import gzip
 import json
+import queue
 import sqlite3
 import threading
-from datetime import datetime, timezone
-from typing import Any
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from pathlib import Path
+from time import monotonic, time
+from typing import Any, Iterator
 
+from core.kernel_config import load_kernel_config
 from core.paths import LOG_DIR
+from core.trace import TraceEvent
 
+ARCHIVE_DIR = LOG_DIR / "overseer_archive"
+TABLES = ("events", "tasks", "traces")
+# Rows deleted per transaction while pruning, so readers wait at most one chunk.
+PRUNE_CHUNK = 5000
+# Extra share of each table dropped when over max_bytes, so the next rows
+# written do not push the file straight back over.
+SIZE_PRUNE_MARGIN = 0.05
+
+_STOP = object()
+_MAINTAIN = object()
+
+
+class _Compact:
+    """compact() request; done is set once its maintenance pass has finished."""
 
-class OverseerDB:
     def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+_EVENT_COLUMNS = "id, ts, engine_key, event, payload"
+_TASK_COLUMNS = "id, task_id, engine_key, status, ts"
+_TRACE_COLUMNS = "id, ts, level, engine_key, task_id, code, message, fields"
+
+# Each filter the query methods accept has an index; the rowid is implicitly
+# the last index column, so "filter + ORDER BY id" walks the index in order.
+_INDEXES = {
+    "events_engine_event": "events(engine_key, event)",
+    "events_event": "events(event)",
+    "events_ts": "events(ts)",
+    "tasks_task": "tasks(task_id)",
+    "traces_task": "traces(task_id)",
+    "traces_engine_level": "traces(engine_key, level)",
+    "traces_level": "traces(level)",
+    "traces_code": "traces(code)",
+}
+
+
+# Full-text indexes (external content, so the text is stored once) kept in
+# sync by triggers: the writer's inserts and retention's deletes update them
+# in the same transaction.
+_SEARCH_COLUMNS = {
+    "traces": ("code", "message", "fields"),
+    "events": ("event", "payload"),
+}
+# Matches ranked per table and search; older ones are only found by narrower queries.
+SEARCH_WINDOW = 2000
+# Marks the matched terms in search snippets.
+HIT_START = "«"
+HIT_END = "»"
+
+
+def _search_schema(table: str) -> list[str]:
+    columns = _SEARCH_COLUMNS[table]
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5({names}, content='{table}', content_rowid='id')",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {table}_fts(rowid, {names}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {table}_fts({table}_fts, rowid, {names}) VALUES ('delete', old.id, {old}); END",
+    ]
+
+
+def _search_query(text: str) -> str:
+    """
+    FTS5 query for free text: every word must match, the last one as a prefix.
+
+    Words are quoted, so punctuation in codes and paths ("engine.load",
+    "C:\\models") is matched as a phrase instead of being read as syntax.
+    """
+    terms = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _event_filters(
+    engine_key: str | None, event: str | None, after: str | None, before: str | None
+) -> tuple[list[str], list[Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if engine_key is not None:
+        clauses.append("engine_key = ?")
+        params.append(engine_key)
+    if event is not None:
+        clauses.append("event = ?")
+        params.append(event)
+    # Unary + keeps the planner off the ts index: the window is served as an
+    # id range (see OverseerDB._ts_window), these only trim its edges.
+    if after is not None:
+        clauses.append("+ts >= ?")
+        params.append(after)
+    if before is not None:
+        clauses.append("+ts <= ?")
+        params.append(before)
+    return clauses, params
+
+
+def _trace_filters(
+    level: str | None, engine_key: str | None, task_id: str | None, code_prefix: str | None
+) -> tuple[list[str], list[Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if level is not None:
+        clauses.append("level = ?")
+        params.append(level)
+    if engine_key is not None:
+        clauses.append("engine_key = ?")
+        params.append(engine_key)
+    if task_id is not None:
+        clauses.append("task_id = ?")
+        params.append(task_id)
+    if code_prefix:
+        # A range rather than LIKE, so the code index applies.
+        clauses.append("code >= ? AND code < ?")
+        params.extend((code_prefix, code_prefix[:-1] + chr(ord(code_prefix[-1]) + 1)))
+    return clauses, params
+
+
+def _row_to_trace_dict(row: sqlite3.Row) -> dict[str, Any]:
+    item = dict(row)
+    item["fields"] = json.loads(item["fields"]) if item["fields"] else {}
+    return item
+
+
+class OverseerDB:
+    """
+    Overseer log in SQLite.
+
+    log_* calls run on the GUI thread for every trace line, so they only put
+    the row on a bounded in-memory queue. A writer thread commits whatever
+    accumulated within flush_interval (at most max_batch rows) as one
+    transaction. When the queue is full the row is dropped and counted rather
+    than blocking the caller. close() writes everything still queued.
+
+    The same thread applies the overseer_retention policy (kernel_config)
+    every interval seconds: old rows are pruned oldest first, optionally
+    archived to gzip files per table and day, and the freed pages returned to
+    the filesystem with incremental vacuum. Between prune chunks it keeps
+    committing new rows and answering flush(), so queries never wait for a
+    whole maintenance pass. A database created before retention existed only
+    shrinks on disk after compact() has converted it.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.25,
+        max_batch: int = 1024,
+        max_queue: int = 10000,
+        retention: dict | None = None,
+        path: Path | None = None,
+    ) -> None:
+        self.path = path or LOG_DIR / "overseer.sqlite3"
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.retention = retention if retention is not None else load_kernel_config()["overseer_retention"]
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max_queue)
         self._lock = threading.Lock()
-        self._conn: sqlite3.Connection | None = sqlite3.connect(LOG_DIR / "overseer.sqlite3", check_same_thread=False)
+        self._counts_lock = threading.Lock()
+        self._queued = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._batches = 0
+        self._pruned = 0
+        self._archived = 0
+        self._closed = False
+        # Sentinel taken off the queue by _drain, for _run to handle next.
+        self._held: object | None = None
+        self._conn: sqlite3.Connection | None = sqlite3.connect(self.path, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        # Effective for a new file; existing ones are converted by compact().
+        self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
         self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
         self._create_schema()
+        self._writer = threading.Thread(target=self._run, name="overseer-db", daemon=True)
+        self._writer.start()
 
     def _get_conn(self) -> sqlite3.Connection:
         if self._conn is None:
@@ -47,51 +226,126 @@ class OverseerDB:
                 )
                 """
             )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS traces(
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ts TEXT NOT NULL,
+                    level TEXT NOT NULL,
+                    engine_key TEXT NOT NULL,
+                    task_id TEXT,
+                    code TEXT NOT NULL,
+                    message TEXT NOT NULL,
+                    fields TEXT
+                )
+                """
+            )
+            # Numeric time series (monokernel.timeseries): one row per metric,
+            # key and bucket at 1 s, 60 s and 3600 s resolution. Keyed by
+            # resolution and time first, so retention and "last N seconds"
+            # reads are both range scans.
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS metrics(
+                    resolution INTEGER NOT NULL,
+                    ts INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    sum REAL NOT NULL,
+                    min REAL NOT NULL,
+                    max REAL NOT NULL,
+                    PRIMARY KEY(resolution, ts, name, key)
+                ) WITHOUT ROWID
+                """
+            )
+            for name, columns in _INDEXES.items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {columns}")
+            self.search_enabled = self._create_search_index(conn)
             conn.commit()
 
+    def _create_search_index(self, conn: sqlite3.Connection) -> bool:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        try:
+            for table in _SEARCH_COLUMNS:
+                for statement in _search_schema(table):
+                    conn.execute(statement)
+                if f"{table}_fts" not in existing:
+                    # Index what was logged before search existed; once per database.
+                    conn.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: logging works, search() returns nothing.
+            conn.rollback()
+            return False
+        return True
+
     def _now(self) -> str:
         return datetime.now(timezone.utc).isoformat()
 
-    def log_event(self, engine_key: str, event: str, payload: Any) -> int:
-        payload_text = json.dumps(payload)
-        with self._lock:
-            conn = self._get_conn()
-            cur = conn.execute(
-                "INSERT INTO events(ts, engine_key, event, payload) VALUES(?, ?, ?, ?)",
-                (self._now(), engine_key, event, payload_text),
-            )
-            conn.commit()
-            return int(cur.lastrowid)
+    def log_event(self, engine_key: str, event: str, payload: Any) -> None:
+        self._put(
+            "INSERT INTO events(ts, engine_key, event, payload) VALUES(?, ?, ?, ?)",
+            (self._now(), engine_key, event, json.dumps(payload)),
+        )
 
-    def log_task(self, task_id: str, engine_key: str, status: str) -> int:
-        with self._lock:
-            conn = self._get_conn()
-            cur = conn.execute(
-                "INSERT INTO tasks(task_id, engine_key, status, ts) VALUES(?, ?, ?, ?)",
-                (task_id, engine_key, status, self._now()),
-            )
-            conn.commit()
-            return int(cur.lastrowid)
+    def log_task(self, task_id: str, engine_key: str, status: str) -> None:
+        self._put(
+            "INSERT INTO tasks(task_id, engine_key, status, ts) VALUES(?, ?, ?, ?)",
+            (task_id, engine_key, status, self._now()),
+        )
 
-    def get_recent_events(self, limit: int = 500) -> list[dict[str, Any]]:
-        with self._lock:
-            cur = self._get_conn().execute(
-                "SELECT id, ts, engine_key, event, payload FROM events ORDER BY id DESC LIMIT ?",
-                (limit,),
-            )
-            rows = [self._row_to_event_dict(row) for row in cur.fetchall()]
-            rows.reverse()
-            return rows
+    def log_trace(self, event: TraceEvent) -> None:
+        self._put(
+            "INSERT INTO traces(ts, level, engine_key, task_id, code, message, fields) VALUES(?, ?, ?, ?, ?, ?, ?)",
+            (
+                datetime.fromtimestamp(event.ts, timezone.utc).isoformat(),
+                event.level.value,
+                event.engine,
+                event.task_id,
+                event.code,
+                event.message,
+                json.dumps(event.fields, default=str) if event.fields else None,
+            ),
+        )
 
-    def get_recent_tasks(self, limit: int = 500) -> list[dict[str, Any]]:
-        with self._lock:
-            cur = self._get_conn().execute(
-                "SELECT id, task_id, engine_key, status, ts FROM tasks ORDER BY id DESC LIMIT ?",
-                (limit,),
-            )
-            rows = [dict(row) for row in cur.fetchall()]
-            rows.reverse()
-            return rows
+    def log_metric(
+        self, resolution: int, ts: int, name: str, key: str, count: int, total: float, low: float, high: float
+    ) -> None:
+        """One time-series bucket; a bucket written twice (e.g. across a restart) is merged."""
+        self._put(
+            "INSERT INTO metrics(resolution, ts, name, key, count, sum, min, max) VALUES(?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(resolution, ts, name, key) DO UPDATE SET count = count + excluded.count, "
+            "sum = sum + excluded.sum, min = MIN(min, excluded.min), max = MAX(max, excluded.max)",
+            (resolution, ts, name, key, count, total, low, high),
+        )
+
+    def stats(self) -> dict[str, int]:
+        """Writer counters: rows waiting, committed, dropped on a full queue, lost to failed commits, pruned."""
+        with self._counts_lock:
+            return {
+                "queued": self._queued,
+                "written": self._written,
+                "dropped": self._dropped,
+                "failed": self._failed,
+                "batches": self._batches,
+                "pruned": self._pruned,
+                "archived": self._archived,
+            }
+
+    # ---- queries ----
+    #
+    # Pages are keyset-paginated on id: pass the smallest id of a page as
+    # before_id to get the page before it, or the largest as after_id to get
+    # the one after. Pages are returned oldest first; without after_id they
+    # hold the newest matching rows. The iter_* variants stream every match
+    # page by page instead of building one list.
+
+    def get_recent_events(self, limit: int = 500, before_id: int | None = None) -> list[dict[str, Any]]:
+        return self.query_events(limit=limit, before_id=before_id)
+
+    def get_recent_tasks(self, limit: int = 500, before_id: int | None = None) -> list[dict[str, Any]]:
+        rows = self._page("tasks", _TASK_COLUMNS, [], [], limit, before_id, None)
+        return [dict(row) for row in rows]
 
     def query_events(
         self,
@@ -100,33 +354,246 @@ class OverseerDB:
         after: str | None = None,
         before: str | None = None,
         limit: int = 500,
+        before_id: int | None = None,
+        after_id: int | None = None,
+    ) -> list[dict[str, Any]]:
+        clauses, params = _event_filters(engine_key, event, after, before)
+        self._ts_window("events", after, before, clauses, params)
+        rows = self._page("events", _EVENT_COLUMNS, clauses, params, limit, before_id, after_id)
+        return [self._row_to_event_dict(row) for row in rows]
+
+    def query_traces(
+        self,
+        level: str | None = None,
+        engine_key: str | None = None,
+        task_id: str | None = None,
+        code_prefix: str | None = None,
+        limit: int = 500,
+        before_id: int | None = None,
+        after_id: int | None = None,
     ) -> list[dict[str, Any]]:
-        clauses: list[str] = []
-        params: list[Any] = []
-
-        if engine_key is not None:
-            clauses.append("engine_key = ?")
-            params.append(engine_key)
-        if event is not None:
-            clauses.append("event = ?")
-            params.append(event)
-        if after is not None:
-            clauses.append("ts >= ?")
-            params.append(after)
-        if before is not None:
-            clauses.append("ts <= ?")
-            params.append(before)
+        clauses, params = _trace_filters(level, engine_key, task_id, code_prefix)
+        rows = self._page("traces", _TRACE_COLUMNS, clauses, params, limit, before_id, after_id)
+        return [_row_to_trace_dict(row) for row in rows]
 
+    def iter_events(
+        self,
+        engine_key: str | None = None,
+        event: str | None = None,
+        after: str | None = None,
+        before: str | None = None,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        newest_first: bool = False,
+        page_size: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        clauses, params = _event_filters(engine_key, event, after, before)
+        self._ts_window("events", after, before, clauses, params)
+        for row in self._stream("events", _EVENT_COLUMNS, clauses, params, after_id, before_id, newest_first, page_size):
+            yield self._row_to_event_dict(row)
+
+    def iter_traces(
+        self,
+        level: str | None = None,
+        engine_key: str | None = None,
+        task_id: str | None = None,
+        code_prefix: str | None = None,
+        after_id: int | None = None,
+        before_id: int | None = None,
+        newest_first: bool = False,
+        page_size: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        clauses, params = _trace_filters(level, engine_key, task_id, code_prefix)
+        for row in self._stream("traces", _TRACE_COLUMNS, clauses, params, after_id, before_id, newest_first, page_size):
+            yield _row_to_trace_dict(row)
+
+    def _ts_window(
+        self, table: str, after: str | None, before: str | None, clauses: list[str], params: list[Any]
+    ) -> None:
+        """Add the id range covering a ts window; ids follow ts, so ORDER BY id stays an index walk."""
+        if after is None and before is None:
+            return
+        self.flush()
+        with self._lock:
+            conn = self._get_conn()
+            bounds = []
+            if after is not None:
+                row = conn.execute(f"SELECT id FROM {table} WHERE ts >= ? ORDER BY ts LIMIT 1", (after,)).fetchone()
+                bounds.append(("id >= ?", row))
+            if before is not None:
+                row = conn.execute(
+                    f"SELECT id FROM {table} WHERE ts <= ? ORDER BY ts DESC LIMIT 1", (before,)
+                ).fetchone()
+                bounds.append(("id <= ?", row))
+        for clause, row in bounds:
+            if row is None:
+                clauses.append("0")  # no row on that side of the bound
+            else:
+                clauses.append(clause)
+                params.append(row[0])
+
+    def _select(
+        self,
+        table: str,
+        columns: str,
+        clauses: list[str],
+        params: list[Any],
+        limit: int,
+        after_id: int | None,
+        before_id: int | None,
+        descending: bool,
+    ) -> list[sqlite3.Row]:
+        clauses = list(clauses)
+        params = list(params)
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
         where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
         params.append(limit)
         with self._lock:
-            cur = self._get_conn().execute(
-                f"SELECT id, ts, engine_key, event, payload FROM events {where} ORDER BY id DESC LIMIT ?",
+            return self._get_conn().execute(
+                f"SELECT {columns} FROM {table} {where} ORDER BY id {'DESC' if descending else 'ASC'} LIMIT ?",
                 params,
-            )
-            rows = [self._row_to_event_dict(row) for row in cur.fetchall()]
+            ).fetchall()
+
+    def _page(
+        self,
+        table: str,
+        columns: str,
+        clauses: list[str],
+        params: list[Any],
+        limit: int,
+        before_id: int | None,
+        after_id: int | None,
+    ) -> list[sqlite3.Row]:
+        self.flush()
+        # after_id alone pages forward from it; otherwise take the newest rows.
+        descending = after_id is None or before_id is not None
+        rows = self._select(table, columns, clauses, params, limit, after_id, before_id, descending)
+        if descending:
             rows.reverse()
-            return rows
+        return rows
+
+    def _stream(
+        self,
+        table: str,
+        columns: str,
+        clauses: list[str],
+        params: list[Any],
+        after_id: int | None,
+        before_id: int | None,
+        newest_first: bool,
+        page_size: int,
+    ) -> Iterator[sqlite3.Row]:
+        # The lock is held per page only, so the writer keeps committing while
+        # a caller consumes the stream.
+        self.flush()
+        while True:
+            rows = self._select(table, columns, clauses, params, page_size, after_id, before_id, newest_first)
+            yield from rows
+            if len(rows) < page_size:
+                return
+            if newest_first:
+                before_id = rows[-1]["id"]
+            else:
+                after_id = rows[-1]["id"]
+
+    def query_metrics(
+        self, name: str, resolution: int, since: int, key: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Buckets of one metric from unix time since on, oldest first.
+
+        value is the bucket mean. Like search(), this reads what is committed
+        without waiting for the writer.
+        """
+        sql = (
+            "SELECT ts, key, count, sum, min, max FROM metrics "
+            "WHERE resolution = ? AND ts >= ? AND name = ?"
+        )
+        params: list[Any] = [resolution, since, name]
+        if key is not None:
+            sql += " AND key = ?"
+            params.append(key)
+        with self._lock:
+            rows = self._get_conn().execute(sql + " ORDER BY ts", params).fetchall()
+        return [
+            {"ts": row["ts"], "key": row["key"], "value": row["sum"] / row["count"], "min": row["min"], "max": row["max"]}
+            for row in rows
+        ]
+
+    # ---- search ----
+
+    def search(self, text: str, limit: int = 50) -> list[dict[str, Any]]:
+        """
+        Traces and events matching text, best match first.
+
+        Each hit has table and id (for context()), ts, level, engine_key,
+        code and snippet: the matching text with terms between HIT_START and
+        HIT_END. Rows still queued for the writer are not searched, so the
+        GUI thread never waits on a commit.
+        """
+        query = _search_query(text)
+        if not query or not self.search_enabled:
+            return []
+        try:
+            with self._lock:
+                conn = self._get_conn()
+                traces = conn.execute(
+                    "SELECT t.id, t.ts, t.level, t.engine_key, t.code, "
+                    "snippet(traces_fts, -1, ?, ?, '…', 16) AS snippet, traces_fts.rank AS rank "
+                    "FROM traces_fts JOIN traces t ON t.id = traces_fts.rowid "
+                    "WHERE traces_fts MATCH ? AND traces_fts.rowid >= ? ORDER BY traces_fts.rank LIMIT ?",
+                    (HIT_START, HIT_END, query, self._search_floor(conn, "traces", query), limit),
+                ).fetchall()
+                events = conn.execute(
+                    "SELECT e.id, e.ts, e.engine_key, e.event, "
+                    "snippet(events_fts, -1, ?, ?, '…', 16) AS snippet, events_fts.rank AS rank "
+                    "FROM events_fts JOIN events e ON e.id = events_fts.rowid "
+                    "WHERE events_fts MATCH ? AND events_fts.rowid >= ? ORDER BY events_fts.rank LIMIT ?",
+                    (HIT_START, HIT_END, query, self._search_floor(conn, "events", query), limit),
+                ).fetchall()
+        except sqlite3.OperationalError:
+            return []  # e.g. a query of punctuation only
+        hits = [{"table": "traces", **dict(row)} for row in traces]
+        hits += [
+            {
+                "table": "events",
+                "id": row["id"],
+                "ts": row["ts"],
+                "level": row["event"].upper(),
+                "engine_key": row["engine_key"],
+                "code": row["event"],
+                "snippet": row["snippet"],
+                "rank": row["rank"],
+            }
+            for row in events
+        ]
+        # bm25: lower is better.
+        hits.sort(key=lambda hit: hit["rank"])
+        return hits[:limit]
+
+    def _search_floor(self, conn: sqlite3.Connection, table: str, query: str) -> int:
+        """
+        Lowest rowid among the newest SEARCH_WINDOW matches.
+
+        Ranking scores every candidate, so a common word over months of logs
+        would take seconds; walking the matches newest first is cheap, and
+        ranking only the most recent ones keeps search in milliseconds.
+        """
+        row = conn.execute(
+            f"SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+            (query, SEARCH_WINDOW - 1),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def context(self, table: str, row_id: int, radius: int = 5) -> list[dict[str, Any]]:
+        """Up to radius rows either side of row_id in table (a search hit), oldest first."""
+        query = self.query_traces if table == "traces" else self.query_events
+        return query(limit=radius + 1, before_id=row_id + 1) + query(limit=radius, after_id=row_id)
 
     def _row_to_event_dict(self, row: sqlite3.Row) -> dict[str, Any]:
         payload_raw = row["payload"]
@@ -144,9 +611,327 @@ class OverseerDB:
             "payload": payload,
         }
 
+    # ---- writer ----
+
+    def _put(self, sql: str, params: tuple) -> None:
+        if self._closed:
+            return
+        with self._counts_lock:
+            self._queued += 1
+        try:
+            self._queue.put_nowait((sql, params))
+        except queue.Full:
+            with self._counts_lock:
+                self._queued -= 1
+                self._dropped += 1
+
+    def flush(self) -> None:
+        """Block until every row logged so far is committed."""
+        if not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
     def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
         with self._lock:
             if self._conn is None:
                 return
             self._conn.close()
             self._conn = None
+
+    def compact(self) -> None:
+        """
+        Apply the retention policy now instead of at the next interval.
+
+        A database created before incremental vacuum was enabled is also
+        rebuilt with a full VACUUM, once; that blocks writes for as long as
+        copying the file takes, so it is never done implicitly.
+        """
+        if not self._writer.is_alive():
+            return
+        request = _Compact()
+        self._queue.put(request)
+        request.done.wait()
+
+    def _run(self) -> None:
+        interval = float(self.retention.get("interval") or 0)
+        # First pass shortly after startup: a database left over from before
+        # retention existed is brought within limits right away.
+        next_maintenance = monotonic() + min(interval, 5.0) if interval > 0 else None
+        while True:
+            timeout = None if next_maintenance is None else max(0.0, next_maintenance - monotonic())
+            if self._held is not None:
+                item, self._held = self._held, None
+            else:
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = _MAINTAIN
+            batch = [item]
+            deadline = monotonic() + self.flush_interval
+            while len(batch) < self.max_batch and isinstance(item, tuple):
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            rows = [entry for entry in batch if isinstance(entry, tuple)]
+            if rows:
+                self._commit(rows)
+            # Before maintenance: these callers only wait for the rows above.
+            for entry in batch:
+                if isinstance(entry, threading.Event):
+                    entry.set()
+            if batch[-1] is _STOP:
+                return
+            request = batch[-1]
+            due = next_maintenance is not None and monotonic() >= next_maintenance
+            if isinstance(request, _Compact) or request is _MAINTAIN or due:
+                self._maintain(convert=isinstance(request, _Compact))
+                if next_maintenance is not None:
+                    next_maintenance = monotonic() + interval
+            if isinstance(request, _Compact):
+                request.done.set()
+
+    def _drain(self) -> None:
+        """Commit rows queued during maintenance and wake flush() callers."""
+        if self._held is not None:
+            return
+        rows: list[tuple[str, tuple]] = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, tuple):
+                rows.append(item)
+                continue
+            if isinstance(item, threading.Event):
+                if rows:
+                    self._commit(rows)
+                    rows = []
+                item.set()
+                continue
+            # _STOP or another maintenance request: _run takes it next.
+            self._held = item
+            break
+        if rows:
+            self._commit(rows)
+
+    def _commit(self, rows: list[tuple[str, tuple]]) -> None:
+        try:
+            with self._lock, self._get_conn():
+                conn = self._get_conn()
+                for sql, group in groupby(rows, key=lambda row: row[0]):
+                    conn.executemany(sql, [params for _sql, params in group])
+            committed = True
+        except sqlite3.Error:
+            committed = False  # drop the failed group rather than kill the writer
+        with self._counts_lock:
+            self._queued -= len(rows)
+            if committed:
+                self._written += len(rows)
+                self._batches += 1
+            else:
+                self._failed += len(rows)
+
+    # ---- retention (writer thread) ----
+
+    def _maintain(self, convert: bool = False) -> None:
+        try:
+            if convert:
+                self._enable_incremental_vacuum()
+            for table in TABLES:
+                self._prune(table, self._age_limit(table))
+                self._prune(table, self._row_limit(table))
+            self._prune_metrics()
+            max_bytes = int(self.retention.get("max_bytes") or 0)
+            for _ in range(3):
+                used = self._used_bytes()
+                if not max_bytes or used <= max_bytes:
+                    break
+                # Drop the same share of every table, a little more than the excess.
+                fraction = min(1.0, (used - max_bytes) / used + SIZE_PRUNE_MARGIN)
+                for table in TABLES:
+                    self._prune(table, self._size_limit(table, fraction))
+            with self._lock:
+                # executescript steps the pragma to completion (execute frees a
+                # single page); the checkpoint then shrinks the WAL file too,
+                # and optimize refreshes the planner statistics for the indexes.
+                self._get_conn().executescript(
+                    "PRAGMA incremental_vacuum; PRAGMA wal_checkpoint(TRUNCATE); PRAGMA optimize;"
+                )
+        except (sqlite3.Error, OSError):
+            pass  # retry at the next interval
+
+    def _prune_metrics(self) -> None:
+        now = int(time())
+        for resolution, keep in (self.retention.get("metrics") or {}).items():
+            if not keep:
+                continue
+            with self._lock, self._get_conn():
+                cur = self._get_conn().execute(
+                    "DELETE FROM metrics WHERE resolution = ? AND ts < ?", (int(resolution), now - int(keep))
+                )
+            with self._counts_lock:
+                self._pruned += cur.rowcount
+
+    def _enable_incremental_vacuum(self) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return
+            # Only takes effect on an existing file after a full VACUUM, once.
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+
+    def _used_bytes(self) -> int:
+        with self._lock:
+            conn = self._get_conn()
+            pages = conn.execute("PRAGMA page_count").fetchone()[0]
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        return (pages - free) * page_size
+
+    def _id_range(self, table: str) -> tuple[int, int] | None:
+        with self._lock:
+            low, high = self._get_conn().execute(f"SELECT MIN(id), MAX(id) FROM {table}").fetchone()
+        return None if low is None else (low, high)
+
+    def _age_limit(self, table: str) -> int | None:
+        """Highest id older than max_age_days, found by walking from the oldest row."""
+        # AUTOINCREMENT ids grow with ts, so "older" always means "lower id".
+        days = float(self.retention.get("max_age_days") or 0)
+        if days <= 0:
+            return None
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        limit = None
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._get_conn().execute(
+                    f"SELECT id, ts FROM {table} WHERE id > ? ORDER BY id LIMIT ?", (last_id, PRUNE_CHUNK)
+                ).fetchall()
+            for row in rows:
+                if row["ts"] >= cutoff:
+                    return limit
+                limit = row["id"]
+            if len(rows) < PRUNE_CHUNK:
+                return limit
+            last_id = rows[-1]["id"]
+            self._drain()
+
+    def _row_limit(self, table: str) -> int | None:
+        max_rows = int(self.retention.get("max_rows") or 0)
+        bounds = self._id_range(table)
+        if max_rows <= 0 or bounds is None:
+            return None
+        with self._lock:
+            count = self._get_conn().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        if count <= max_rows:
+            return None
+        with self._lock:
+            row = self._get_conn().execute(
+                f"SELECT id FROM {table} ORDER BY id LIMIT 1 OFFSET ?", (count - max_rows - 1,)
+            ).fetchone()
+        return row["id"] if row else None
+
+    def _size_limit(self, table: str, fraction: float) -> int | None:
+        bounds = self._id_range(table)
+        if bounds is None:
+            return None
+        low, high = bounds
+        return low + max(1, int((high - low + 1) * fraction)) - 1
+
+    def _prune(self, table: str, up_to_id: int | None) -> None:
+        """Delete (and archive) rows with id <= up_to_id, one chunk per transaction."""
+        if up_to_id is None:
+            return
+        archive = bool(self.retention.get("archive"))
+        if archive:
+            self._recover_archive(table)
+        while True:
+            parts: list[Path] = []
+            try:
+                with self._lock, self._get_conn():
+                    conn = self._get_conn()
+                    rows = conn.execute(
+                        f"SELECT * FROM {table} WHERE id <= ? ORDER BY id LIMIT ?", (up_to_id, PRUNE_CHUNK)
+                    ).fetchall()
+                    if not rows:
+                        return
+                    if archive:
+                        parts = self._archive(table, rows)
+                    conn.execute(f"DELETE FROM {table} WHERE id <= ?", (rows[-1]["id"],))
+            except BaseException:
+                # The rows are still in the database; their staged copy must
+                # not reach the archive, or the next pass would add them twice.
+                for part in parts:
+                    part.unlink(missing_ok=True)
+                raise
+            for part in parts:
+                self._append_part(part)
+            with self._counts_lock:
+                self._pruned += len(rows)
+                if archive:
+                    self._archived += len(rows)
+            self._drain()
+            if len(rows) < PRUNE_CHUNK:
+                return
+
+    def _archive(self, table: str, rows: list[sqlite3.Row]) -> list[Path]:
+        """
+        Stage rows as one .part file per day, named after the first id it holds.
+
+        Staged before the delete commits, so an OSError aborts the transaction
+        and the rows stay in the database; _append_part moves each part into
+        its day archive only once the delete has committed.
+        """
+        ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+        parts: list[Path] = []
+        try:
+            for day, group in groupby(rows, key=lambda row: row["ts"][:10]):
+                group = list(group)
+                part = ARCHIVE_DIR / f"{table}-{day}.jsonl.gz.{group[0]['id']}.part"
+                parts.append(part)
+                with gzip.open(part, "wt", encoding="utf-8") as handle:
+                    for row in group:
+                        handle.write(json.dumps(dict(row)) + "\n")
+        except OSError:
+            for part in parts:
+                part.unlink(missing_ok=True)
+            raise
+        return parts
+
+    @staticmethod
+    def _append_part(part: Path) -> None:
+        # gzip files may hold several members, so a part is appended as is.
+        archive = part.with_name(part.name.split(".jsonl.gz.", 1)[0] + ".jsonl.gz")
+        with open(archive, "ab") as handle:
+            handle.write(part.read_bytes())
+        part.unlink()
+
+    def _recover_archive(self, table: str) -> None:
+        """Finish parts left by a crash or a failed append after their delete committed."""
+        if not ARCHIVE_DIR.is_dir():
+            return
+        for part in sorted(ARCHIVE_DIR.glob(f"{table}-*.jsonl.gz.*.part")):
+            first_id = int(part.name.rsplit(".", 2)[1])
+            with self._lock:
+                kept = self._get_conn().execute(f"SELECT 1 FROM {table} WHERE id = ?", (first_id,)).fetchone()
+            if kept:
+                # The delete never committed; the rows will be staged again.
+                part.unlink()
+            else:
+                self._append_part(part)
@@ -0,0 +1,155 @@
+"""
+Coordinated application shutdown.
+
+Every component is asked to stop first, all at once, and only then waited
+for, together, against one time budget: the exit takes as long as the
+slowest component instead of the sum of all of them. Each component's
+duration is traced and appended to logs/shutdown.log.
+
+Engines take part through an optional two-phase API (see EnginePort):
+request_shutdown() must not block, shutdown_pending() reports whether their
+threads or processes are still running, and release() frees model memory
+once they are not.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from core.paths import LOG_DIR
+from core.trace import TraceLevel
+
+SHUTDOWN_BUDGET = 5.0  # seconds, for the whole shutdown
+POLL_INTERVAL = 0.01
+SHUTDOWN_LOG = LOG_DIR / "shutdown.log"
+
+TraceFn = Callable[..., None]  # MonoGuard.trace(level, code, message, **fields)
+
+
+@dataclass
+class _Component:
+    name: str
+    request: Callable[[], None]
+    pending: Callable[[], bool] | None = None
+    release: Callable[[], None] | None = None
+
+
+class ShutdownManager:
+    def __init__(self, budget: float = SHUTDOWN_BUDGET, trace: TraceFn | None = None):
+        self.budget = budget
+        self.trace = trace
+        self._components: list[_Component] = []
+        self._finals: list[_Component] = []
+        self._done = False
+        self.timings: dict[str, float] = {}
+        self.timed_out: list[str] = []
+
+    def add(
+        self,
+        name: str,
+        request: Callable[[], None],
+        pending: Callable[[], bool] | None = None,
+        release: Callable[[], None] | None = None,
+    ) -> None:
+        """Stop a component: request is called up front, release once pending() is False."""
+        self._components.append(_Component(name, request, pending, release))
+
+    def add_engine(self, name: str, engine) -> None:
+        if hasattr(engine, "request_shutdown"):
+            self.add(name, engine.request_shutdown, engine.shutdown_pending, engine.release)
+        else:
+            self.add(name, engine.shutdown)
+
+    def add_final(self, name: str, close: Callable[[], None]) -> None:
+        """Run after every component stopped (journals, databases that record the shutdown)."""
+        self._finals.append(_Component(name, close))
+
+    def run(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        start = time.monotonic()
+        deadline = start + self.budget
+
+        for component in self._components:
+            self._call(component.name, component.request)
+        waiting = [component for component in self._components if component.pending is not None]
+        for component in self._components:
+            if component.pending is None:
+                self.timings[component.name] = time.monotonic() - start
+
+        # The components stop concurrently; this loop only notices when.
+        while waiting:
+            for component in list(waiting):
+                if not self._still_pending(component):
+                    waiting.remove(component)
+                    self.timings[component.name] = time.monotonic() - start
+                    if component.release is not None:
+                        self._call(component.name, component.release)
+            if not waiting or time.monotonic() >= deadline:
+                break
+            time.sleep(POLL_INTERVAL)
+
+        for component in waiting:
+            # Still running: its memory cannot be freed safely. release()
+            # implementations only terminate what can be terminated.
+            self.timed_out.append(component.name)
+            self.timings[component.name] = time.monotonic() - start
+            if component.release is not None:
+                self._call(component.name, component.release)
+        gc.collect()
+
+        # Traced before the finals run, so the overseer database still records it.
+        self._report()
+        for component in self._finals:
+            began = time.monotonic()
+            self._call(component.name, component.request)
+            self.timings[component.name] = time.monotonic() - began
+        self._write_log(time.monotonic() - start)
+
+    def _still_pending(self, component: _Component) -> bool:
+        try:
+            return bool(component.pending())
+        except Exception:
+            return False
+
+    def _call(self, name: str, fn: Callable[[], None]) -> None:
+        try:
+            fn()
+        except Exception as exc:
+            self._trace(TraceLevel.ERROR, "shutdown.failed", f"{name}: {exc}", component=name)
+
+    def _report(self) -> None:
+        for name, seconds in self.timings.items():
+            level = TraceLevel.WARNING if name in self.timed_out else TraceLevel.INFO
+            suffix = " (budget exceeded)" if name in self.timed_out else ""
+            self._trace(
+                level, "shutdown.component", f"{name} stopped in {seconds * 1000:.0f} ms{suffix}",
+                component=name, seconds=seconds,
+            )
+
+    def _trace(self, level: TraceLevel, code: str, message: str, **fields) -> None:
+        if self.trace is not None:
+            try:
+                self.trace(level, code, message, **fields)
+            except Exception:
+                pass
+
+    def _write_log(self, total: float) -> None:
+        record = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "total": round(total, 4),
+            "budget": self.budget,
+            "components": {name: round(seconds, 4) for name, seconds in self.timings.items()},
+            "timed_out": self.timed_out,
+        }
+        try:
+            with SHUTDOWN_LOG.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
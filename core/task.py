@@ -24,6 +24,16 @@ class Task:
     priority: int
     status: TaskStatus
     timestamp: float
+    durable: bool = False
+    # Lifecycle marks on the monotonic clock, filled in by the kernel.
+    enqueued_at: float | None = None
+    dispatched_at: float | None = None
+    first_output_at: float | None = None
+    finished_at: float | None = None
+    output_units: int = 0
+    # Opaque engine snapshot of a preempted generation; consumed on resume.
+    checkpoint: object | None = None
+    preemptions: int = 0
 
     @classmethod
     def new(
@@ -33,6 +43,7 @@ class Task:
         command: str,
         payload: dict,
         priority: int = 2,
+        durable: bool = False,
     ) -> "Task":
         return cls(
             id=uuid4(),
@@ -43,4 +54,31 @@ class Task:
             priority=priority,
             status=TaskStatus.PENDING,
             timestamp=time(),
+            durable=durable,
         )
+
+    def queue_wait(self) -> float | None:
+        if self.enqueued_at is None or self.dispatched_at is None:
+            return None
+        return self.dispatched_at - self.enqueued_at
+
+    def time_to_first_output(self) -> float | None:
+        if self.dispatched_at is None or self.first_output_at is None:
+            return None
+        return self.first_output_at - self.dispatched_at
+
+    def run_time(self) -> float | None:
+        if self.dispatched_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.dispatched_at
+
+    def timing(self) -> dict[str, float | None]:
+        return {
+            "enqueued_at": self.enqueued_at,
+            "dispatched_at": self.dispatched_at,
+            "first_output_at": self.first_output_at,
+            "finished_at": self.finished_at,
+            "queue_wait": self.queue_wait(),
+            "time_to_first_output": self.time_to_first_output(),
+            "run_time": self.run_time(),
+        }
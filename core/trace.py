@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum
+from time import time
+
+
+class TraceLevel(Enum):
+    DEBUG = "DEBUG"
+    INFO = "INFO"
+    WARNING = "WARNING"
+    ERROR = "ERROR"
+
+
+@dataclass(frozen=True)
+class TraceEvent:
+    """
+    One kernel trace record.
+
+    code is a dotted identifier whose first segment names the source
+    ("llm.load.online", "guard.accepted"); consumers filter on level and code
+    instead of parsing message text. engine and task_id are stamped by
+    MonoGuard when it routes the event.
+    """
+
+    level: TraceLevel
+    code: str
+    message: str
+    engine: str = ""
+    task_id: str | None = None
+    fields: dict = field(default_factory=dict)
+    ts: float = field(default_factory=time)
+
+    @property
+    def source(self) -> str:
+        return self.code.split(".", 1)[0]
+
+    def text(self) -> str:
+        """Plain-text form, as carried by the sig_trace string signals."""
+        label = f"{self.level.value}: " if self.level in (TraceLevel.WARNING, TraceLevel.ERROR) else ""
+        return f"{self.source.upper()}: {label}{self.message}"
+
+    @classmethod
+    def from_text(cls, source: str, message: str) -> "TraceEvent":
+        """Wrap a string from an engine that only emits sig_trace."""
+        lowered = message.lower()
+        if "error" in lowered:
+            level = TraceLevel.ERROR
+        elif "warn" in lowered:
+            level = TraceLevel.WARNING
+        else:
+            level = TraceLevel.INFO
+        for prefix in ("ERROR: ", "WARNING: "):
+            if message.startswith(prefix):
+                message = message[len(prefix):]
+        return cls(level, f"{source}.text", message)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QObject, QThread, Signal, QTimer
+
+from core.state import AppState, SystemStatus
+from core.trace import TraceEvent, TraceLevel
+from engine.base import shutdown_blocking
+from engine.gate import GenerationGate
+
+
+class AudioGenWorker(QThread):
+    audio = Signal(object)
+    trace = Signal(object)
+    model_ready = Signal(object)
+    done = Signal(bool, str)
+
+    def __init__(
+        self,
+        model,
+        model_path: str,
+        prompt: str,
+        duration: float,
+        sample_rate: int,
+        gate: GenerationGate | None = None,
+        gen_id: int = 0,
+    ):
+        super().__init__()
+        self.model = model
+        self.model_path = model_path
+        self.prompt = prompt
+        self.duration = duration
+        self.sample_rate = sample_rate
+        self.gate = gate
+        self.gen_id = gen_id
+
+    def _superseded(self) -> bool:
+        if self.gate is None or self.gate.is_current(self.gen_id):
+            return False
+        self.gate.discard()
+        return True
+
+    def run(self) -> None:
+        completed = False
+        err_msg = ""
+        try:
+            model = self.model
+            if model is None:
+                try:
+                    from audiocraft.models import MusicGen
+                except ImportError as exc:
+                    raise RuntimeError("audiocraft not installed. pip install audiocraft") from exc
+                self.trace.emit(
+                    TraceEvent(
+                        TraceLevel.INFO, "audio.load.init", f"loading model: {self.model_path}",
+                        fields={"path": self.model_path},
+                    )
+                )
+                model = MusicGen.get_pretrained(self.model_path)
+                self.model_ready.emit(model)
+
+            if self.isInterruptionRequested() or self._superseded():
+                return
+            model.set_generation_params(duration=self.duration)
+            self.trace.emit(TraceEvent(TraceLevel.INFO, "audio.generate.started", "generating audio"))
+            wav = model.generate([self.prompt])
+            if self.isInterruptionRequested() or self._superseded():
+                return
+            self.audio.emit({"audio": wav[0].cpu().numpy(), "sample_rate": self.sample_rate})
+            completed = True
+        except Exception as exc:
+            err_msg = str(exc)
+        finally:
+            self.done.emit(completed, err_msg)
+
+
+class AudioEngine(QObject):
+    """
+    MusicGen engine. The model is loaded by the first generate for its path
+    and kept until unload; set_model_path to a different path drops it.
+    """
+
+    sig_token = Signal(str)
+    sig_trace = Signal(str)
+    sig_trace_event = Signal(object)
+    sig_status = Signal(SystemStatus)
+    sig_finished = Signal()
+    sig_audio = Signal(object)
+
+    def __init__(self, state: AppState):
+        super().__init__()
+        self.state = state
+        self.model = None
+        self.model_path: str | None = None
+        self._loaded_path: str | None = None
+        self.worker: AudioGenWorker | None = None
+        self.gate = GenerationGate()
+
+    def set_model_path(self, payload: dict) -> None:
+        path = payload.get("path") if isinstance(payload, dict) else None
+        if path != self._loaded_path:
+            self.model = None
+            self._loaded_path = None
+        self.model_path = path
+
+    def load_model(self) -> None:
+        # Loading happens inside the first generate, off the kernel thread.
+        QTimer.singleShot(0, lambda: self.sig_status.emit(SystemStatus.READY))
+
+    def unload_model(self) -> None:
+        if self.worker and self.worker.isRunning():
+            self._trace(TraceLevel.ERROR, "audio.unload.busy", "Cannot unload while generating.")
+            return
+        self.sig_status.emit(SystemStatus.UNLOADING)
+        self.model = None
+        self._loaded_path = None
+        try:
+            import torch
+
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception:
+            pass
+        QTimer.singleShot(0, lambda: self.sig_status.emit(SystemStatus.READY))
+
+    def generate(self, payload: dict) -> None:
+        if not self.model_path:
+            self._trace(TraceLevel.ERROR, "audio.generate.no_model", "No model selected.")
+            self.sig_status.emit(SystemStatus.ERROR)
+            return
+        if self.worker and self.worker.isRunning():
+            self._trace(TraceLevel.ERROR, "audio.generate.busy", "Busy. Wait for completion.")
+            self.sig_status.emit(SystemStatus.ERROR)
+            return
+
+        config = payload.get("config", {})
+        self.sig_status.emit(SystemStatus.RUNNING)
+        self.worker = AudioGenWorker(
+            self.model,
+            self.model_path,
+            payload.get("prompt", ""),
+            float(config.get("duration", 5.0)),
+            int(config.get("sample_rate", 32000)),
+            gate=self.gate,
+            gen_id=self.gate.active,
+        )
+        self.worker.audio.connect(self.sig_audio)
+        self.worker.trace.connect(self._emit_trace)
+        self.worker.model_ready.connect(self._on_model_ready)
+        self.worker.done.connect(self._on_gen_finish)
+        self.worker.start()
+
+    def _on_model_ready(self, model) -> None:
+        self.model = model
+        self._loaded_path = self.model_path
+
+    def stop_generation(self) -> None:
+        # MusicGen has no step callback; the result is dropped when it lands.
+        if self.worker and self.worker.isRunning():
+            self.worker.requestInterruption()
+
+    def _on_gen_finish(self, completed: bool, err_msg: str) -> None:
+        self.worker = None
+        if completed:
+            self.sig_finished.emit()
+            self.sig_status.emit(SystemStatus.READY)
+        elif err_msg:
+            self._trace(TraceLevel.ERROR, "audio.generate.failed", err_msg)
+            self.sig_status.emit(SystemStatus.ERROR)
+        else:
+            self._trace(TraceLevel.INFO, "audio.generate.interrupted", "generation interrupted")
+            self.sig_status.emit(SystemStatus.READY)
+
+    def _trace(self, level: TraceLevel, code: str, message: str, **fields) -> None:
+        self._emit_trace(TraceEvent(level, code, message, fields=fields))
+
+    def _emit_trace(self, event: TraceEvent) -> None:
+        self.sig_trace_event.emit(event)
+        self.sig_trace.emit(event.text())
+
+    def request_shutdown(self) -> None:
+        if self.worker and self.worker.isRunning():
+            self.worker.requestInterruption()
+
+    def shutdown_pending(self) -> bool:
+        return self.worker is not None and self.worker.isRunning()
+
+    def release(self) -> None:
+        if self.shutdown_pending():
+            self._trace(TraceLevel.WARNING, "audio.shutdown.busy", "still running at exit; model not released")
+            return
+        self.worker = None
+        if self.model is not None:
+            self.model = None
+            self._loaded_path = None
+            try:
+                import torch
+
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            except Exception:
+                pass
+
+    def shutdown(self) -> None:
+        shutdown_blocking(self)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from typing import Protocol, runtime_checkable
 
 from PySide6.QtCore import Signal
@@ -16,10 +17,29 @@ class EnginePort(Protocol):
         sig_status: SystemStatus transitions (LOADING/RUNNING/READY/ERROR)
 
     Optional signals (check with hasattr before use):
+        sig_trace_event: core.trace.TraceEvent for each sig_trace message
         sig_usage: Token/step count tracking (LLM-specific)
+        sig_progress: Work units completed in the current generation (steps)
         sig_image: Image output (vision engines)
         sig_audio: Audio output (audio engines)
         sig_finished: Optional completion notification
+        sig_checkpoint: Snapshot of a suspended generation (see suspend_generation)
+
+    Optional methods:
+        suspend_generation() -> bool: checkpoint and stop the running
+              generation; the snapshot arrives on sig_checkpoint and is passed
+              back as payload["resume"] to generate()
+
+        request_shutdown(), shutdown_pending() -> bool, release(): two-phase
+              shutdown used by core.shutdown.ShutdownManager. request_shutdown
+              interrupts workers and loads without waiting, shutdown_pending
+              reports whether any thread or process is still running, and
+              release frees the model once none is; shutdown() is then
+              shutdown_blocking(self)
+
+    Optional attributes:
+        gate: engine.gate.GenerationGate checked by worker threads before
+              each emit; EngineBridge opens/closes it around generations
 
     The protocol intentionally keeps optional signals out to prevent forcing
     LLM-centric requirements onto vision/audio engines.
@@ -45,3 +65,25 @@ class EnginePort(Protocol):
 
     def shutdown(self) -> None:
         ...
+
+
+ENGINE_SHUTDOWN_TIMEOUT = 1.5
+
+
+def shutdown_blocking(engine, timeout: float = ENGINE_SHUTDOWN_TIMEOUT) -> bool:
+    """
+    Shut down one engine with the two-phase API and wait for it.
+
+    For callers outside a ShutdownManager (worker processes, single
+    engines). Returns False if it was still running after timeout; its
+    model is then left alone, since a worker may still be using it.
+    """
+    engine.request_shutdown()
+    deadline = time.monotonic() + timeout
+    while engine.shutdown_pending():
+        if time.monotonic() >= deadline:
+            engine.release()
+            return False
+        time.sleep(0.01)
+    engine.release()
+    return True
@@ -1,72 +1,230 @@
-from PySide6.QtCore import QObject, Signal
+from typing import Callable
+
+from PySide6.QtCore import QObject, QTimer, Signal
 
 from core.state import SystemStatus
-from engine.base import EnginePort
+from core.trace import TraceEvent, TraceLevel
+from engine.base import EnginePort, shutdown_blocking
+from engine.gate import GenerationGate
+
+BUSY_STATUSES = (SystemStatus.LOADING, SystemStatus.RUNNING, SystemStatus.UNLOADING)
 
 
 class EngineBridge(QObject):
     sig_token = Signal(str)
     sig_trace = Signal(str)
+    sig_trace_event = Signal(object)
     sig_status = Signal(SystemStatus)
     sig_usage = Signal(int)
+    sig_progress = Signal(int)
     sig_image = Signal(object)
+    sig_audio = Signal(object)
+    sig_checkpoint = Signal(object)
     sig_finished = Signal()
 
-    def __init__(self, impl: EnginePort):
+    def __init__(
+        self,
+        impl: EnginePort | None = None,
+        factory: Callable[[], EnginePort] | None = None,
+        name: str = "engine",
+        idle_timeout: float | None = None,
+    ):
+        """
+        Wrap an engine, or a factory that builds it on the first command.
+
+        With idle_timeout (seconds) a factory-built engine is unloaded and
+        dropped after that long in READY, and rebuilt by the next command.
+        """
         super().__init__()
+        if impl is None and factory is None:
+            raise ValueError("EngineBridge needs an engine or a factory")
+        self.impl: EnginePort | None = None
+        self.name = name
+        self._factory = factory
+        self._retiring = False
+        self._retired_discards = 0
+        self.discarded = 0
+        self.gate = GenerationGate()
+        self._idle_timer: QTimer | None = None
+        if idle_timeout is not None and factory is not None:
+            self._idle_timer = QTimer(self)
+            self._idle_timer.setSingleShot(True)
+            self._idle_timer.setInterval(int(idle_timeout * 1000))
+            self._idle_timer.timeout.connect(self._on_idle)
+        if impl is not None:
+            self._attach(impl)
+
+    @property
+    def is_built(self) -> bool:
+        return self.impl is not None
+
+    def _attach(self, impl: EnginePort) -> None:
         self.impl = impl
-        self._gen_id = 0
-        self._active_gid = 0
+        # Engines that expose a gate check it in their workers and stop
+        # emitting at the source; the checks below catch whatever was already
+        # queued across the thread hop.
+        gate = getattr(impl, "gate", None)
+        self.gate = gate if isinstance(gate, GenerationGate) else GenerationGate()
 
-        impl.sig_status.connect(self.sig_status)
+        impl.sig_status.connect(self._on_status)
         if hasattr(impl, "sig_finished"):
             impl.sig_finished.connect(self.sig_finished)
 
         impl.sig_token.connect(self._on_token)
-        impl.sig_trace.connect(self._on_trace)
+        # Engines without structured traces get their strings wrapped here so
+        # the kernel always sees a TraceEvent.
+        if hasattr(impl, "sig_trace_event"):
+            impl.sig_trace_event.connect(self._on_trace_event)
+        else:
+            impl.sig_trace.connect(
+                lambda message: self._on_trace_event(TraceEvent.from_text(self.name, message))
+            )
         if hasattr(impl, "sig_usage"):
             impl.sig_usage.connect(self._on_usage)
+        if hasattr(impl, "sig_progress"):
+            impl.sig_progress.connect(self._on_progress)
         if hasattr(impl, "sig_image"):
             impl.sig_image.connect(self._on_image)
+        if hasattr(impl, "sig_audio"):
+            impl.sig_audio.connect(self._on_audio)
+        if hasattr(impl, "sig_checkpoint"):
+            impl.sig_checkpoint.connect(self._on_checkpoint)
+
+    def _ensure_impl(self) -> EnginePort:
+        if self._idle_timer is not None:
+            self._idle_timer.stop()
+        self._retiring = False
+        if self.impl is None:
+            self._attach(self._factory())
+            self._emit_own_trace(TraceLevel.INFO, "built", "engine constructed on demand")
+        return self.impl
+
+    def _on_status(self, status: SystemStatus) -> None:
+        self.sig_status.emit(status)
+        if self._idle_timer is None:
+            return
+        if status in BUSY_STATUSES:
+            self._idle_timer.stop()
+        elif status == SystemStatus.READY:
+            if self._retiring:
+                self._retire()
+            else:
+                self._idle_timer.start()
+
+    def _on_idle(self) -> None:
+        if self.impl is None:
+            return
+        # Unload first so subscribers see the same UNLOADING/READY sequence as
+        # a user-requested unload; the engine object is dropped on that READY.
+        self._retiring = True
+        self.impl.unload_model()
+
+    def _retire(self) -> None:
+        impl = self.impl
+        self._retiring = False
+        self._retired_discards += self.gate.discarded
+        self.impl = None
+        self.gate = GenerationGate()
+        impl.shutdown()
+        impl.deleteLater()
+        self._emit_own_trace(TraceLevel.INFO, "retired", "idle engine unloaded and released")
+
+    def _emit_own_trace(self, level: TraceLevel, code: str, message: str) -> None:
+        event = TraceEvent(level, f"{self.name}.{code}", message)
+        self.sig_trace_event.emit(event)
+        self.sig_trace.emit(event.text())
 
     def _is_current_generation(self) -> bool:
-        return self._active_gid == self._gen_id
+        if self.gate.is_open():
+            return True
+        self.discarded += 1
+        return False
+
+    def discard_stats(self) -> dict[str, int]:
+        """Stale-generation events dropped in the workers and here after the hop."""
+        return {"source": self._retired_discards + self.gate.discarded, "bridge": self.discarded}
 
     def _on_token(self, token: str) -> None:
         if self._is_current_generation():
             self.sig_token.emit(token)
 
-    def _on_trace(self, message: str) -> None:
+    def _on_trace_event(self, event: TraceEvent) -> None:
         if self._is_current_generation():
-            self.sig_trace.emit(message)
+            self.sig_trace_event.emit(event)
+            self.sig_trace.emit(event.text())
 
     def _on_usage(self, usage: int) -> None:
         if self._is_current_generation():
             self.sig_usage.emit(usage)
 
+    def _on_progress(self, count: int) -> None:
+        if self._is_current_generation():
+            self.sig_progress.emit(count)
+
     def _on_image(self, image: object) -> None:
         if self._is_current_generation():
             self.sig_image.emit(image)
 
+    def _on_audio(self, audio: object) -> None:
+        if self._is_current_generation():
+            self.sig_audio.emit(audio)
+
+    def _on_checkpoint(self, checkpoint: object) -> None:
+        if self._is_current_generation():
+            self.sig_checkpoint.emit(checkpoint)
+
     def set_model_path(self, payload: dict) -> None:
-        if hasattr(self.impl, "set_model_path"):
-            self.impl.set_model_path(payload)
+        impl = self._ensure_impl()
+        if hasattr(impl, "set_model_path"):
+            impl.set_model_path(payload)
+
+    def set_history(self, payload: dict) -> None:
+        set_history = getattr(self._ensure_impl(), "set_history", None)
+        if set_history is not None:
+            set_history(payload)
 
     def load_model(self) -> None:
-        self.impl.load_model()
+        self._ensure_impl().load_model()
 
     def unload_model(self) -> None:
-        self.impl.unload_model()
+        if self.impl is None:
+            # Nothing is loaded; finish the task the way engines do.
+            QTimer.singleShot(0, lambda: self.sig_status.emit(SystemStatus.READY))
+            return
+        self._ensure_impl().unload_model()
 
     def generate(self, payload: dict) -> None:
-        self._gen_id += 1
-        self._active_gid = self._gen_id
-        self.impl.generate(payload)
+        impl = self._ensure_impl()
+        self.gate.open()
+        impl.generate(payload)
 
     def stop_generation(self) -> None:
-        self._gen_id += 1
-        self._active_gid = 0
-        self.impl.stop_generation()
+        self.gate.close()
+        if self.impl is not None:
+            self.impl.stop_generation()
+
+    def suspend_generation(self) -> bool:
+        # The gate stays open: the checkpoint is still on its way from the worker.
+        suspend = getattr(self.impl, "suspend_generation", None)
+        return bool(suspend and suspend())
+
+    def request_shutdown(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.stop()
+        self.gate.close()
+        if self.impl is None:
+            return
+        if hasattr(self.impl, "request_shutdown"):
+            self.impl.request_shutdown()
+        else:
+            self.impl.shutdown()
+
+    def shutdown_pending(self) -> bool:
+        return self.impl is not None and hasattr(self.impl, "shutdown_pending") and self.impl.shutdown_pending()
+
+    def release(self) -> None:
+        if self.impl is not None and hasattr(self.impl, "release"):
+            self.impl.release()
 
     def shutdown(self) -> None:
-        self.impl.shutdown()
+        shutdown_blocking(self)
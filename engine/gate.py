@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import threading
+
+
+class GenerationGate:
+    """
+    Generation id shared between EngineBridge and an engine's worker threads.
+
+    The bridge opens a new generation before each generate and closes it on
+    stop. Workers capture the active id when they start and check it before
+    every emit, so a superseded worker goes quiet on its own thread instead of
+    queueing events for the bridge to throw away.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latest = 0
+        self._active = 0
+        self.discarded = 0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def open(self) -> int:
+        with self._lock:
+            self._latest += 1
+            self._active = self._latest
+            return self._active
+
+    def close(self) -> None:
+        with self._lock:
+            self._latest += 1
+            self._active = 0
+
+    def is_open(self) -> bool:
+        return self._active == self._latest
+
+    def is_current(self, gen_id: int) -> bool:
+        return gen_id == self._active and self.is_open()
+
+    def discard(self) -> None:
+        with self._lock:
+            self.discarded += 1
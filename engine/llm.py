@@ -1,9 +1,14 @@
+import os
+
 from PySide6.QtCore import QObject, QThread, Signal, QTimer
 from core.state import AppState, SystemStatus
 from core.llm_config import load_config, MASTER_PROMPT
+from core.trace import TraceEvent, TraceLevel
+from engine.base import shutdown_blocking
+from engine.gate import GenerationGate
 
 class ModelLoader(QThread):
-    trace = Signal(str)
+    trace = Signal(object)
     finished = Signal(object, int)
     error = Signal(str)
 
@@ -21,11 +26,19 @@ class ModelLoader(QThread):
                 raise RuntimeError(
                     "llama-cpp-python is not installed. Install it to use the local LLM engine."
                 ) from exc
-            self.trace.emit(f"→ init backend: {self.path}")
+            self.trace.emit(
+                TraceEvent(
+                    TraceLevel.INFO, "llm.load.init", f"init backend: {self.path}",
+                    fields={"path": self.path},
+                )
+            )
+            # Set per worker process for engine pool replicas.
+            threads = os.environ.get("MONOLITH_ENGINE_THREADS")
             llm_instance = Llama(
                 model_path=self.path,
                 n_ctx=self.n_ctx,
                 n_gpu_layers=self.n_gpu_layers,
+                n_threads=int(threads) if threads else None,
                 verbose=False
             )
             model_ctx_length = llm_instance._model.n_ctx_train()
@@ -35,62 +48,152 @@ class ModelLoader(QThread):
 
 class GeneratorWorker(QThread):
     token = Signal(str)
-    trace = Signal(str)
+    trace = Signal(object)
     done = Signal(bool, str)
     usage = Signal(int)
+    checkpoint = Signal(object)
 
-    def __init__(self, llm, messages, temp, top_p, max_tokens):
+    def __init__(
+        self, llm, messages, temp, top_p, max_tokens, prompt=None, gate=None, gen_id=0, resume=None
+    ):
         super().__init__()
         self.llm = llm
+        self.gate = gate
+        self.gen_id = gen_id
         self.messages = messages
+        self.prompt = prompt
         self.temp = temp
         self.top_p = top_p
         self.max_tokens = max_tokens
+        # A resumed generation continues as a raw completion over the
+        # checkpointed token ids, on top of the restored KV cache.
+        self.resume = resume
+        if resume is not None:
+            self.prompt = resume["tokens"]
+        self._suspend_requested = False
+
+    def request_suspend(self):
+        self._suspend_requested = True
+
+    def _open_stream(self):
+        if self.prompt is not None:
+            return self.llm.create_completion(
+                prompt=self.prompt,
+                temperature=self.temp,
+                top_p=self.top_p,
+                max_tokens=self.max_tokens,
+                stream=True
+            )
+        return self.llm.create_chat_completion(
+            messages=self.messages,
+            temperature=self.temp,
+            top_p=self.top_p,
+            max_tokens=self.max_tokens,
+            stream=True
+        )
+
+    @staticmethod
+    def _chunk_text(chunk):
+        choice = chunk["choices"][0]
+        if "delta" in choice:
+            return choice["delta"].get("content")
+        return choice.get("text")
+
+    def _superseded(self):
+        # Checked before each emit: once the bridge has moved on to another
+        # generation (or a STOP), nothing from this worker is wanted.
+        if self.gate is None or self.gate.is_current(self.gen_id):
+            return False
+        self.gate.discard()
+        return True
+
+    def _snapshot(self, resumed_text, new_text, units, prompt_len):
+        # input_ids[:n_tokens] is the prompt plus every generated token except
+        # the last sampled one, which is not evaluated until the next step.
+        # Whatever text the evaluated tokens do not cover is re-tokenized and
+        # appended, so the resume prompt matches what the client has seen.
+        llm = self.llm
+        tokens = [int(t) for t in llm.input_ids[: llm.n_tokens]]
+        if prompt_len is not None:
+            covered = llm.detokenize(tokens[prompt_len:]).decode("utf-8", errors="ignore")
+            tail = new_text[len(covered):]
+            if tail:
+                tokens.extend(llm.tokenize(tail.encode("utf-8"), add_bos=False, special=False))
+        return {
+            "state": llm.save_state(),
+            "tokens": tokens,
+            "text": resumed_text + new_text,
+            "units": units,
+        }
 
     def run(self):
-        self.trace.emit("→ inference started")
+        if not self._superseded():
+            self.trace.emit(TraceEvent(TraceLevel.INFO, "llm.inference.started", "inference started"))
+        resumed_text = self.resume["text"] if self.resume is not None else ""
         assistant_chunks = []
         completed = False
         try:
             if self.isInterruptionRequested():
                 return
+            if self.resume is not None:
+                self.llm.load_state(self.resume["state"])
 
-            stream = self.llm.create_chat_completion(
-                messages=self.messages,
-                temperature=self.temp,
-                top_p=self.top_p,
-                max_tokens=self.max_tokens,
-                stream=True
-            )
+            stream = self._open_stream()
 
-            total_generated = 0
+            total_generated = self.resume["units"] if self.resume is not None else 0
+            prompt_len = None
+            suspended = False
             for chunk in stream:
+                if self._superseded():
+                    break
                 if self.isInterruptionRequested():
-                    self.trace.emit("→ inference aborted")
+                    self.trace.emit(TraceEvent(TraceLevel.INFO, "llm.inference.aborted", "inference aborted"))
+                    break
+                if self._suspend_requested:
+                    self.checkpoint.emit(
+                        self._snapshot(resumed_text, "".join(assistant_chunks), total_generated, prompt_len)
+                    )
+                    self.trace.emit(
+                        TraceEvent(
+                            TraceLevel.INFO, "llm.inference.suspended", "inference suspended",
+                            fields={"chunks": total_generated},
+                        )
+                    )
+                    suspended = True
                     break
 
-                if "content" in chunk["choices"][0]["delta"]:
-                    text = chunk["choices"][0]["delta"]["content"]
+                text = self._chunk_text(chunk)
+                if text:
+                    if prompt_len is None:
+                        prompt_len = self.llm.n_tokens
                     assistant_chunks.append(text)
                     self.token.emit(text)
                     total_generated += 1
                     self.usage.emit(total_generated)
 
-            if not self.isInterruptionRequested():
+            if not (suspended or self.isInterruptionRequested() or self._superseded()):
                 completed = True
-                self.trace.emit("→ inference complete")
+                self.trace.emit(
+                    TraceEvent(
+                        TraceLevel.INFO, "llm.inference.complete", "inference complete",
+                        fields={"chunks": total_generated},
+                    )
+                )
         except Exception as e:
-            self.trace.emit(f"<span style='color:red'>ERROR: {e}</span>")
+            if not self._superseded():
+                self.trace.emit(TraceEvent(TraceLevel.ERROR, "llm.inference.failed", str(e)))
         finally:
-            self.done.emit(completed, "".join(assistant_chunks))
+            self.done.emit(completed, resumed_text + "".join(assistant_chunks))
 
 class LLMEngine(QObject):
     sig_token = Signal(str)
     sig_trace = Signal(str)
+    sig_trace_event = Signal(object)
     sig_status = Signal(SystemStatus)
     sig_finished = Signal()
     sig_usage = Signal(int)
     sig_image = Signal(object)
+    sig_checkpoint = Signal(object)
     sig_model_capabilities = Signal(dict)
 
     def __init__(self, state: AppState):
@@ -106,6 +209,10 @@ class LLMEngine(QObject):
         self._shutdown_requested: bool = False
         self._status: SystemStatus = SystemStatus.READY
         self._ephemeral_generation: bool = False
+        self._external_generation: bool = False
+        self.gate = GenerationGate()
+        self._suspending: bool = False
+        self._checkpointed: bool = False
         self.state.model_ctx_length = None
         self.state.sig_model_capabilities = self.sig_model_capabilities
 
@@ -117,13 +224,13 @@ class LLMEngine(QObject):
 
     def load_model(self):
         if self._status == SystemStatus.LOADING:
-            self.sig_trace.emit("ERROR: Load already in progress.")
+            self._trace(TraceLevel.ERROR, "llm.load.busy", "Load already in progress.")
             self.set_status(SystemStatus.ERROR)
             return
         
         model_path = self.model_path or self.state.gguf_path
         if not model_path:
-            self.sig_trace.emit("ERROR: No GGUF selected.")
+            self._trace(TraceLevel.ERROR, "llm.load.no_model", "No GGUF selected.")
             self.set_status(SystemStatus.ERROR)
             return
 
@@ -136,7 +243,7 @@ class LLMEngine(QObject):
             else self.state.ctx_limit
         )
         self.loader = ModelLoader(model_path, n_ctx)
-        self.loader.trace.connect(self.sig_trace)
+        self.loader.trace.connect(self._emit_trace)
         self.loader.error.connect(self._on_load_error)
         self.loader.finished.connect(self._on_load_success)
         self.loader.finished.connect(self._cleanup_loader)
@@ -154,7 +261,7 @@ class LLMEngine(QObject):
             self.llm = None
             self.state.model_loaded = False
             self.set_status(SystemStatus.READY)
-            self.sig_trace.emit("→ load cancelled")
+            self._trace(TraceLevel.INFO, "llm.load.cancelled", "load cancelled")
             self.loader = None
             return
 
@@ -170,11 +277,14 @@ class LLMEngine(QObject):
         self.state.model_loaded = True
         self.set_status(SystemStatus.READY)
         self.reset_conversation(MASTER_PROMPT)
-        self.sig_trace.emit("→ system online")
+        self._trace(
+            TraceLevel.INFO, "llm.load.online", "system online",
+            ctx_limit=self.state.ctx_limit,
+        )
         self.loader = None
 
     def _on_load_error(self, err_msg):
-        self.sig_trace.emit(f"<span style='color:red'>{err_msg}</span>")
+        self._trace(TraceLevel.ERROR, "llm.load.failed", err_msg)
         if self._shutdown_requested:
             self.set_status(SystemStatus.READY)
         else:
@@ -187,11 +297,14 @@ class LLMEngine(QObject):
     def unload_model(self):
         if self._status == SystemStatus.LOADING and self.loader and self.loader.isRunning():
             self._load_cancel_requested = True
-            self.sig_trace.emit("→ unload requested during load; will cancel when init completes")
+            self._trace(
+                TraceLevel.INFO, "llm.load.cancel_requested",
+                "unload requested during load; will cancel when init completes",
+            )
             return
 
         if self._status == SystemStatus.RUNNING:
-            self.sig_trace.emit("ERROR: Cannot unload while generating.")
+            self._trace(TraceLevel.ERROR, "llm.unload.busy", "Cannot unload while generating.")
             return
 
         if self.llm:
@@ -202,7 +315,7 @@ class LLMEngine(QObject):
         self.state.model_ctx_length = None
         self.reset_conversation(MASTER_PROMPT)
         QTimer.singleShot(0, lambda: self.set_status(SystemStatus.READY))
-        self.sig_trace.emit("→ model unloaded")
+        self._trace(TraceLevel.INFO, "llm.unload.done", "model unloaded")
 
     def reset_conversation(self, system_prompt):
         self.conversation_history = [{"role": "system", "content": system_prompt}]
@@ -224,12 +337,12 @@ class LLMEngine(QObject):
 
     def generate(self, payload: dict):
         if not self.state.model_loaded:
-            self.sig_trace.emit("ERROR: Model offline.")
+            self._trace(TraceLevel.ERROR, "llm.generate.offline", "Model offline.")
             self.set_status(SystemStatus.ERROR)
             return
 
         if self._status == SystemStatus.RUNNING:
-            self.sig_trace.emit("ERROR: Busy. Wait for completion.")
+            self._trace(TraceLevel.ERROR, "llm.generate.busy", "Busy. Wait for completion.")
             self.set_status(SystemStatus.ERROR)
             return
 
@@ -248,6 +361,30 @@ class LLMEngine(QObject):
         self._ephemeral_generation = bool(payload.get("ephemeral", False))
         thinking_mode = bool(payload.get("thinking_mode", False))
 
+        # External clients (HTTP API, scripts) bring their own conversation
+        # or a raw prompt; neither touches the terminal's history.
+        explicit_messages = payload.get("messages")
+        self._external_generation = bool(payload.get("raw")) or isinstance(explicit_messages, list)
+        if self._external_generation:
+            self._ephemeral_generation = True
+            self._pending_user_index = None
+            resume = payload.get("resume")
+            if resume is not None:
+                remaining = max(1, max_tokens - int(resume.get("units", 0)))
+                self._trace(
+                    TraceLevel.INFO, "llm.inference.resumed", "resuming suspended inference",
+                    chunks=resume.get("units", 0),
+                )
+                self._start_worker(None, temp, top_p, remaining, resume=resume)
+            elif payload.get("raw"):
+                self._start_worker(None, temp, top_p, max_tokens, prompt=prompt)
+            else:
+                self._start_worker(
+                    [m for m in explicit_messages if isinstance(m, dict)],
+                    temp, top_p, max_tokens,
+                )
+            return
+
         if not self.conversation_history:
             self.reset_conversation(MASTER_PROMPT)
 
@@ -277,12 +414,20 @@ class LLMEngine(QObject):
                 }
             )
 
+        self._start_worker(messages, temp, top_p, max_tokens)
+
+    def _start_worker(self, messages, temp, top_p, max_tokens, prompt=None, resume=None):
+        self._suspending = False
+        self._checkpointed = False
         self.worker = GeneratorWorker(
             self.llm, messages, temp,
-            top_p, max_tokens
+            top_p, max_tokens, prompt=prompt,
+            gate=self.gate, gen_id=self.gate.active,
+            resume=resume,
         )
         self.worker.token.connect(self.sig_token)
-        self.worker.trace.connect(self.sig_trace)
+        self.worker.trace.connect(self._emit_trace)
+        self.worker.checkpoint.connect(self._on_checkpoint)
         self.worker.usage.connect(self._on_usage_update)
         self.worker.done.connect(self._on_gen_finish)
         self.worker.start()
@@ -290,7 +435,10 @@ class LLMEngine(QObject):
     def stop_generation(self):
         if self._status == SystemStatus.LOADING and self.loader and self.loader.isRunning():
             self._load_cancel_requested = True
-            self.sig_trace.emit("→ load cancel requested; will stop after initialization completes")
+            self._trace(
+                TraceLevel.INFO, "llm.load.cancel_requested",
+                "load cancel requested; will stop after initialization completes",
+            )
             return
 
         self._ephemeral_generation = False
@@ -300,30 +448,83 @@ class LLMEngine(QObject):
     def _on_usage_update(self, count):
         self.sig_usage.emit(count)
 
+    def suspend_generation(self) -> bool:
+        """
+        Ask the running generation to checkpoint and stop so it can be resumed.
+
+        Only external generations can be suspended: they do not touch the
+        conversation history, so resuming them needs nothing but the snapshot.
+        Returns False when the current work cannot be suspended.
+        """
+        if not self._external_generation or not hasattr(self.llm, "save_state"):
+            return False
+        if not (self.worker and self.worker.isRunning()):
+            return False
+        self._suspending = True
+        self.worker.request_suspend()
+        return True
+
+    def _on_checkpoint(self, checkpoint):
+        self._checkpointed = True
+        self.sig_checkpoint.emit(checkpoint)
+
     def _on_gen_finish(self, completed, assistant_text):
+        if self._suspending and self._checkpointed and not completed:
+            # Suspended, not finished: the kernel resumes it from the checkpoint.
+            self._suspending = False
+            self._checkpointed = False
+            self._ephemeral_generation = False
+            self._external_generation = False
+            self.set_status(SystemStatus.READY)
+            return
         if completed and not self._ephemeral_generation:
             self.conversation_history.append(
                 {"role": "assistant", "content": assistant_text}
             )
         self._pending_user_index = None
         self._ephemeral_generation = False
-        self.sig_token.emit("\n")
+        if not self._external_generation:
+            self.sig_token.emit("\n")
+        self._external_generation = False
         self.sig_finished.emit()
         self.set_status(SystemStatus.READY)
 
+    def _trace(self, level: TraceLevel, code: str, message: str, **fields) -> None:
+        self._emit_trace(TraceEvent(level, code, message, fields=fields))
+
+    def _emit_trace(self, event: TraceEvent) -> None:
+        self.sig_trace_event.emit(event)
+        self.sig_trace.emit(event.text())
+
     def set_status(self, s):
         self._status = s
         self.sig_status.emit(s)
 
-    def shutdown(self):
+    def request_shutdown(self):
         self._shutdown_requested = True
         self.stop_generation()
-
-        if self.worker:
+        if self.worker and self.worker.isRunning():
             self.worker.requestInterruption()
-            self.worker.wait(1500)
-            self.worker = None
-
         if self.loader and self.loader.isRunning():
+            # llama.cpp cannot abort a load; the result is dropped when it lands.
             self._load_cancel_requested = True
-            self.loader.wait(150)
+
+    def shutdown_pending(self) -> bool:
+        return any(thread is not None and thread.isRunning() for thread in (self.worker, self.loader))
+
+    def release(self):
+        if self.shutdown_pending():
+            self._trace(TraceLevel.WARNING, "llm.shutdown.busy", "still running at exit; model not released")
+            return
+        self.worker = None
+        self.loader = None
+        if self.llm is not None:
+            # Free the weights and context now rather than whenever the GC gets to them.
+            close = getattr(self.llm, "close", None)
+            if close is not None:
+                close()
+            self.llm = None
+        self.state.model_loaded = False
+
+    def shutdown(self):
+        shutdown_blocking(self)
@@ -0,0 +1,248 @@
+"""
+Engines in worker processes.
+
+ProcessEngine is an EnginePort proxy for an engine class that runs in its own
+spawned process, under its own QCoreApplication and EngineBridge. Commands go
+down a multiprocessing pipe; signals come back up it and are re-emitted on the
+kernel thread, so MonoGuard cannot tell the difference. Used for engine pools,
+where each replica gets a separate process and thread budget.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+
+from PySide6.QtCore import QObject, Signal
+
+from core.state import AppState, SystemStatus
+from core.trace import TraceEvent, TraceLevel
+from engine.base import shutdown_blocking
+
+# AppState fields owned by the engine; mirrored into the parent's AppState.
+SYNCED_STATE = ("model_loaded", "model_ctx_length", "ctx_limit", "gguf_path")
+COMMANDS = ("set_model_path", "set_history", "load_model", "unload_model", "generate", "stop_generation")
+
+
+class ProcessEngine(QObject):
+    sig_token = Signal(str)
+    sig_trace = Signal(str)
+    sig_trace_event = Signal(object)
+    sig_status = Signal(SystemStatus)
+    sig_usage = Signal(int)
+    sig_progress = Signal(int)
+    sig_image = Signal(object)
+    sig_audio = Signal(object)
+    sig_checkpoint = Signal(object)
+    sig_finished = Signal()
+    sig_model_capabilities = Signal(dict)
+    _sig_message = Signal(str, object)
+
+    def __init__(self, state: AppState, factory: str, name: str, threads: int | None = None):
+        """
+        Start a worker process running factory ("module:Class").
+
+        threads caps the compute threads of the worker (OMP/BLAS pools and
+        MONOLITH_ENGINE_THREADS, which the LLM loader passes to llama.cpp).
+        """
+        super().__init__()
+        self.state = state
+        self.name = name
+        self._status = SystemStatus.READY
+        # Replicas of an LLM pool publish capabilities like LLMEngine does.
+        if getattr(state, "sig_model_capabilities", None) is None:
+            state.sig_model_capabilities = self.sig_model_capabilities
+        self._sig_message.connect(self._on_message)
+
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=serve_engine,
+            args=(factory, name, child_conn, threads),
+            name=f"monolith-{name}",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._reader = threading.Thread(target=self._read, name=f"{name}-reader", daemon=True)
+        self._reader.start()
+
+    # ---- kernel thread -> worker ----
+
+    def _send(self, method: str, *args) -> None:
+        try:
+            self._conn.send((method, args))
+        except (BrokenPipeError, EOFError, OSError):
+            self._emit_trace(
+                TraceEvent(TraceLevel.ERROR, f"{self.name}.process.gone", "engine process is not running")
+            )
+            if method in ("load_model", "unload_model", "generate"):
+                self.sig_status.emit(SystemStatus.ERROR)
+
+    def set_model_path(self, payload: dict) -> None:
+        self._send("set_model_path", payload)
+
+    def set_history(self, payload: dict) -> None:
+        self._send("set_history", payload)
+
+    def load_model(self) -> None:
+        self._send("load_model")
+
+    def unload_model(self) -> None:
+        self._send("unload_model")
+
+    def generate(self, payload: dict) -> None:
+        self._send("generate", payload)
+
+    def stop_generation(self) -> None:
+        self._send("stop_generation")
+
+    def request_shutdown(self) -> None:
+        self._send("shutdown")
+
+    def shutdown_pending(self) -> bool:
+        return self._process.is_alive()
+
+    def release(self) -> None:
+        if self._process.is_alive():
+            # Out of time: the model's memory goes with the process.
+            self._process.terminate()
+            self._process.join(1.0)
+        self._conn.close()
+
+    def shutdown(self) -> None:
+        shutdown_blocking(self, timeout=3.0)
+
+    # ---- worker -> kernel thread ----
+
+    def _read(self) -> None:
+        # Reader thread: hand every message to the kernel thread via a queued signal.
+        while True:
+            try:
+                kind, payload = self._conn.recv()
+            except (EOFError, OSError):
+                self._sig_message.emit("exited", self._process.exitcode)
+                return
+            self._sig_message.emit(kind, payload)
+
+    def _on_message(self, kind: str, payload: object) -> None:
+        if kind == "token":
+            self.sig_token.emit(payload)
+        elif kind == "trace_event":
+            self._emit_trace(payload)
+        elif kind == "status":
+            self._status = payload
+            self.sig_status.emit(payload)
+        elif kind == "state":
+            for field, value in payload.items():
+                setattr(self.state, field, value)
+        elif kind == "capabilities":
+            self.state.sig_model_capabilities.emit(payload)
+        elif kind == "finished":
+            self.sig_finished.emit()
+        elif kind == "exited":
+            self._on_exited(payload)
+        else:
+            signal = getattr(self, f"sig_{kind}", None)
+            if signal is not None:
+                signal.emit(payload)
+
+    def _on_exited(self, exitcode: int | None) -> None:
+        self._emit_trace(
+            TraceEvent(
+                TraceLevel.ERROR, f"{self.name}.process.exited",
+                f"engine process exited (code {exitcode})", fields={"exitcode": exitcode},
+            )
+        )
+        # Fail whatever was in flight so the guard frees the replica.
+        if self._status in (SystemStatus.LOADING, SystemStatus.RUNNING, SystemStatus.UNLOADING):
+            self._status = SystemStatus.ERROR
+            self.sig_status.emit(SystemStatus.ERROR)
+
+    def _emit_trace(self, event: TraceEvent) -> None:
+        self.sig_trace_event.emit(event)
+        self.sig_trace.emit(event.text())
+
+
+class _EngineHost(QObject):
+    """Worker-process side: runs commands on the engine and forwards its signals."""
+
+    _sig_command = Signal(str, object)
+
+    def __init__(self, engine, state: AppState, conn, app):
+        super().__init__()
+        self.engine = engine
+        self.state = state
+        self.conn = conn
+        self.app = app
+        self._sig_command.connect(self._on_command)
+
+        engine.sig_token.connect(lambda token: self._send("token", token))
+        engine.sig_trace_event.connect(lambda event: self._send("trace_event", event))
+        engine.sig_status.connect(self._on_status)
+        engine.sig_finished.connect(lambda: self._send("finished", None))
+        for kind in ("usage", "progress", "image", "audio", "checkpoint"):
+            getattr(engine, f"sig_{kind}").connect(lambda value, kind=kind: self._send(kind, value))
+        capabilities = getattr(state, "sig_model_capabilities", None)
+        if capabilities is not None:
+            capabilities.connect(lambda caps: self._send("capabilities", caps))
+
+        threading.Thread(target=self._read, name="engine-commands", daemon=True).start()
+
+    def _read(self) -> None:
+        while True:
+            try:
+                method, args = self.conn.recv()
+            except (EOFError, OSError):
+                # The kernel went away; nothing left to serve.
+                self._sig_command.emit("shutdown", ())
+                return
+            self._sig_command.emit(method, args)
+            if method == "shutdown":
+                return
+
+    def _on_command(self, method: str, args: tuple) -> None:
+        if method == "shutdown":
+            self.engine.shutdown()
+            self.app.quit()
+            return
+        if method in COMMANDS:
+            getattr(self.engine, method)(*args)
+
+    def _on_status(self, status: SystemStatus) -> None:
+        self._send("state", {field: getattr(self.state, field, None) for field in SYNCED_STATE})
+        self._send("status", status)
+
+    def _send(self, kind: str, payload: object) -> None:
+        try:
+            self.conn.send((kind, payload))
+        except (BrokenPipeError, OSError):
+            pass
+        except Exception as exc:
+            # Unpicklable output (e.g. an engine-specific checkpoint object).
+            event = TraceEvent(TraceLevel.ERROR, "process.send_failed", f"cannot forward {kind}: {exc}")
+            try:
+                self.conn.send(("trace_event", event))
+            except Exception:
+                pass
+
+
+def serve_engine(factory: str, name: str, conn, threads: int | None) -> None:
+    """Worker-process entry point: build the engine and serve it until shutdown."""
+    if threads:
+        for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "MONOLITH_ENGINE_THREADS"):
+            os.environ[var] = str(threads)
+
+    from PySide6.QtCore import QCoreApplication
+
+    from engine.bridge import EngineBridge
+    from engine.registry import construct_engine
+
+    app = QCoreApplication([f"monolith-{name}"])
+    state = AppState()
+    # The bridge gives the worker the same source-side gating as in-process engines.
+    # Replicas trace under the pool's name ("llm" for "llm#1").
+    engine = EngineBridge(construct_engine(factory, state), name=name.split("#", 1)[0])
+    host = _EngineHost(engine, state, conn, app)
+    app.exec()
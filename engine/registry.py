@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable
+
+from core.state import AppState
+from engine.base import EnginePort
+from engine.bridge import EngineBridge
+from engine.process import ProcessEngine
+
+
+@dataclass(frozen=True)
+class EngineSpec:
+    key: str
+    factory: str  # "module:Class", imported when the engine is first built
+    lazy: bool = True
+    idle_timeout: float | None = None  # seconds in READY before the engine is released
+    # replicas > 1 registers "<key>#0".."<key>#<n-1>" as a pool behind "<key>";
+    # pooled (or process=True) engines run in worker processes, each limited
+    # to `threads` compute threads.
+    replicas: int = 1
+    process: bool = False
+    threads: int | None = None
+
+
+class EngineRegistry:
+    def __init__(self):
+        self._specs: Dict[str, EngineSpec] = {}
+
+    def register(self, spec: EngineSpec) -> None:
+        self._specs[spec.key] = spec
+
+    def get(self, key: str) -> EngineSpec:
+        if key not in self._specs:
+            raise KeyError(f"Engine '{key}' not found. Known engines: {list(self._specs.keys())}")
+        return self._specs[key]
+
+    def all(self) -> Iterable[EngineSpec]:
+        return self._specs.values()
+
+    def build(self, state: AppState) -> dict[str, EngineBridge]:
+        """One EngineBridge per spec; lazy engines are constructed by their first command."""
+        bridges = {}
+        for spec in self.all():
+            for key in _replica_keys(spec):
+                if spec.process or spec.replicas > 1:
+                    factory = lambda spec=spec, key=key: ProcessEngine(state, spec.factory, key, spec.threads)
+                else:
+                    factory = lambda path=spec.factory: construct_engine(path, state)
+                if spec.lazy:
+                    bridges[key] = EngineBridge(factory=factory, name=key, idle_timeout=spec.idle_timeout)
+                else:
+                    bridges[key] = EngineBridge(factory(), name=key)
+        return bridges
+
+
+def _replica_keys(spec: EngineSpec) -> list[str]:
+    if spec.replicas <= 1:
+        return [spec.key]
+    return [f"{spec.key}#{index}" for index in range(spec.replicas)]
+
+
+def construct_engine(path: str, state: AppState) -> EnginePort:
+    module_name, _, class_name = path.partition(":")
+    engine_cls = getattr(importlib.import_module(module_name), class_name)
+    return engine_cls(state)
+
+
+def build_default_registry(config: dict | None = None) -> EngineRegistry:
+    """Built-in engines, with the "engine_pools" overrides of a kernel config applied."""
+    registry = EngineRegistry()
+    # Eager: LLMEngine publishes state.sig_model_capabilities, which the
+    # terminal connects to when it is built.
+    registry.register(EngineSpec("llm", "engine.llm:LLMEngine", lazy=False))
+    registry.register(EngineSpec("vision", "engine.vision:VisionEngine", idle_timeout=600.0))
+    registry.register(EngineSpec("audio", "engine.audio:AudioEngine", idle_timeout=300.0))
+    for key, overrides in ((config or {}).get("engine_pools") or {}).items():
+        if not isinstance(overrides, dict):
+            continue
+        try:
+            spec = registry.get(key)
+        except KeyError:
+            continue
+        registry.register(
+            replace(
+                spec,
+                replicas=max(1, int(overrides.get("replicas", 1))),
+                process=bool(overrides.get("process", False)),
+                threads=overrides.get("threads"),
+            )
+        )
+    return registry
@@ -3,10 +3,13 @@ from __future__ import annotations
 from PySide6.QtCore import QObject, QThread, Signal, QTimer
 
 from core.state import AppState, SystemStatus
+from core.trace import TraceEvent, TraceLevel
+from engine.base import shutdown_blocking
+from engine.gate import GenerationGate
 
 
 class PipelineLoader(QThread):
-    trace = Signal(str)
+    trace = Signal(object)
     finished = Signal(object)
     error = Signal(str)
 
@@ -30,7 +33,12 @@ class PipelineLoader(QThread):
             if self.isInterruptionRequested():
                 return
 
-            self.trace.emit(f"loading pipeline: {self.model_path}")
+            self.trace.emit(
+                TraceEvent(
+                    TraceLevel.INFO, "vision.load.init", f"loading pipeline: {self.model_path}",
+                    fields={"path": self.model_path},
+                )
+            )
             if self.model_path.endswith((".safetensors", ".ckpt")):
                 pipe = StableDiffusionPipeline.from_single_file(
                     self.model_path,
@@ -54,7 +62,8 @@ class PipelineLoader(QThread):
 
 class GenerationWorker(QThread):
     image = Signal(object)
-    trace = Signal(str)
+    trace = Signal(object)
+    progress = Signal(int)
     done = Signal(bool, str)
 
     def __init__(
@@ -64,6 +73,8 @@ class GenerationWorker(QThread):
         steps: int,
         guidance: float,
         seed: int | None,
+        gate: GenerationGate | None = None,
+        gen_id: int = 0,
     ):
         super().__init__()
         self.pipe = pipe
@@ -71,6 +82,14 @@ class GenerationWorker(QThread):
         self.steps = steps
         self.guidance = guidance
         self.seed = seed
+        self.gate = gate
+        self.gen_id = gen_id
+
+    def _superseded(self) -> bool:
+        if self.gate is None or self.gate.is_current(self.gen_id):
+            return False
+        self.gate.discard()
+        return True
 
     def run(self) -> None:
         completed = False
@@ -87,10 +106,11 @@ class GenerationWorker(QThread):
                 generator = torch.Generator(device=device).manual_seed(self.seed)
 
             def _callback(step: int, timestep: int, latents) -> None:
-                if self.isInterruptionRequested():
+                if self.isInterruptionRequested() or self._superseded():
                     raise RuntimeError("Generation interrupted")
+                self.progress.emit(step + 1)
 
-            self.trace.emit("generation started")
+            self.trace.emit(TraceEvent(TraceLevel.INFO, "vision.generate.started", "generation started"))
             result = self.pipe(
                 self.prompt,
                 num_inference_steps=self.steps,
@@ -99,10 +119,15 @@ class GenerationWorker(QThread):
                 callback=_callback,
                 callback_steps=1,
             )
-            if self.isInterruptionRequested():
+            if self.isInterruptionRequested() or self._superseded():
                 return
             self.image.emit(result.images[0])
-            self.trace.emit("generation complete")
+            self.trace.emit(
+                TraceEvent(
+                    TraceLevel.INFO, "vision.generate.complete", "generation complete",
+                    fields={"steps": self.steps},
+                )
+            )
             completed = True
         except Exception as exc:
             err_msg = str(exc)
@@ -113,8 +138,10 @@ class GenerationWorker(QThread):
 class VisionEngine(QObject):
     sig_token = Signal(str)
     sig_trace = Signal(str)
+    sig_trace_event = Signal(object)
     sig_status = Signal(SystemStatus)
     sig_usage = Signal(int)
+    sig_progress = Signal(int)
     sig_finished = Signal()
     sig_image = Signal(object)
 
@@ -128,6 +155,7 @@ class VisionEngine(QObject):
         self.worker: GenerationWorker | None = None
         self._load_cancel_requested = False
         self._shutdown_requested = False
+        self.gate = GenerationGate()
 
     def set_model_path(self, payload: dict) -> None:
         path = payload.get("path") if isinstance(payload, dict) else None
@@ -136,17 +164,17 @@ class VisionEngine(QObject):
 
     def load_model(self) -> None:
         if self.loader and self.loader.isRunning():
-            self.sig_trace.emit("VISION: load already in progress.")
+            self._trace(TraceLevel.WARNING, "vision.load.busy", "load already in progress.")
             QTimer.singleShot(0, lambda: self.sig_status.emit(SystemStatus.READY))
             return
 
         if not self.model_path:
-            self.sig_trace.emit("VISION: ERROR: No model selected.")
+            self._trace(TraceLevel.ERROR, "vision.load.no_model", "No model selected.")
             self.sig_status.emit(SystemStatus.ERROR)
             return
 
         if self.pipe and self._loaded_path == self.model_path:
-            self.sig_trace.emit("VISION: pipeline already loaded.")
+            self._trace(TraceLevel.INFO, "vision.load.noop", "pipeline already loaded.")
             QTimer.singleShot(0, lambda: self.sig_status.emit(SystemStatus.READY))
             return
 
@@ -154,7 +182,7 @@ class VisionEngine(QObject):
             self.unload_model()
 
         self.sig_status.emit(SystemStatus.LOADING)
-        self.sig_trace.emit("VISION: loading pipeline")
+        self._trace(TraceLevel.INFO, "vision.load.start", "loading pipeline")
         self._load_cancel_requested = False
         self.loader = PipelineLoader(self.model_path)
         self.loader.trace.connect(self._emit_trace)
@@ -164,8 +192,12 @@ class VisionEngine(QObject):
         self.loader.error.connect(self._cleanup_loader)
         self.loader.start()
 
-    def _emit_trace(self, message: str) -> None:
-        self.sig_trace.emit(f"VISION: {message}")
+    def _trace(self, level: TraceLevel, code: str, message: str, **fields) -> None:
+        self._emit_trace(TraceEvent(level, code, message, fields=fields))
+
+    def _emit_trace(self, event: TraceEvent) -> None:
+        self.sig_trace_event.emit(event)
+        self.sig_trace.emit(event.text())
 
     def _on_load_success(self, pipe) -> None:
         if self._shutdown_requested:
@@ -178,18 +210,18 @@ class VisionEngine(QObject):
             self.pipe = None
             self._loaded_path = None
             self.sig_status.emit(SystemStatus.READY)
-            self.sig_trace.emit("VISION: load cancelled")
+            self._trace(TraceLevel.INFO, "vision.load.cancelled", "load cancelled")
             self.loader = None
             return
 
         self.pipe = pipe
         self._loaded_path = self.model_path
-        self.sig_trace.emit("VISION: pipeline ready")
+        self._trace(TraceLevel.INFO, "vision.load.ready", "pipeline ready")
         self.sig_status.emit(SystemStatus.READY)
         self.loader = None
 
     def _on_load_error(self, err_msg: str) -> None:
-        self.sig_trace.emit(f"VISION: ERROR: {err_msg}")
+        self._trace(TraceLevel.ERROR, "vision.load.failed", err_msg)
         self.sig_status.emit(SystemStatus.ERROR)
         self.loader = None
 
@@ -199,13 +231,14 @@ class VisionEngine(QObject):
     def unload_model(self) -> None:
         if self.loader and self.loader.isRunning():
             self._load_cancel_requested = True
-            self.sig_trace.emit(
-                "VISION: unload requested during load; will cancel after init completes"
+            self._trace(
+                TraceLevel.INFO, "vision.load.cancel_requested",
+                "unload requested during load; will cancel after init completes",
             )
             return
 
         if self.worker and self.worker.isRunning():
-            self.sig_trace.emit("VISION: ERROR: Cannot unload while generating.")
+            self._trace(TraceLevel.ERROR, "vision.unload.busy", "Cannot unload while generating.")
             return
 
         self.sig_status.emit(SystemStatus.UNLOADING)
@@ -226,12 +259,12 @@ class VisionEngine(QObject):
 
     def generate(self, payload: dict) -> None:
         if not self.pipe:
-            self.sig_trace.emit("VISION: ERROR: Model offline.")
+            self._trace(TraceLevel.ERROR, "vision.generate.offline", "Model offline.")
             self.sig_status.emit(SystemStatus.READY)
             return
 
         if self.worker and self.worker.isRunning():
-            self.sig_trace.emit("VISION: ERROR: Busy. Wait for completion.")
+            self._trace(TraceLevel.ERROR, "vision.generate.busy", "Busy. Wait for completion.")
             return
 
         config = payload.get("config", payload)
@@ -250,8 +283,11 @@ class VisionEngine(QObject):
             steps,
             guidance_scale,
             seed,
+            gate=self.gate,
+            gen_id=self.gate.active,
         )
         self.worker.image.connect(self.sig_image)
+        self.worker.progress.connect(self.sig_progress)
         self.worker.trace.connect(self._emit_trace)
         self.worker.done.connect(self._on_gen_finish)
         self.worker.start()
@@ -259,8 +295,9 @@ class VisionEngine(QObject):
     def stop_generation(self) -> None:
         if self.loader and self.loader.isRunning():
             self._load_cancel_requested = True
-            self.sig_trace.emit(
-                "VISION: load cancel requested; will stop after initialization completes"
+            self._trace(
+                TraceLevel.INFO, "vision.load.cancel_requested",
+                "load cancel requested; will stop after initialization completes",
             )
             return
 
@@ -272,22 +309,41 @@ class VisionEngine(QObject):
             self.sig_finished.emit()
             self.sig_status.emit(SystemStatus.READY)
         elif err_msg == "Generation interrupted":
-            self.sig_trace.emit("VISION: generation interrupted")
+            self._trace(TraceLevel.INFO, "vision.generate.interrupted", "generation interrupted")
             self.sig_status.emit(SystemStatus.READY)
         else:
-            self.sig_trace.emit(f"VISION: ERROR: {err_msg}")
+            self._trace(TraceLevel.ERROR, "vision.generate.failed", err_msg)
             self.sig_status.emit(SystemStatus.ERROR)
         self.worker = None
 
-    def shutdown(self) -> None:
+    def request_shutdown(self) -> None:
         self._shutdown_requested = True
         self.stop_generation()
-
-        if self.worker:
+        if self.worker and self.worker.isRunning():
             self.worker.requestInterruption()
-            self.worker.wait(1500)
-            self.worker = None
-
         if self.loader and self.loader.isRunning():
             self._load_cancel_requested = True
-            self.loader.wait(150)
+            self.loader.requestInterruption()
+
+    def shutdown_pending(self) -> bool:
+        return any(thread is not None and thread.isRunning() for thread in (self.worker, self.loader))
+
+    def release(self) -> None:
+        if self.shutdown_pending():
+            self._trace(TraceLevel.WARNING, "vision.shutdown.busy", "still running at exit; pipeline not released")
+            return
+        self.worker = None
+        self.loader = None
+        if self.pipe is not None:
+            self.pipe = None
+            self._loaded_path = None
+            try:
+                import torch
+
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+            except Exception:
+                pass
+
+    def shutdown(self) -> None:
+        shutdown_blocking(self)
@@ -0,0 +1,204 @@
+"""
+Headless Monolith runtime.
+
+Builds the kernel (MonoGuard, MonoDock, MonoBridge) and the engines under a
+QCoreApplication. Nothing in this module may import QtWidgets/QtGui so it can
+run on machines without a display.
+"""
+
+import argparse
+import asyncio
+import runpy
+import signal
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from core.kernel_config import load_kernel_config
+from core.overseer_db import OverseerDB
+from core.shutdown import SHUTDOWN_BUDGET, ShutdownManager
+from core.state import AppState
+from engine.bridge import EngineBridge
+from engine.registry import EngineRegistry, build_default_registry
+from monokernel.bridge import MonoBridge
+from monokernel.dock import MonoDock
+from monokernel.guard import MonoGuard
+from monokernel.journal import TaskJournal
+from monokernel.relay import TaskRelay
+from monokernel.timeseries import MetricsRecorder
+
+
+@dataclass
+class KernelRuntime:
+    state: AppState
+    engines: dict[str, EngineBridge]
+    guard: MonoGuard
+    dock: MonoDock
+    bridge: MonoBridge
+    relay: TaskRelay
+    journal: TaskJournal
+    # Overseer log; the kernel's time series are written here by recorder.
+    overseer_db: OverseerDB
+    recorder: MetricsRecorder
+
+    def shutdown_plan(self, budget: float = SHUTDOWN_BUDGET) -> ShutdownManager:
+        """Kernel shutdown steps; callers add their own services before running it."""
+        plan = ShutdownManager(budget, trace=self.guard.trace)
+        plan.add("guard", self.guard.stop)
+        if self.guard._viztracer is not None:
+            plan.add("viztracer", lambda: self.guard.enable_viztracer(False))
+        for key, engine in self.engines.items():
+            plan.add_engine(f"engine:{key}", engine)
+        plan.add_final("journal", self.journal.close)
+        # Partial 1 min / 1 h buckets go to the database before it closes.
+        plan.add_final("metrics", self.recorder.stop)
+        plan.add_final("overseer_db", self.overseer_db.close)
+        return plan
+
+    def shutdown(self) -> None:
+        self.shutdown_plan().run()
+
+
+def build_kernel(state: AppState | None = None, registry: EngineRegistry | None = None) -> KernelRuntime:
+    state = state or AppState()
+    config = load_kernel_config()
+    engines = (registry or build_default_registry(config)).build(state)
+    guard = MonoGuard(state, engines)
+    journal = TaskJournal()
+    dock = MonoDock(guard, journal, config)
+    bridge = MonoBridge(dock)
+    relay = TaskRelay(guard, bridge)
+    overseer_db = OverseerDB()
+    recorder = MetricsRecorder(guard, dock, sink=overseer_db.log_metric)
+    return KernelRuntime(
+        state=state,
+        engines=engines,
+        guard=guard,
+        dock=dock,
+        bridge=bridge,
+        relay=relay,
+        journal=journal,
+        overseer_db=overseer_db,
+        recorder=recorder,
+    )
+
+
+def run_async(app: QCoreApplication, runtime: KernelRuntime, coro) -> None:
+    """Run a coroutine on an asyncio loop thread and quit the app when it ends."""
+    from monokernel.aio import start_loop_thread
+
+    loop = start_loop_thread()
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def _on_done(fut) -> None:
+        if not fut.cancelled() and fut.exception() is not None:
+            print(f"headless: coroutine failed: {fut.exception()!r}", file=sys.stderr)
+        runtime.relay.call_threadsafe(app.quit)
+
+    future.add_done_callback(_on_done)
+    app.aboutToQuit.connect(lambda: loop.call_soon_threadsafe(loop.stop))
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="monolith --headless")
+    parser.add_argument("--llm-model", help="GGUF model to load on startup")
+    parser.add_argument("--vision-model", help="diffusers model to load on startup")
+    parser.add_argument("--quiet", action="store_true", help="do not print kernel traces")
+    parser.add_argument("--api-port", type=int, help="serve the OpenAI-compatible API on this localhost port")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="serve the kernel to UI clients on a local socket; models stay loaded across UI restarts",
+    )
+    parser.add_argument("--socket", help="daemon socket path (default: $MONOLITH_SOCKET or ~/Monolith/kernel.sock)")
+    parser.add_argument("--batch", help="JSONL file of generate requests to run, then exit")
+    parser.add_argument("--batch-out", help="JSONL results file (default: <batch>.out.jsonl); reruns resume")
+    parser.add_argument(
+        "--batch-window", type=int, default=2, help="requests in flight per engine (default: 2)"
+    )
+    parser.add_argument(
+        "--script",
+        help="python file defining 'async def main(kernel)'; runs against an AsyncKernel, then exits",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    app = QCoreApplication(sys.argv[:1])
+    runtime = build_kernel()
+    guard, bridge = runtime.guard, runtime.bridge
+    shutdown = runtime.shutdown_plan()
+
+    if not args.quiet:
+        guard.sig_trace.connect(lambda msg: print(msg, flush=True))
+        guard.sig_status.connect(
+            lambda engine_key, status: print(f"[{engine_key}] {status.value}", flush=True)
+        )
+
+    replayed = runtime.dock.replay_journal()
+    if replayed:
+        print(f"headless: replaying {replayed} journaled task(s)", flush=True)
+
+    for target, path in (("llm", args.llm_model), ("vision", args.vision_model)):
+        if path:
+            bridge.submit(bridge.wrap("headless", "set_path", target, payload={"path": path}))
+            bridge.submit(bridge.wrap("headless", "load", target))
+
+    if args.api_port:
+        from services.openai_api import OpenAIServer
+
+        api = OpenAIServer(runtime.relay, port=args.api_port)
+        api.start()
+        shutdown.add("api", api.stop)
+
+    if args.daemon:
+        from services.daemon import KernelDaemon
+        from services.wire import DEFAULT_SOCKET
+
+        daemon = KernelDaemon(runtime, args.socket or DEFAULT_SOCKET)
+        if not daemon.start():
+            runtime.shutdown()
+            return 1
+        shutdown.add("daemon", daemon.stop)
+
+    if args.batch:
+        from monokernel.aio import AsyncKernel
+        from services.batch import run_batch
+
+        in_path = Path(args.batch)
+        out_path = Path(args.batch_out) if args.batch_out else in_path.with_suffix(".out.jsonl")
+        run_async(
+            app,
+            runtime,
+            run_batch(
+                AsyncKernel(runtime.relay, source="batch"),
+                in_path,
+                out_path,
+                per_target=max(1, args.batch_window),
+            ),
+        )
+    elif args.script:
+        from monokernel.aio import AsyncKernel
+
+        script_main = runpy.run_path(args.script).get("main")
+        if script_main is None:
+            print(f"{args.script} does not define 'async def main(kernel)'", file=sys.stderr)
+            return 2
+        run_async(app, runtime, script_main(AsyncKernel(runtime.relay, source="script")))
+
+    # Qt owns the loop; a periodic no-op lets Python deliver SIGINT/SIGTERM.
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    signal.signal(signal.SIGTERM, lambda *_: app.quit())
+    signal_pump = QTimer()
+    signal_pump.timeout.connect(lambda: None)
+    signal_pump.start(200)
+
+    app.aboutToQuit.connect(shutdown.run)
+    return app.exec()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,10 @@
-from bootstrap import main
+import sys
 
 if __name__ == "__main__":
+    if "--headless" in sys.argv[1:]:
+        from headless import main
+
+        raise SystemExit(main([arg for arg in sys.argv[1:] if arg != "--headless"]))
+    from bootstrap import main
+
     raise SystemExit(main())
@@ -0,0 +1,170 @@
+"""
+asyncio facade over the kernel.
+
+    kernel = AsyncKernel(runtime.relay)
+    text = await kernel.generate("hello")
+    async for chunk in kernel.stream("hello"):
+        ...
+    outputs = await kernel.pipeline([Stage("expand", "llm", ...), Stage("render", "vision", ...)])
+
+Coroutines may run on any asyncio loop: a loop on its own thread (see
+start_loop_thread, used by the headless runtime) or a qasync loop sharing the
+Qt thread. Cancelling the awaiting asyncio task cancels the kernel task.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from contextlib import aclosing
+from typing import Any, AsyncIterator
+
+from core.task import TaskStatus
+from monokernel.guard import external_payload
+from monokernel.pipeline import Pipeline, PipelineStatus, Stage
+from monokernel.relay import KernelTaskError, TaskRelay
+
+
+class KernelPipelineError(RuntimeError):
+    def __init__(self, pipeline: Pipeline):
+        self.pipeline = pipeline
+        self.status = pipeline.status
+        error = pipeline.error
+        super().__init__(f"pipeline {pipeline.id} {pipeline.status.value}{': ' + error if error else ''}")
+
+
+class AsyncKernel:
+    def __init__(self, relay: TaskRelay, source: str = "script", durable: bool = False):
+        self.relay = relay
+        self.source = source
+        self.durable = durable
+
+    async def generate(
+        self,
+        prompt: str | None = None,
+        target: str = "llm",
+        priority: int = 2,
+        **payload: Any,
+    ) -> Any:
+        """
+        Run one generate task; returns the joined text, or the last non-text output (images).
+
+        An llm prompt runs outside the terminal's conversation; pass messages=[...]
+        for context or raw=True for a bare completion.
+        """
+        if prompt is not None:
+            payload["prompt"] = prompt
+        task = self.relay.bridge.wrap(
+            self.source, "generate", target, payload=external_payload(target, payload),
+            priority=priority, durable=self.durable,
+        )
+        # Cancelling the awaiting task cancels the future, and with it the kernel task.
+        return await asyncio.wrap_future(self.relay.submit_future(task))
+
+    async def stream(
+        self,
+        prompt: str | None = None,
+        target: str = "llm",
+        priority: int = 2,
+        **payload: Any,
+    ) -> AsyncIterator[Any]:
+        if prompt is not None:
+            payload["prompt"] = prompt
+        payload = external_payload(target, payload)
+        async with aclosing(self._events("generate", target, payload, priority)) as events:
+            async for _kind, data in events:
+                yield data
+
+    async def run(
+        self,
+        command: str,
+        target: str,
+        payload: dict | None = None,
+        priority: int = 2,
+    ) -> TaskStatus:
+        """Run a non-streaming command (load, unload, set_path, ...) to completion."""
+        async with aclosing(self._events(command, target, payload or {}, priority)) as events:
+            async for _kind, _data in events:
+                pass
+        return TaskStatus.DONE
+
+    async def pipeline(self, stages: list[Stage]) -> dict[str, Any]:
+        """Run a pipeline to completion; returns each stage's output by stage name."""
+        loop = asyncio.get_running_loop()
+        done: asyncio.Future[PipelineStatus] = loop.create_future()
+
+        def _sink(kind: str, data: Any) -> None:
+            if kind == "done" and not loop.is_closed():
+                loop.call_soon_threadsafe(lambda: done.done() or done.set_result(data))
+
+        pipeline = Pipeline.new(stages, source=self.source, sink=_sink)
+        self.relay.call_threadsafe(lambda: self.relay.bridge.submit_pipeline(pipeline))
+        try:
+            status = await done
+        finally:
+            if not done.done():
+                self.relay.call_threadsafe(lambda: self.relay.bridge.cancel_pipeline(pipeline.id))
+        if status != PipelineStatus.DONE:
+            raise KernelPipelineError(pipeline)
+        return dict(pipeline.outputs)
+
+    async def _events(
+        self, command: str, target: str, payload: dict, priority: int
+    ) -> AsyncIterator[tuple[str, Any]]:
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+        task = self.relay.bridge.wrap(
+            self.source, command, target, payload=payload, priority=priority, durable=self.durable
+        )
+        task_id = str(task.id)
+
+        def _sink(kind: str, data: Any) -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(events.put_nowait, (kind, data))
+
+        self.relay.submit_threadsafe(task, _sink)
+        finished = False
+        try:
+            while True:
+                kind, data = await events.get()
+                if kind == "output":
+                    yield kind, data
+                    continue
+                finished = True
+                if kind == "rejected":
+                    raise KernelTaskError(task_id, None, str(data))
+                if data != TaskStatus.DONE:
+                    raise KernelTaskError(task_id, data)
+                return
+        finally:
+            if not finished:
+                self.relay.cancel_threadsafe(task_id)
+
+
+def start_loop_thread(name: str = "monolith-asyncio") -> asyncio.AbstractEventLoop:
+    """Start an asyncio loop on a daemon thread; submit work with run_coroutine_threadsafe."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    def _run() -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    threading.Thread(target=_run, name=name, daemon=True).start()
+    ready.wait()
+    return loop
+
+
+def qt_event_loop(app) -> asyncio.AbstractEventLoop:
+    """Return an asyncio loop driven by the Qt event loop (requires qasync)."""
+    try:
+        import qasync
+    except ImportError as exc:
+        raise RuntimeError(
+            "qasync is not installed. Install it to run asyncio on the Qt thread, "
+            "or use start_loop_thread()."
+        ) from exc
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    return loop
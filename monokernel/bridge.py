@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 from core.task import Task
-from monokernel.dock import MonoDock
+from monokernel.dock import EnqueueResult, MonoDock
+from monokernel.pipeline import Pipeline, PipelineRunner
 
 
 class MonoBridge:
     def __init__(self, dock: MonoDock):
         self.dock = dock
+        self.pipelines = PipelineRunner(dock.guard, self)
 
     def wrap(self, source: str, command: str, target: str, **kwargs) -> Task:
         priority = int(kwargs.pop("priority", 2))
+        durable = bool(kwargs.pop("durable", False))
         payload = kwargs.pop("payload", kwargs)
         return Task.new(
             addon_pid=source,
@@ -17,10 +20,19 @@ class MonoBridge:
             command=command,
             payload=payload,
             priority=priority,
+            durable=durable,
         )
 
-    def submit(self, task: Task) -> None:
-        self.dock.enqueue(task)
+    def submit(self, task: Task) -> EnqueueResult:
+        # A BLOCKED task was not queued; callers that cannot wait (the UI)
+        # should treat it like a rejection. TaskRelay parks and resubmits it.
+        return self.dock.enqueue(task)
+
+    def submit_pipeline(self, pipeline: Pipeline) -> Pipeline:
+        return self.pipelines.submit(pipeline)
+
+    def cancel_pipeline(self, pipeline_id: str) -> None:
+        self.pipelines.cancel(pipeline_id)
 
     def cancel(self, task_id: str) -> None:
         self.dock.cancel_task(task_id)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QObject, Signal
+
+
+class OutputChannel(QObject):
+    """
+    Output of one subscription scope (a task, an addon, or an engine).
+
+    MonoGuard owns the channels and emits into them; subscribers connect to
+    the channel instead of the guard's global signals so they only receive
+    the output they asked for.
+    """
+
+    sig_token = Signal(str)
+    sig_trace = Signal(str)
+    sig_trace_event = Signal(object)  # core.trace.TraceEvent
+    sig_image = Signal(object)
+    sig_audio = Signal(object)  # {"audio": ndarray, "sample_rate": int}
+    sig_finished = Signal(str)  # task_id
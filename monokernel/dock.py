@@ -1,28 +1,124 @@
 from __future__ import annotations
 
-from collections import deque
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from time import monotonic
 from typing import Deque
 
+from core.kernel_config import DEFAULT_KERNEL_CONFIG
 from core.task import Task, TaskStatus
-from monokernel.guard import MonoGuard
+from core.trace import TraceLevel
+from monokernel.guard import PAYLOAD_COMMANDS, MonoGuard
+from monokernel.journal import SETUP_COMMANDS, TaskJournal
+
+FINISHED_STATUSES = (TaskStatus.DONE, TaskStatus.FAILED, TaskStatus.CANCELLED)
+# Only work requests count against queue limits; setup and control commands
+# are always accepted so an engine can be configured behind a full queue.
+LIMITED_COMMANDS = ("generate",)
+# How far past the head MonoDock looks for a pool task that can run now when
+# the head is waiting for its session's replica.
+POOL_SCAN_DEPTH = 32
+
+
+def addon_group(addon_pid: str) -> str:
+    """Addon kind without the instance suffix ("terminal" for "terminal:1a2b")."""
+    return addon_pid.split(":", 1)[0]
+
+
+class QueuePolicy(Enum):
+    REJECT_NEWEST = "reject_newest"
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+
+
+@dataclass(frozen=True)
+class QueueLimit:
+    max_depth: int | None
+    policy: QueuePolicy = QueuePolicy.REJECT_NEWEST
+
+    @classmethod
+    def from_config(cls, entry: dict | None, fallback: "QueueLimit") -> "QueueLimit":
+        if not isinstance(entry, dict):
+            return fallback
+        max_depth = entry.get("max_depth", fallback.max_depth)
+        try:
+            policy = QueuePolicy(entry.get("policy", fallback.policy.value))
+        except ValueError:
+            policy = fallback.policy
+        return cls(int(max_depth) if max_depth is not None else None, policy)
+
+
+class EnqueueStatus(Enum):
+    ACCEPTED = "ACCEPTED"
+    REJECTED = "REJECTED"  # not queued; the caller should give up or retry later
+    BLOCKED = "BLOCKED"  # not queued; the caller should hold it and resubmit on engine ready
+
+
+@dataclass
+class EnqueueResult:
+    status: EnqueueStatus
+    task: Task
+    reason: str = ""
+    # Older tasks evicted by a drop_oldest limit to make room; already CANCELLED.
+    dropped: list[Task] = field(default_factory=list)
+
+    @property
+    def accepted(self) -> bool:
+        return self.status == EnqueueStatus.ACCEPTED
 
 
 class MonoDock:
-    def __init__(self, guard: MonoGuard):
+    def __init__(
+        self,
+        guard: MonoGuard,
+        journal: TaskJournal | None = None,
+        config: dict | None = None,
+    ):
         self.guard = guard
+        self.journal = journal
         self.queues: dict[str, Deque[Task]] = {}
+        config = config or DEFAULT_KERNEL_CONFIG
+        self._load_limits(config.get("queue_limits", {}))
+        self._load_weights(config.get("fair_queuing", {}))
+        # Weighted fair queuing state (self-clocked): virtual finish tag per
+        # queued task id, and per (engine, priority) the virtual time and each
+        # addon's last finish tag.
+        self._fair_tags: dict[str, float] = {}
+        self._virtual_time: dict[tuple[str, int], float] = {}
+        self._flow_finish: dict[tuple[str, int, str], float] = {}
+        self._addon_depth: Counter[str] = Counter()
+        self.rejected: Counter[tuple[str, str]] = Counter()
+        self.dropped: Counter[tuple[str, str]] = Counter()
+        self.blocked: Counter[tuple[str, str]] = Counter()
+        # Single pending slot per engine: a preempted task waiting to resume.
+        self.pending: dict[str, Task] = {}
         self.cancelled_task_ids: set[str] = set()
         self.cancelled_addons: set[str] = set()
         self._in_submit: dict[str, bool] = {}
+        self._journaled_running: dict[str, Task] = {}
         self.guard.sig_engine_ready.connect(self._on_engine_ready)
 
-    def enqueue(self, task: Task) -> None:
+    def enqueue(self, task: Task) -> EnqueueResult:
         if task.priority == 1:
             self.on_stop(task.target)
-            return
+            self.guard.set_task_status(task, TaskStatus.DONE)
+            return EnqueueResult(EnqueueStatus.ACCEPTED, task)
+        result = self._admit(task)
+        if not result.accepted:
+            return result
+        for victim in result.dropped:
+            self._drop(victim)
+        task.enqueued_at = monotonic()
+        if self._is_journaled(task):
+            self.journal.record_enqueue(task)
         queue = self.queues.setdefault(task.target, deque())
         self._insert_task(queue, task)
+        self._addon_depth[task.addon_pid] += 1
+        self.guard.task_queued(task)
+        self._maybe_preempt(task)
         self._try_submit(task.target)
+        return result
 
     def cancel_task(self, task_id: str) -> None:
         self.cancelled_task_ids.add(task_id)
@@ -30,6 +126,7 @@ class MonoDock:
             active = self.guard.get_active_task(engine_key)
             if active and str(active.id) == task_id:
                 self.guard.stop(engine_key)
+        self._remove_cancelled()
 
     def cancel_addon(self, addon_pid: str) -> None:
         self.cancelled_addons.add(addon_pid)
@@ -37,6 +134,7 @@ class MonoDock:
             active = self.guard.get_active_task(engine_key)
             if active and active.addon_pid == addon_pid:
                 self.guard.stop(engine_key)
+        self._remove_cancelled()
 
     def on_stop(self, target: str = "all") -> None:
         self.guard.stop(target)
@@ -44,35 +142,284 @@ class MonoDock:
             for queue in self.queues.values():
                 for task in queue:
                     self.cancelled_task_ids.add(str(task.id))
+            for task in self.pending.values():
+                self.cancelled_task_ids.add(str(task.id))
         else:
             queue = self.queues.get(target)
             if queue:
                 for task in queue:
                     self.cancelled_task_ids.add(str(task.id))
+            pending = self.pending.get(target)
+            if pending is not None:
+                self.cancelled_task_ids.add(str(pending.id))
+        self._remove_cancelled()
+
+    def queue_snapshot(self) -> dict:
+        """Depth, limit and overflow counters per engine queue and per addon, plus journal write failures."""
+        engines = {}
+        for engine_key in sorted(set(self.guard.targets()) | set(self.queues)):
+            engines[engine_key] = self._scope_stats(
+                "engine", engine_key, len(self.queues.get(engine_key, ())), self._engine_limit(engine_key)
+            )
+        addons = {}
+        seen = {key for _scope, key in self.rejected + self.dropped + self.blocked if _scope == "addon"}
+        for addon_pid in sorted(seen | set(self._addon_depth)):
+            limit = self._addon_limit(addon_pid)
+            addons[addon_pid] = self._scope_stats("addon", addon_pid, self._addon_depth[addon_pid], limit)
+        snapshot = {"engines": engines, "addons": addons}
+        if self.journal is not None:
+            snapshot["journal"] = self.journal.stats()
+        return snapshot
+
+    def replay_journal(self) -> int:
+        """Re-enqueue durable tasks left unfinished by the previous run."""
+        if self.journal is None:
+            return 0
+        tasks = self.journal.unfinished()
+        self.journal.compact()
+        for task in tasks:
+            self.enqueue(task)
+        return len(tasks)
 
     def _on_engine_ready(self, engine_key: str) -> None:
+        if self._journaled_running:
+            self._journal_finished(engine_key)
         self._try_submit(engine_key)
 
-    def _try_submit(self, engine_key: str) -> None:
-        if self._in_submit.get(engine_key):
+    def _is_journaled(self, task: Task) -> bool:
+        # Setup commands are journaled regardless so replays can restore the engine first.
+        return self.journal is not None and (task.durable or task.command in SETUP_COMMANDS)
+
+    def _journal_finished(self, engine_key: str) -> None:
+        for task_id, task in list(self._journaled_running.items()):
+            if task.target == engine_key and task.status in FINISHED_STATUSES:
+                self.journal.record_finish(task)
+                del self._journaled_running[task_id]
+
+    # ---- queue limits ----
+
+    def _load_limits(self, config: dict) -> None:
+        unlimited = QueueLimit(None)
+        self._default_engine_limit = QueueLimit.from_config(config.get("engine"), unlimited)
+        self._default_addon_limit = QueueLimit.from_config(config.get("addon"), unlimited)
+        self._engine_limits = {
+            key: QueueLimit.from_config(entry, self._default_engine_limit)
+            for key, entry in config.get("engines", {}).items()
+        }
+        self._addon_limits = {
+            key: QueueLimit.from_config(entry, self._default_addon_limit)
+            for key, entry in config.get("addons", {}).items()
+        }
+
+    def _engine_limit(self, engine_key: str) -> QueueLimit:
+        return self._engine_limits.get(engine_key, self._default_engine_limit)
+
+    def _addon_limit(self, addon_pid: str) -> QueueLimit:
+        limit = self._addon_limits.get(addon_pid) or self._addon_limits.get(addon_group(addon_pid))
+        return limit or self._default_addon_limit
+
+    def _scope_stats(self, scope: str, key: str, depth: int, limit: QueueLimit) -> dict:
+        return {
+            "depth": depth,
+            "max_depth": limit.max_depth,
+            "policy": limit.policy.value,
+            "rejected": self.rejected[(scope, key)],
+            "dropped": self.dropped[(scope, key)],
+            "blocked": self.blocked[(scope, key)],
+        }
+
+    def _admit(self, task: Task) -> EnqueueResult:
+        """Check the engine and addon limits; victims are chosen here but dropped by enqueue."""
+        if task.command not in LIMITED_COMMANDS:
+            return EnqueueResult(EnqueueStatus.ACCEPTED, task)
+        victims: list[Task] = []
+        dropped_from: list[tuple[str, str]] = []
+        scopes = (
+            ("engine", task.target, len(self.queues.get(task.target, ())), self._engine_limit(task.target)),
+            ("addon", task.addon_pid, self._addon_depth[task.addon_pid], self._addon_limit(task.addon_pid)),
+        )
+        for scope, key, depth, limit in scopes:
+            depth -= sum(1 for victim in victims if self._in_scope(victim, scope, key))
+            if limit.max_depth is None or depth < limit.max_depth:
+                continue
+            if limit.policy == QueuePolicy.DROP_OLDEST:
+                victim = self._oldest_droppable(scope, key, task.priority, victims)
+                if victim is not None:
+                    victims.append(victim)
+                    dropped_from.append((scope, key))
+                    continue
+            reason = f"{scope} queue '{key}' is full ({limit.max_depth})"
+            if limit.policy == QueuePolicy.BLOCK:
+                self.blocked[(scope, key)] += 1
+                self.guard.trace(TraceLevel.DEBUG, "dock.blocked", f"holding task={task.id}: {reason}", task=task)
+                return EnqueueResult(EnqueueStatus.BLOCKED, task, reason)
+            self.rejected[(scope, key)] += 1
+            self.guard.trace(TraceLevel.WARNING, "dock.rejected", f"rejected task={task.id}: {reason}", task=task)
+            return EnqueueResult(EnqueueStatus.REJECTED, task, reason)
+        for scope_key in dropped_from:
+            self.dropped[scope_key] += 1
+        return EnqueueResult(EnqueueStatus.ACCEPTED, task, dropped=victims)
+
+    @staticmethod
+    def _in_scope(task: Task, scope: str, key: str) -> bool:
+        return (task.target if scope == "engine" else task.addon_pid) == key
+
+    def _oldest_droppable(self, scope: str, key: str, priority: int, exclude: list[Task]) -> Task | None:
+        # Never evict more urgent work to make room for less urgent work.
+        queues = [self.queues.get(key, ())] if scope == "engine" else self.queues.values()
+        candidates = [
+            queued
+            for queue in queues
+            for queued in queue
+            if self._in_scope(queued, scope, key)
+            and queued.command in LIMITED_COMMANDS
+            and queued.priority >= priority
+            and queued not in exclude
+            and not self._is_cancelled(queued)
+        ]
+        return min(candidates, key=lambda queued: queued.enqueued_at or 0.0, default=None)
+
+    def _drop(self, task: Task) -> None:
+        self.queues[task.target].remove(task)
+        self._fair_tags.pop(str(task.id), None)
+        self._release_depth(task)
+        task.checkpoint = None
+        self.guard.set_task_status(task, TaskStatus.CANCELLED)
+        if self._is_journaled(task):
+            self.journal.record_finish(task)
+        self.guard.trace(TraceLevel.WARNING, "dock.dropped", f"dropped queued task={task.id} (queue full)", task=task)
+
+    def _remove_cancelled(self) -> None:
+        # Cancelled tasks leave the queues now rather than when they reach the
+        # head of an idle engine: until then they would still count against
+        # the addon and engine limits and keep new submits REJECTED or
+        # BLOCKED, and their owners would wait for the CANCELLED event.
+        removed: list[Task] = []
+        for engine_key, queue in self.queues.items():
+            if self._in_submit.get(engine_key):
+                # Cancelled from a status callback mid-dispatch; _try_submit
+                # holds a task of this queue and drains the rest itself.
+                continue
+            cancelled = [task for task in queue if self._is_cancelled(task)]
+            if not cancelled:
+                continue
+            for task in cancelled:
+                queue.remove(task)
+                self._fair_tags.pop(str(task.id), None)
+                self._release_depth(task)
+            if not queue:
+                self._reset_fair_state(engine_key)
+            removed.extend(cancelled)
+        # Statuses go out only after the queues are consistent: a listener
+        # may submit again from inside set_task_status.
+        for task in removed:
+            task.checkpoint = None
+            self.cancelled_task_ids.discard(str(task.id))
+            self.guard.set_task_status(task, TaskStatus.CANCELLED)
+            if self._is_journaled(task):
+                self.journal.record_finish(task)
+        for engine_key in {task.target for task in removed}:
+            # A cancelled broadcast may have been holding back a pool.
+            self._try_submit(engine_key)
+
+    def _release_depth(self, task: Task) -> None:
+        self._addon_depth[task.addon_pid] -= 1
+        if self._addon_depth[task.addon_pid] <= 0:
+            del self._addon_depth[task.addon_pid]
+
+    def _maybe_preempt(self, task: Task) -> None:
+        # Only a strictly more urgent generate preempts, and only while the
+        # pending slot is free. Setup commands run alongside a generation
+        # (set_history, set_path) or must wait for the slot anyway (load,
+        # unload), so suspending for them would gain nothing.
+        if task.command not in PAYLOAD_COMMANDS or task.target in self.pending:
             return
+        active = self.guard.get_active_task(task.target)
+        if active is None or active.priority <= task.priority:
+            return
+        if self.guard.preempt(task.target):
+            self.pending[task.target] = active
+
+    def _next_task(self, engine_key: str) -> Task | None:
         queue = self.queues.get(engine_key)
+        pending = self.pending.get(engine_key)
+        if pending is not None and pending.status in FINISHED_STATUSES:
+            # Finished before the suspend took effect.
+            del self.pending[engine_key]
+            pending = None
+        if pending is not None and pending.status == TaskStatus.PENDING:
+            # The preempted task resumes ahead of queued work of its own priority.
+            if not queue or queue[0].priority >= pending.priority:
+                return pending
         if not queue:
+            return None
+        if engine_key in self.guard.pools:
+            # A session pinned to a busy replica must not hold back work
+            # that another, idle replica could take. A broadcast (load,
+            # unload) is a barrier: nothing queued behind it may overtake it,
+            # or work meant for the new model would run on the old one and
+            # steady traffic would keep the replicas from ever all going idle.
+            for index, task in enumerate(queue):
+                if index >= POOL_SCAN_DEPTH:
+                    break
+                if self._is_cancelled(task) or self.guard.can_dispatch(task):
+                    return task
+                if self.guard.is_broadcast(task):
+                    break
+            return None
+        return queue[0]
+
+    def _take(self, engine_key: str, task: Task) -> None:
+        if self.pending.get(engine_key) is task:
+            del self.pending[engine_key]
+            return
+        queue = self.queues.get(engine_key)
+        if queue:
+            if queue[0] is task:
+                taken = queue.popleft()
+            else:
+                queue.remove(task)
+                taken = task
+            self._release_depth(taken)
+            self._advance_virtual_time(taken)
+            if not queue:
+                self._reset_fair_state(engine_key)
+
+    def _try_submit(self, engine_key: str) -> None:
+        if self._in_submit.get(engine_key):
             return
 
         self._in_submit[engine_key] = True
         try:
-            while queue:
-                task = queue[0]
+            while True:
+                task = self._next_task(engine_key)
+                if task is None:
+                    break
                 if self._is_cancelled(task):
-                    task.status = TaskStatus.CANCELLED
-                    if queue:
-                        queue.popleft()
+                    task.checkpoint = None
+                    self._take(engine_key, task)
+                    self.guard.set_task_status(task, TaskStatus.CANCELLED)
                     self.cancelled_task_ids.discard(str(task.id))
+                    if self._is_journaled(task):
+                        self.journal.record_finish(task)
                     continue
                 accepted = self.guard.submit(task)
-                if accepted and queue:
-                    queue.popleft()
+                if not accepted and task.status not in FINISHED_STATUSES:
+                    # Busy: wait for the next READY.
+                    break
+                # Accepted, or FAILED outright (unknown target or command);
+                # either way it leaves the queue.
+                self._take(engine_key, task)
+                if self._is_journaled(task):
+                    if task.status in FINISHED_STATUSES:
+                        self.journal.record_finish(task)
+                    else:
+                        self.journal.record_dispatch(task)
+                        self._journaled_running[str(task.id)] = task
+                # Keep going while the target can take more: an immediate
+                # command finished inside submit, or a pool has idle replicas.
+                if task.status in FINISHED_STATUSES or self.guard.has_idle_capacity(engine_key):
+                    continue
                 break
         finally:
             self._in_submit[engine_key] = False
@@ -80,16 +427,63 @@ class MonoDock:
     def _is_cancelled(self, task: Task) -> bool:
         return str(task.id) in self.cancelled_task_ids or task.addon_pid in self.cancelled_addons
 
+    # ---- fair queuing ----
+
+    def _load_weights(self, config: dict) -> None:
+        self._default_weight = self._valid_weight(config.get("default_weight"), 1.0)
+        self._weights = {
+            key: self._valid_weight(weight, self._default_weight)
+            for key, weight in config.get("weights", {}).items()
+        }
+
+    @staticmethod
+    def _valid_weight(weight, fallback: float) -> float:
+        try:
+            weight = float(weight)
+        except (TypeError, ValueError):
+            return fallback
+        return weight if weight > 0 else fallback
+
+    def _weight(self, addon_pid: str) -> float:
+        weight = self._weights.get(addon_pid) or self._weights.get(addon_group(addon_pid))
+        return weight or self._default_weight
+
+    def _fair_tag(self, task: Task) -> float:
+        # An addon that was idle starts at the current virtual time; one with
+        # a backlog continues after its previous task. Each task costs
+        # 1/weight, so a weight-4 addon gets four dispatches for every one
+        # of a weight-1 addon that is also backlogged.
+        klass = (task.target, task.priority)
+        flow = (task.target, task.priority, task.addon_pid)
+        start = max(self._virtual_time.get(klass, 0.0), self._flow_finish.get(flow, 0.0))
+        finish = start + 1.0 / self._weight(task.addon_pid)
+        self._flow_finish[flow] = finish
+        self._fair_tags[str(task.id)] = finish
+        return finish
+
+    def _advance_virtual_time(self, task: Task) -> None:
+        tag = self._fair_tags.pop(str(task.id), None)
+        if tag is None:
+            return
+        klass = (task.target, task.priority)
+        self._virtual_time[klass] = max(self._virtual_time.get(klass, 0.0), tag)
+
+    def _reset_fair_state(self, engine_key: str) -> None:
+        # An empty queue has no backlog to be fair about; dropping the state
+        # keeps it bounded by the addons currently queued.
+        for klass in [klass for klass in self._virtual_time if klass[0] == engine_key]:
+            del self._virtual_time[klass]
+        for flow in [flow for flow in self._flow_finish if flow[0] == engine_key]:
+            del self._flow_finish[flow]
+
     def _insert_task(self, queue: Deque[Task], task: Task) -> None:
-        if task.priority == 2:
-            items = list(queue)
-            insert_at = 0
-            for existing in items:
-                if existing.priority != 2:
-                    break
-                insert_at += 1
-            items.insert(insert_at, task)
-            queue.clear()
-            queue.extend(items)
-        else:
-            queue.append(task)
+        # Ordered by priority, then by virtual finish tag within a priority;
+        # new tasks usually land near the back, so scan from there.
+        key = (task.priority, self._fair_tag(task))
+        insert_at = len(queue)
+        while insert_at > 0:
+            previous = queue[insert_at - 1]
+            if (previous.priority, self._fair_tags.get(str(previous.id), 0.0)) <= key:
+                break
+            insert_at -= 1
+        queue.insert(insert_at, task)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from dataclasses import replace
 from datetime import datetime
+from time import monotonic
 from typing import Optional
 
 from core.paths import LOG_DIR
@@ -9,7 +12,10 @@ from PySide6.QtCore import QObject, Signal, QTimer
 
 from core.state import AppState, SystemStatus
 from core.task import Task, TaskStatus
+from core.trace import TraceEvent, TraceLevel
 from engine.base import EnginePort
+from monokernel.channels import OutputChannel
+from monokernel.metrics import KernelMetrics
 
 ENGINE_DISPATCH = {
     "set_path": "set_model_path",
@@ -22,15 +28,51 @@ ENGINE_DISPATCH = {
 IMMEDIATE_COMMANDS = {"set_history", "set_path"}
 PAYLOAD_COMMANDS = {"generate"}
 
+# Engine pools: replicas are registered as "<target>#<n>" and addressed by
+# tasks as "<target>". These commands configure every replica at once; the
+# rest go to one replica chosen by _route.
+POOL_SEPARATOR = "#"
+BROADCAST_COMMANDS = {"set_path", "load", "unload"}
+# A pool reports the busiest replica state; READY only once all are idle.
+POOL_STATUS_ORDER = (SystemStatus.LOADING, SystemStatus.UNLOADING, SystemStatus.RUNNING)
+AFFINITY_LIMIT = 1024
+
+
+def pool_key(engine_key: str) -> str:
+    """Task target of an engine key ("llm" for replica "llm#1")."""
+    return engine_key.split(POOL_SEPARATOR, 1)[0]
+
+
+def external_payload(target: str, payload: dict) -> dict:
+    """
+    Payload for a generate task sent by a client other than the terminal.
+
+    A plain llm "prompt" becomes a one-message conversation, so the engine
+    runs it as an external generation: the terminal's history is left alone
+    and no trailing newline is added to the output.
+    """
+    if pool_key(target) != "llm" or "prompt" not in payload:
+        return payload
+    if payload.get("raw") or isinstance(payload.get("messages"), list):
+        return payload
+    payload = dict(payload)
+    payload["messages"] = [{"role": "user", "content": payload.pop("prompt")}]
+    return payload
+
 
 class MonoGuard(QObject):
     sig_token = Signal(str)
     sig_trace = Signal(str)
+    sig_trace_event = Signal(object)
     sig_status = Signal(str, SystemStatus)
     sig_engine_ready = Signal(str)
     sig_usage = Signal(int)
     sig_image = Signal(object)
+    sig_audio = Signal(object)
     sig_finished = Signal(str, str)
+    # Every TaskStatus transition: task_id, old (None when first queued),
+    # new, Task.timing(). Emitted synchronously from the mutating call.
+    sig_task_state = Signal(str, object, object, object)
 
     def __init__(self, state: AppState, engines: dict[str, EnginePort]):
         super().__init__()
@@ -40,7 +82,29 @@ class MonoGuard(QObject):
             key: None for key in engines.keys()
         }
         self._stop_requested: dict[str, bool] = {key: False for key in engines.keys()}
+        self._preempt_requested: dict[str, bool] = {key: False for key in engines.keys()}
         self._viztracer = None
+        self.metrics = KernelMetrics()
+        # Output routing: engine output goes to the channels of the task that
+        # produced it (its own and its addon's) plus the engine channel. Late
+        # output after READY is attributed to the engine's last task.
+        self._last_task: dict[str, Task] = {}
+        self._task_channels: dict[str, OutputChannel] = {}
+        self._addon_channels: dict[str, OutputChannel] = {}
+        self._engine_channels: dict[str, OutputChannel] = {}
+        # Pools: target -> replica keys, plus routing state. Session affinity
+        # keeps a conversation on the replica that holds its context.
+        self._target_of: dict[str, str] = {key: pool_key(key) for key in engines}
+        self.pools: dict[str, list[str]] = {}
+        for key in engines:
+            if POOL_SEPARATOR in key:
+                self.pools.setdefault(pool_key(key), []).append(key)
+        self._pool_status: dict[str, SystemStatus] = {target: SystemStatus.READY for target in self.pools}
+        self._replica_status: dict[str, SystemStatus] = {}
+        self._replica_busy: dict[str, float] = {}
+        self._affinity: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._broadcast_pending: dict[str, set[str]] = {}
+        self._broadcast_failed: set[str] = set()
 
         for key, engine in engines.items():
             engine.sig_status.connect(
@@ -48,17 +112,94 @@ class MonoGuard(QObject):
                     engine_key, status
                 )
             )
-            engine.sig_token.connect(self.sig_token)
-            engine.sig_trace.connect(self.sig_trace)
+            engine.sig_token.connect(
+                lambda token, engine_key=key: self._on_engine_token(engine_key, token)
+            )
+            if hasattr(engine, "sig_trace_event"):
+                engine.sig_trace_event.connect(
+                    lambda event, engine_key=key: self._on_engine_trace(engine_key, event)
+                )
+            else:
+                engine.sig_trace.connect(
+                    lambda message, engine_key=key: self._on_engine_trace(
+                        engine_key, TraceEvent.from_text(engine_key, message)
+                    )
+                )
             if hasattr(engine, "sig_usage"):
                 engine.sig_usage.connect(self.sig_usage)
+                engine.sig_usage.connect(
+                    lambda count, engine_key=key: self._on_engine_progress(engine_key, count)
+                )
+            if hasattr(engine, "sig_progress"):
+                engine.sig_progress.connect(
+                    lambda count, engine_key=key: self._on_engine_progress(engine_key, count)
+                )
             if hasattr(engine, "sig_image"):
-                engine.sig_image.connect(self.sig_image)
+                engine.sig_image.connect(
+                    lambda image, engine_key=key: self._on_engine_image(engine_key, image)
+                )
+            if hasattr(engine, "sig_audio"):
+                engine.sig_audio.connect(
+                    lambda audio, engine_key=key: self._on_engine_audio(engine_key, audio)
+                )
+            if hasattr(engine, "sig_checkpoint"):
+                engine.sig_checkpoint.connect(
+                    lambda checkpoint, engine_key=key: self._on_engine_checkpoint(engine_key, checkpoint)
+                )
             if hasattr(engine, "sig_finished"):
                 engine.sig_finished.connect(
                     lambda engine_key=key: self._on_engine_finished(engine_key)
                 )
 
+    def targets(self) -> list[str]:
+        """Task targets: plain engine keys and pool names, in registration order."""
+        return list(dict.fromkeys(self._target_of.values()))
+
+    # ---- subscription channels ----
+
+    def task_channel(self, task_id: str) -> OutputChannel:
+        """Output of a single task. Released automatically once the task finishes."""
+        return self._channel(self._task_channels, task_id)
+
+    def addon_channel(self, addon_pid: str) -> OutputChannel:
+        """Output of every task submitted by addon_pid."""
+        return self._channel(self._addon_channels, addon_pid)
+
+    def engine_channel(self, engine_key: str) -> OutputChannel:
+        """All output of one engine, whoever submitted the work."""
+        return self._channel(self._engine_channels, engine_key)
+
+    def release_task_channel(self, task_id: str) -> None:
+        channel = self._task_channels.pop(task_id, None)
+        if channel is not None:
+            channel.deleteLater()
+
+    def release_addon_channel(self, addon_pid: str) -> None:
+        channel = self._addon_channels.pop(addon_pid, None)
+        if channel is not None:
+            channel.deleteLater()
+
+    def _channel(self, scope: dict[str, OutputChannel], key: str) -> OutputChannel:
+        channel = scope.get(key)
+        if channel is None:
+            channel = scope[key] = OutputChannel(self)
+        return channel
+
+    def _channels_for(self, engine_key: str) -> tuple[Optional[Task], list[OutputChannel]]:
+        task = self.active_tasks.get(engine_key) or self._last_task.get(engine_key)
+        channels = []
+        if task is not None:
+            channel = self._task_channels.get(str(task.id))
+            if channel is not None:
+                channels.append(channel)
+            channel = self._addon_channels.get(task.addon_pid)
+            if channel is not None:
+                channels.append(channel)
+        channel = self._engine_channels.get(self._target_of.get(engine_key, engine_key))
+        if channel is not None:
+            channels.append(channel)
+        return task, channels
+
     def get_active_task_id(self, engine_key: str) -> str | None:
         task = self.active_tasks.get(engine_key)
         return str(task.id) if task else None
@@ -66,51 +207,235 @@ class MonoGuard(QObject):
     def get_active_task(self, engine_key: str) -> Task | None:
         return self.active_tasks.get(engine_key)
 
+    # ---- task state ----
+
+    def set_task_status(self, task: Task, status: TaskStatus) -> None:
+        """The only place a kernel-owned task changes status."""
+        old = task.status
+        task.status = status
+        if old != status:
+            self.sig_task_state.emit(str(task.id), old, status, task.timing())
+
+    def task_queued(self, task: Task) -> None:
+        """Announce a task MonoDock accepted into a queue."""
+        self.sig_task_state.emit(str(task.id), None, task.status, task.timing())
+
     def submit(self, task: Task) -> bool:
-        engine = self.engines.get(task.target)
-        if engine is None:
-            self.sig_trace.emit(f"ERROR: Unknown engine target: {task.target}")
+        replicas = self.pools.get(task.target)
+        if replicas is not None:
+            return self._submit_to_pool(task, replicas)
+        if task.target not in self.engines:
+            self.trace(TraceLevel.ERROR, "guard.unknown_target", f"Unknown engine target: {task.target}", task=task)
+            self._finish_task(task, TaskStatus.FAILED)
             return False
+        return self._dispatch(task, task.target)
+
+    def can_dispatch(self, task: Task) -> bool:
+        """Whether submit would place task right now; MonoDock skips pool tasks that would wait."""
+        replicas = self.pools.get(task.target)
+        if replicas is None:
+            return task.command in IMMEDIATE_COMMANDS or self.active_tasks.get(task.target) is None
+        if self.is_broadcast(task):
+            return task.command in IMMEDIATE_COMMANDS or self._all_idle(replicas)
+        return self._route(task, replicas, bind=False) is not None
 
+    def has_idle_capacity(self, target: str) -> bool:
+        replicas = self.pools.get(target)
+        return replicas is not None and any(self.active_tasks.get(key) is None for key in replicas)
+
+    def _resolve_handler(self, task: Task, engine: EnginePort):
         method_name = ENGINE_DISPATCH.get(task.command)
         if not method_name:
-            self.sig_trace.emit(f"ERROR: Unknown command: {task.command}")
-            task.status = TaskStatus.FAILED
-            return False
+            self.trace(TraceLevel.ERROR, "guard.unknown_command", f"Unknown command: {task.command}", task=task)
+            self._finish_task(task, TaskStatus.FAILED)
+            return None
 
         handler = getattr(engine, method_name, None)
         if not handler:
-            self.sig_trace.emit(f"ERROR: Engine lacks handler: {method_name}")
-            task.status = TaskStatus.FAILED
+            self.trace(TraceLevel.ERROR, "guard.no_handler", f"Engine lacks handler: {method_name}", task=task)
+            self._finish_task(task, TaskStatus.FAILED)
+            return None
+        return handler
+
+    def _dispatch(self, task: Task, engine_key: str) -> bool:
+        handler = self._resolve_handler(task, self.engines[engine_key])
+        if handler is None:
             return False
 
         if task.command in IMMEDIATE_COMMANDS:
-            self.sig_trace.emit(f"GUARD: IMMEDIATE {task.command} task={task.id}")
-            task.status = TaskStatus.RUNNING
+            self.trace(TraceLevel.DEBUG, "guard.immediate", f"IMMEDIATE {task.command} task={task.id}", task=task)
+            task.dispatched_at = monotonic()
+            self.set_task_status(task, TaskStatus.RUNNING)
             handler(task.payload)
-            task.status = TaskStatus.DONE
+            self._finish_task(task, TaskStatus.DONE)
             return True
 
-        if self.active_tasks.get(task.target) is not None:
-            self.sig_trace.emit(f"GUARD: rejected task={task.id} target={task.target} (busy)")
+        if self.active_tasks.get(engine_key) is not None:
+            self.trace(
+                TraceLevel.WARNING, "guard.rejected",
+                f"rejected task={task.id} target={engine_key} (busy)", task=task,
+            )
             return False
 
-        self.sig_trace.emit(f"GUARD: accepted task={task.id} target={task.target} command={task.command}")
-        self.active_tasks[task.target] = task
-        task.status = TaskStatus.RUNNING
+        self.trace(
+            TraceLevel.DEBUG, "guard.accepted",
+            f"accepted task={task.id} target={engine_key} command={task.command}", task=task,
+        )
+        self.active_tasks[engine_key] = task
+        self._last_task[engine_key] = task
+        if task.dispatched_at is None:
+            task.dispatched_at = monotonic()
+        self.set_task_status(task, TaskStatus.RUNNING)
 
         if task.command in PAYLOAD_COMMANDS:
-            handler(task.payload)
+            payload = task.payload
+            if task.checkpoint is not None:
+                payload = {**payload, "resume": task.checkpoint}
+                task.checkpoint = None
+            handler(payload)
         else:
             handler()
         return True
 
+    # ---- engine pools ----
+
+    @staticmethod
+    def _session(task: Task) -> str | None:
+        session = task.payload.get("session") if isinstance(task.payload, dict) else None
+        return str(session) if session is not None else None
+
+    def is_broadcast(self, task: Task) -> bool:
+        # Session-less immediate commands (set_path, a plain set_history)
+        # apply to every replica as they did to the single engine.
+        return task.command in BROADCAST_COMMANDS or (
+            task.command in IMMEDIATE_COMMANDS and self._session(task) is None
+        )
+
+    def _all_idle(self, replicas: list[str]) -> bool:
+        return all(self.active_tasks.get(key) is None for key in replicas)
+
+    def _route(self, task: Task, replicas: list[str], bind: bool = True) -> str | None:
+        """
+        Replica for task, or None if it has to wait.
+
+        A task with a payload "session" goes back to the replica that served
+        that session before, waiting for it if it is busy. Otherwise the idle
+        replica with the least accumulated busy time is chosen (and bound to
+        the session, if there is one).
+        """
+        immediate = task.command in IMMEDIATE_COMMANDS
+        session = self._session(task)
+        if session is not None:
+            affinity_key = (task.target, session)
+            bound = self._affinity.get(affinity_key)
+            if bound is not None:
+                if bind:
+                    self._affinity.move_to_end(affinity_key)
+                return bound if immediate or self.active_tasks.get(bound) is None else None
+        idle = [key for key in replicas if self.active_tasks.get(key) is None]
+        candidates = idle or (replicas if immediate else [])
+        if not candidates:
+            return None
+        choice = min(candidates, key=lambda key: self._replica_busy.get(key, 0.0))
+        if session is not None and bind:
+            self._affinity[(task.target, session)] = choice
+            while len(self._affinity) > AFFINITY_LIMIT:
+                self._affinity.popitem(last=False)
+        return choice
+
+    def _submit_to_pool(self, task: Task, replicas: list[str]) -> bool:
+        if not self.is_broadcast(task):
+            engine_key = self._route(task, replicas)
+            if engine_key is None:
+                return False
+            return self._dispatch(task, engine_key)
+
+        handlers = []
+        for key in replicas:
+            handler = self._resolve_handler(task, self.engines[key])
+            if handler is None:
+                return False
+            handlers.append(handler)
+
+        if task.command in IMMEDIATE_COMMANDS:
+            self.trace(TraceLevel.DEBUG, "guard.immediate", f"IMMEDIATE {task.command} task={task.id}", task=task)
+            task.dispatched_at = monotonic()
+            self.set_task_status(task, TaskStatus.RUNNING)
+            for handler in handlers:
+                handler(task.payload)
+            self._finish_task(task, TaskStatus.DONE)
+            return True
+
+        if not self._all_idle(replicas):
+            return False
+        self.trace(
+            TraceLevel.DEBUG, "guard.accepted",
+            f"accepted task={task.id} target={task.target} command={task.command} replicas={len(replicas)}",
+            task=task,
+        )
+        self._broadcast_pending[str(task.id)] = set(replicas)
+        task.dispatched_at = monotonic()
+        for key in replicas:
+            self.active_tasks[key] = task
+            self._last_task[key] = task
+        self.set_task_status(task, TaskStatus.RUNNING)
+        for handler in handlers:
+            handler()
+        return True
+
+    def _settle_broadcast(self, engine_key: str, task: Task, failed: bool) -> None:
+        task_id = str(task.id)
+        waiting = self._broadcast_pending[task_id]
+        waiting.discard(engine_key)
+        if failed:
+            self._broadcast_failed.add(task_id)
+        if waiting:
+            return
+        del self._broadcast_pending[task_id]
+        if task_id in self._broadcast_failed:
+            self._broadcast_failed.discard(task_id)
+            self._finish_task(task, TaskStatus.FAILED)
+        else:
+            self._finish_task(task, TaskStatus.DONE)
+
+    def _update_pool_status(self, target: str, engine_key: str, status: SystemStatus) -> None:
+        # ERROR is reported as-is, but the replica is READY again right after.
+        self._replica_status[engine_key] = SystemStatus.READY if status == SystemStatus.ERROR else status
+        if status == SystemStatus.ERROR:
+            self.sig_status.emit(target, status)
+        states = {self._replica_status.get(key) for key in self.pools[target]}
+        aggregate = next((state for state in POOL_STATUS_ORDER if state in states), SystemStatus.READY)
+        if aggregate != self._pool_status.get(target) or status == SystemStatus.ERROR:
+            self._pool_status[target] = aggregate
+            self.sig_status.emit(target, aggregate)
+
+    def preempt(self, target: str) -> bool:
+        """
+        Suspend the running task on target so a more urgent one can run.
+
+        Non-blocking: the engine checkpoints on its worker thread and turns
+        READY; the task then goes back to PENDING with its checkpoint attached
+        instead of finishing. Returns False if the engine cannot suspend.
+        """
+        task = self.active_tasks.get(target)
+        engine = self.engines.get(target)
+        if task is None or engine is None or task.command not in PAYLOAD_COMMANDS:
+            return False
+        if self._stop_requested.get(target) or self._preempt_requested.get(target):
+            return False
+        suspend = getattr(engine, "suspend_generation", None)
+        if suspend is None or not suspend():
+            return False
+        self._preempt_requested[target] = True
+        self.trace(TraceLevel.INFO, "guard.preempt", f"PREEMPT task={task.id} target={target}", task=task)
+        return True
+
     def stop(self, target: str = "all") -> None:
-        self.sig_trace.emit(f"GUARD: STOP target={target}")
+        self.trace(TraceLevel.INFO, "guard.stop", f"STOP target={target}", target=target)
         if target == "all":
             keys = list(self.engines.keys())
         else:
-            keys = [target]
+            keys = self.pools.get(target, [target])
 
         for key in keys:
             engine = self.engines.get(key)
@@ -121,39 +446,144 @@ class MonoGuard(QObject):
                 self._stop_requested[key] = True
             engine.stop_generation()
 
+    def _on_engine_token(self, engine_key: str, token: str) -> None:
+        task, channels = self._channels_for(engine_key)
+        if task is not None and task.first_output_at is None and task.status == TaskStatus.RUNNING:
+            task.first_output_at = monotonic()
+        for channel in channels:
+            channel.sig_token.emit(token)
+        self.sig_token.emit(token)
+
+    def _on_engine_image(self, engine_key: str, image: object) -> None:
+        task, channels = self._channels_for(engine_key)
+        if task is not None and task.first_output_at is None and task.status == TaskStatus.RUNNING:
+            task.first_output_at = monotonic()
+        for channel in channels:
+            channel.sig_image.emit(image)
+        self.sig_image.emit(image)
+
+    def _on_engine_audio(self, engine_key: str, audio: object) -> None:
+        task, channels = self._channels_for(engine_key)
+        if task is not None and task.first_output_at is None and task.status == TaskStatus.RUNNING:
+            task.first_output_at = monotonic()
+        for channel in channels:
+            channel.sig_audio.emit(audio)
+        self.sig_audio.emit(audio)
+
+    def _on_engine_trace(self, engine_key: str, event: TraceEvent) -> None:
+        task, channels = self._channels_for(engine_key)
+        event = replace(event, engine=engine_key, task_id=str(task.id) if task else None)
+        self._emit_trace(event, channels)
+
+    def trace(
+        self,
+        level: TraceLevel,
+        code: str,
+        message: str,
+        task: Task | None = None,
+        **fields,
+    ) -> None:
+        """Emit a kernel-side trace; task-scoped events also reach the task's addon channel."""
+        channels = []
+        if task is not None:
+            channel = self._addon_channels.get(task.addon_pid)
+            if channel is not None:
+                channels.append(channel)
+        event = TraceEvent(
+            level,
+            code,
+            message,
+            engine=task.target if task else "",
+            task_id=str(task.id) if task else None,
+            fields=fields,
+        )
+        self._emit_trace(event, channels)
+
+    def _emit_trace(self, event: TraceEvent, channels: list[OutputChannel]) -> None:
+        text = event.text()
+        for channel in channels:
+            channel.sig_trace_event.emit(event)
+            channel.sig_trace.emit(text)
+        self.sig_trace_event.emit(event)
+        self.sig_trace.emit(text)
+
+    def _on_engine_checkpoint(self, engine_key: str, checkpoint: object) -> None:
+        task = self.active_tasks.get(engine_key)
+        if task is not None and self._preempt_requested.get(engine_key):
+            task.checkpoint = checkpoint
+
+    def _on_engine_progress(self, engine_key: str, count: int) -> None:
+        task = self.active_tasks.get(engine_key)
+        if task is not None:
+            task.output_units = count
+
+    def _finish_task(self, task: Task, status: TaskStatus) -> None:
+        task.finished_at = monotonic()
+        task.checkpoint = None
+        self.set_task_status(task, status)
+        self.metrics.record(task)
+        self.release_task_channel(str(task.id))
+
     def _on_engine_finished(self, engine_key: str) -> None:
         task = self.active_tasks.get(engine_key)
         if task:
-            self.sig_finished.emit(engine_key, str(task.id))
-            self.sig_trace.emit(f"GUARD: finished engine={engine_key} task={task.id}")
+            task_id = str(task.id)
+            _task, channels = self._channels_for(engine_key)
+            for channel in channels:
+                channel.sig_finished.emit(task_id)
+            self.sig_finished.emit(task.target, task_id)
+            self.trace(TraceLevel.DEBUG, "guard.finished", f"finished engine={engine_key} task={task.id}", task=task)
 
     def _on_status_changed(self, engine_key: str, new_status: SystemStatus) -> None:
         self.sig_status.emit(engine_key, new_status)
+        # Readiness is announced per task target, so queues keyed by a pool
+        # name are drained whichever replica freed up.
+        target = self._target_of.get(engine_key, engine_key)
+        if target != engine_key:
+            self._update_pool_status(target, engine_key, new_status)
+        task = self.active_tasks.get(engine_key)
+        if task is not None and str(task.id) in self._broadcast_pending and new_status in (
+            SystemStatus.READY, SystemStatus.ERROR
+        ):
+            self._settle_broadcast(engine_key, task, failed=new_status == SystemStatus.ERROR)
+            self.active_tasks[engine_key] = None
+            self._stop_requested[engine_key] = False
+            self._preempt_requested[engine_key] = False
+            QTimer.singleShot(0, lambda: self.sig_engine_ready.emit(target))
+            return
 
         if new_status == SystemStatus.ERROR:
-            task = self.active_tasks.get(engine_key)
             had_task = task is not None
             if task:
-                task.status = TaskStatus.FAILED
+                self._finish_task(task, TaskStatus.FAILED)
             self.active_tasks[engine_key] = None
             self._stop_requested[engine_key] = False
+            self._preempt_requested[engine_key] = False
             self.sig_status.emit(engine_key, SystemStatus.READY)
             if had_task:
-                QTimer.singleShot(0, lambda: self.sig_engine_ready.emit(engine_key))
+                QTimer.singleShot(0, lambda: self.sig_engine_ready.emit(target))
             return
 
         if new_status == SystemStatus.READY:
-            task = self.active_tasks.get(engine_key)
             had_task = task is not None
             if task and task.status == TaskStatus.RUNNING:
+                if target != engine_key and task.dispatched_at is not None:
+                    self._replica_busy[engine_key] = (
+                        self._replica_busy.get(engine_key, 0.0) + monotonic() - task.dispatched_at
+                    )
                 if self._stop_requested.get(engine_key, False):
-                    task.status = TaskStatus.CANCELLED
+                    self._finish_task(task, TaskStatus.CANCELLED)
+                elif task.checkpoint is not None:
+                    # Preempted: back to PENDING, MonoDock holds it for resume.
+                    task.preemptions += 1
+                    self.set_task_status(task, TaskStatus.PENDING)
                 else:
-                    task.status = TaskStatus.DONE
+                    self._finish_task(task, TaskStatus.DONE)
             self.active_tasks[engine_key] = None
             self._stop_requested[engine_key] = False
+            self._preempt_requested[engine_key] = False
             if had_task:
-                QTimer.singleShot(0, lambda: self.sig_engine_ready.emit(engine_key))
+                QTimer.singleShot(0, lambda: self.sig_engine_ready.emit(target))
 
 
     def enable_viztracer(self, enabled: bool) -> None:
@@ -163,7 +593,7 @@ class MonoGuard(QObject):
             try:
                 from viztracer import VizTracer
             except Exception as exc:
-                self.sig_trace.emit(f"OVERSEER: viztracer unavailable: {exc}")
+                self.trace(TraceLevel.WARNING, "overseer.viztracer", f"viztracer unavailable: {exc}")
                 return
             try:
                 self._viztracer = VizTracer(
@@ -179,7 +609,7 @@ class MonoGuard(QObject):
             except Exception:
                 self._viztracer = VizTracer()
             self._viztracer.start()
-            self.sig_trace.emit("OVERSEER: viztracer started")
+            self.trace(TraceLevel.INFO, "overseer.viztracer", "viztracer started")
             return
 
         tracer = self._viztracer
@@ -189,5 +619,5 @@ class MonoGuard(QObject):
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         out_path = LOG_DIR / f"viztrace_{ts}.json"
         tracer.save(str(out_path))
-        self.sig_trace.emit(f"OVERSEER: viztracer saved {out_path}")
+        self.trace(TraceLevel.INFO, "overseer.viztracer", f"viztracer saved {out_path}", path=str(out_path))
         self._viztracer = None
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from time import time
+from uuid import UUID
+
+from core.paths import LOG_DIR
+from core.task import Task, TaskStatus
+
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+UNFINISHED_STATES = (QUEUED, RUNNING)
+# Finished rows of these commands are kept so a replay can restore the engine
+# setup (model path + load) that queued work was submitted against.
+SETUP_COMMANDS = ("set_path", "load", "unload")
+
+_STOP = object()
+
+
+class TaskJournal:
+    """
+    Write-ahead journal for durable tasks in SQLite.
+
+    Callers only put records on an in-memory queue. A writer thread drains
+    whatever accumulated within flush_interval and commits it as one
+    transaction, so the enqueue path never waits on disk.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        flush_interval: float = 0.05,
+        max_batch: int = 512,
+    ):
+        self.path = path or LOG_DIR / "task_journal.sqlite3"
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._lock = threading.Lock()
+        # Journal writes lost to failed commits; each one may be a lost task.
+        self._failed = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS journal(
+                task_id TEXT PRIMARY KEY,
+                addon_pid TEXT NOT NULL,
+                target TEXT NOT NULL,
+                command TEXT NOT NULL,
+                payload TEXT,
+                priority INTEGER NOT NULL,
+                created REAL NOT NULL,
+                state TEXT NOT NULL,
+                updated REAL NOT NULL,
+                durable INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(journal)")}
+        if "durable" not in columns:
+            # Journals written before the column existed only held durable
+            # tasks besides setup commands, so the flag can be derived.
+            self._conn.execute("ALTER TABLE journal ADD COLUMN durable INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute(
+                "UPDATE journal SET durable = 1 WHERE command NOT IN (?, ?, ?)", SETUP_COMMANDS
+            )
+        self._conn.commit()
+        self._opened = time()
+        self._writer = threading.Thread(target=self._run, name="task-journal", daemon=True)
+        self._writer.start()
+
+    # ---- producer side (kernel thread) ----
+
+    def record_enqueue(self, task: Task) -> None:
+        self._queue.put(
+            (
+                "INSERT INTO journal(task_id, addon_pid, target, command, payload, priority, created, state, updated, "
+                "durable) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(task_id) DO UPDATE SET state=excluded.state, updated=excluded.updated",
+                (
+                    str(task.id),
+                    task.addon_pid,
+                    task.target,
+                    task.command,
+                    json.dumps(task.payload, default=str),
+                    task.priority,
+                    task.timestamp,
+                    QUEUED,
+                    time(),
+                    int(task.durable),
+                ),
+            )
+        )
+
+    def record_dispatch(self, task: Task) -> None:
+        self._set_state(task, RUNNING)
+
+    def record_finish(self, task: Task) -> None:
+        self._set_state(task, task.status.value)
+
+    def _set_state(self, task: Task, state: str) -> None:
+        self._queue.put(
+            ("UPDATE journal SET state = ?, updated = ? WHERE task_id = ?", (state, time(), str(task.id)))
+        )
+
+    # ---- replay ----
+
+    def unfinished(self) -> list[Task]:
+        """
+        Durable tasks that never finished, oldest first, each preceded by its target's setup.
+
+        Setup commands are only journaled to restore the engine for that work:
+        an interrupted non-durable load is never replayed on its own, so a load
+        that crashed the process does not crash every following start.
+        """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM journal WHERE state IN (?, ?) AND durable = 1 ORDER BY created",
+                UNFINISHED_STATES,
+            ).fetchall()
+            replay: list[Task] = []
+            seen_targets: set[str] = set()
+            for row in rows:
+                target = row[2]
+                if target not in seen_targets:
+                    seen_targets.add(target)
+                    replay.extend(self._setup_for(target))
+                replay.append(self._row_to_task(row))
+        return replay
+
+    def _setup_for(self, target: str) -> list[Task]:
+        rows = self._conn.execute(
+            "SELECT * FROM journal WHERE target = ? AND command IN (?, ?, ?) AND state = ? "
+            "ORDER BY created DESC",
+            (target, *SETUP_COMMANDS, TaskStatus.DONE.value),
+        ).fetchall()
+        latest: dict[str, tuple] = {}
+        for row in rows:
+            latest.setdefault(row[3], row)
+        load = latest.get("load")
+        unload = latest.get("unload")
+        if load is None or (unload is not None and unload[6] > load[6]):
+            return []
+        setup = [latest["set_path"]] if "set_path" in latest else []
+        return [self._row_to_task(row, fresh=True) for row in setup + [load]]
+
+    def _row_to_task(self, row: tuple, fresh: bool = False) -> Task:
+        task_id, addon_pid, target, command, payload, priority, created, _state, _updated, _durable = row
+        task = Task.new(
+            addon_pid=addon_pid,
+            target=target,
+            command=command,
+            payload=json.loads(payload) if payload else {},
+            priority=priority,
+            durable=True,
+        )
+        if not fresh:
+            task.id = UUID(task_id)
+            task.timestamp = created
+        return task
+
+    def compact(self) -> None:
+        """
+        Drop finished rows, keeping the newest setup command per target and kind,
+        and non-durable rows a previous run left unfinished (never replayed).
+        """
+        self.flush()
+        self._queue.put(
+            (
+                "DELETE FROM journal WHERE state NOT IN (?, ?) AND NOT ("
+                "command IN (?, ?, ?) AND created = ("
+                "SELECT MAX(j.created) FROM journal j "
+                "WHERE j.target = journal.target AND j.command = journal.command AND j.state = ?))",
+                (*UNFINISHED_STATES, *SETUP_COMMANDS, TaskStatus.DONE.value),
+            )
+        )
+        self._queue.put(
+            (
+                "DELETE FROM journal WHERE durable = 0 AND state IN (?, ?) AND updated < ?",
+                (*UNFINISHED_STATES, self._opened),
+            )
+        )
+        self.flush()
+
+    # ---- writer ----
+
+    def stats(self) -> dict[str, int]:
+        return {"failed": self._failed}
+
+    def flush(self) -> None:
+        """Block until every record put so far is committed (or failed)."""
+        if not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        if not self._writer.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._writer.join()
+        with self._lock:
+            self._conn.close()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            deadline = time() + self.flush_interval
+            while len(batch) < self.max_batch and item is not _STOP and not isinstance(item, threading.Event):
+                remaining = deadline - time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            waiters = [entry for entry in batch if isinstance(entry, threading.Event)]
+            statements = [entry for entry in batch if isinstance(entry, tuple)]
+            if statements:
+                try:
+                    with self._lock, self._conn:
+                        for sql, params in statements:
+                            self._conn.execute(sql, params)
+                except sqlite3.Error:
+                    # Drop the failed group rather than kill the writer; the
+                    # count surfaces in MonoDock.queue_snapshot().
+                    self._failed += len(statements)
+            for waiter in waiters:
+                waiter.set()
+            if batch[-1] is _STOP:
+                return
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque
+
+from core.task import Task, TaskStatus
+
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyWindow:
+    """Bounded window of recent samples with nearest-rank percentiles."""
+
+    def __init__(self, size: int = 512):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, value: float | None) -> None:
+        if value is not None:
+            self._samples.append(value)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentiles(self) -> dict[str, float | None]:
+        if not self._samples:
+            return {f"p{p}": None for p in PERCENTILES}
+        ordered = sorted(self._samples)
+        n = len(ordered)
+        return {f"p{p}": ordered[max(0, -(-n * p // 100) - 1)] for p in PERCENTILES}
+
+
+class _Series:
+    def __init__(self, window: int):
+        self.queue_wait = LatencyWindow(window)
+        self.first_output = LatencyWindow(window)
+        self.run_time = LatencyWindow(window)
+        self.rate = LatencyWindow(window)
+        self.counts: dict[str, int] = {status.value: 0 for status in TaskStatus}
+        self.units = 0
+        self.busy_seconds = 0.0
+
+    def add(self, task: Task) -> None:
+        self.counts[task.status.value] = self.counts.get(task.status.value, 0) + 1
+        run_time = task.run_time()
+        self.queue_wait.add(task.queue_wait())
+        self.first_output.add(task.time_to_first_output())
+        self.run_time.add(run_time)
+        if run_time and task.output_units:
+            self.rate.add(task.output_units / run_time)
+            self.units += task.output_units
+            self.busy_seconds += run_time
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "counts": dict(self.counts),
+            "samples": len(self.run_time),
+            "queue_wait": self.queue_wait.percentiles(),
+            "first_output": self.first_output.percentiles(),
+            "run_time": self.run_time.percentiles(),
+            "units_per_sec": self.rate.percentiles(),
+            "units": self.units,
+            "avg_units_per_sec": (self.units / self.busy_seconds) if self.busy_seconds else None,
+        }
+
+
+class KernelMetrics:
+    """
+    Aggregates finished Task timings per engine and per addon.
+
+    Durations are seconds on the monotonic clock. Output units are whatever
+    the engine reports as progress (tokens for LLM, steps for vision).
+    """
+
+    def __init__(self, window: int = 512):
+        self._window = window
+        self._engines: dict[str, _Series] = {}
+        self._addons: dict[str, _Series] = {}
+
+    def record(self, task: Task) -> None:
+        self._series(self._engines, task.target).add(task)
+        self._series(self._addons, task.addon_pid).add(task)
+
+    def _series(self, scope: dict[str, _Series], key: str) -> _Series:
+        series = scope.get(key)
+        if series is None:
+            series = scope[key] = _Series(self._window)
+        return series
+
+    def query(self, scope: str, key: str) -> dict[str, Any] | None:
+        series = {"engine": self._engines, "addon": self._addons}[scope].get(key)
+        return series.snapshot() if series else None
+
+    def units(self) -> dict[str, int]:
+        """Output units of finished tasks per engine, cumulative; cheap enough to poll."""
+        return {key: series.units for key, series in self._engines.items()}
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {
+            "engines": {key: s.snapshot() for key, s in self._engines.items()},
+            "addons": {key: s.snapshot() for key, s in self._addons.items()},
+        }
+
+    def reset(self) -> None:
+        self._engines.clear()
+        self._addons.clear()
@@ -0,0 +1,286 @@
+"""
+Task pipelines: a DAG of tasks run inside the kernel.
+
+    pipeline = Pipeline.new(
+        [
+            Stage("expand", "llm", payload={"prompt": "Expand into an image prompt: a lighthouse"}),
+            Stage("render", "vision", inputs={"prompt": "expand"}),
+        ],
+        source="script",
+    )
+    bridge.submit_pipeline(pipeline)
+
+A stage becomes a normal Task once every stage it depends on is DONE. Its
+payload is filled from their outputs in memory: inputs maps a payload key to
+the stage whose output it receives, and "{stage}" inside payload strings is
+replaced by that stage's text. Stages with no path between them are submitted
+together, so stages on different engines run concurrently. A stage that fails,
+is cancelled or is rejected fails the whole pipeline and cancels the rest.
+
+A stage output is the image or audio it produced, or else its joined text.
+An llm stage's "prompt" runs outside the terminal's conversation (see
+guard.external_payload).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable
+from uuid import uuid4
+
+from core.task import Task, TaskStatus
+from core.trace import TraceLevel
+from monokernel.dock import EnqueueStatus
+from monokernel.guard import external_payload
+
+FINISHED_STATUSES = (TaskStatus.DONE, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+# sink(kind, data) with kind one of:
+#   "stage" data = (stage name, TaskStatus) as each stage finishes
+#   "done"  data = final PipelineStatus
+PipelineSink = Callable[[str, object], None]
+
+
+class PipelineStatus(Enum):
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
+@dataclass
+class Stage:
+    name: str
+    target: str
+    command: str = "generate"
+    payload: dict = field(default_factory=dict)
+    inputs: dict[str, str] = field(default_factory=dict)  # payload key -> upstream stage
+    after: tuple[str, ...] = ()  # ordering-only dependencies
+    priority: int = 2
+
+
+@dataclass(eq=False)
+class Pipeline:
+    id: str
+    stages: dict[str, Stage]
+    depends_on: dict[str, set[str]]
+    order: list[str]  # topological
+    source: str
+    sink: PipelineSink | None = None
+    status: PipelineStatus = PipelineStatus.RUNNING
+    tasks: dict[str, Task] = field(default_factory=dict)
+    outputs: dict[str, object] = field(default_factory=dict)
+    error: str = ""
+
+    @classmethod
+    def new(cls, stages: list[Stage], source: str = "pipeline", sink: PipelineSink | None = None) -> "Pipeline":
+        by_name: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in by_name:
+                raise ValueError(f"duplicate stage name: {stage.name}")
+            by_name[stage.name] = stage
+        depends_on: dict[str, set[str]] = {}
+        for stage in stages:
+            deps = set(stage.after) | set(stage.inputs.values())
+            deps |= {name for name in by_name if name != stage.name and _mentions(stage.payload, "{" + name + "}")}
+            unknown = deps - set(by_name)
+            if unknown:
+                raise ValueError(f"stage '{stage.name}' depends on unknown stages: {sorted(unknown)}")
+            depends_on[stage.name] = deps
+        return cls(
+            id=uuid4().hex,
+            stages=by_name,
+            depends_on=depends_on,
+            order=_topological_order(depends_on),
+            source=source,
+            sink=sink,
+        )
+
+    @property
+    def finished(self) -> bool:
+        return self.status != PipelineStatus.RUNNING
+
+
+def _mentions(value: object, needle: str) -> bool:
+    if isinstance(value, str):
+        return needle in value
+    if isinstance(value, dict):
+        return any(_mentions(item, needle) for item in value.values())
+    if isinstance(value, list):
+        return any(_mentions(item, needle) for item in value)
+    return False
+
+
+def _topological_order(depends_on: dict[str, set[str]]) -> list[str]:
+    remaining = {name: set(deps) for name, deps in depends_on.items()}
+    order: list[str] = []
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"pipeline has a dependency cycle among: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+            order.append(name)
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+def _substitute(value: object, texts: dict[str, str]) -> object:
+    if isinstance(value, str):
+        for name, text in texts.items():
+            value = value.replace("{" + name + "}", text)
+        return value
+    if isinstance(value, dict):
+        return {key: _substitute(item, texts) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(item, texts) for item in value]
+    return value
+
+
+class _Collector:
+    """Output of one stage task, gathered from its task channel."""
+
+    def __init__(self) -> None:
+        self.text: list[str] = []
+        self.media: object | None = None
+
+    def on_token(self, token: str) -> None:
+        self.text.append(token)
+
+    def on_media(self, media: object) -> None:
+        self.media = media
+
+    def result(self) -> object:
+        return self.media if self.media is not None else "".join(self.text)
+
+
+class PipelineRunner:
+    """
+    Drives pipelines on the kernel thread.
+
+    Stage tasks go through MonoBridge like any other task (queue limits,
+    fair queuing and cancellation all apply), so the runner only decides
+    when a stage may be submitted and what its payload is.
+    """
+
+    def __init__(self, guard, bridge):
+        self.guard = guard
+        self.bridge = bridge
+        self.pipelines: dict[str, Pipeline] = {}
+        self._collectors: dict[str, _Collector] = {}
+        # Submitted stage tasks by task id.
+        self._stages: dict[str, tuple[Pipeline, str]] = {}
+        # Stages the dock answered BLOCKED, resubmitted when an engine frees up.
+        self._blocked: list[tuple[Pipeline, str]] = []
+        guard.sig_task_state.connect(self._on_task_state)
+        guard.sig_engine_ready.connect(self._on_engine_ready)
+
+    def submit(self, pipeline: Pipeline) -> Pipeline:
+        self.pipelines[pipeline.id] = pipeline
+        self.guard.trace(
+            TraceLevel.INFO, "pipeline.started",
+            f"pipeline={pipeline.id} stages={','.join(pipeline.order)}", pipeline=pipeline.id,
+        )
+        self._advance(pipeline)
+        return pipeline
+
+    def cancel(self, pipeline_id: str) -> None:
+        pipeline = self.pipelines.get(pipeline_id)
+        if pipeline is None:
+            return
+        self._finish(pipeline, PipelineStatus.CANCELLED)
+
+    # ---- scheduling ----
+
+    def _advance(self, pipeline: Pipeline) -> None:
+        if pipeline.finished:
+            return
+        if len(pipeline.outputs) == len(pipeline.stages):
+            self._finish(pipeline, PipelineStatus.DONE)
+            return
+        for name in pipeline.order:
+            if name in pipeline.tasks or (pipeline, name) in self._blocked:
+                continue
+            if all(dep in pipeline.outputs for dep in pipeline.depends_on[name]):
+                self._submit_stage(pipeline, name)
+                if pipeline.finished:
+                    return
+
+    def _submit_stage(self, pipeline: Pipeline, name: str) -> None:
+        stage = pipeline.stages[name]
+        upstream = {dep: pipeline.outputs[dep] for dep in pipeline.depends_on[name]}
+        texts = {dep: output for dep, output in upstream.items() if isinstance(output, str)}
+        payload = _substitute(stage.payload, texts)
+        for key, dep in stage.inputs.items():
+            payload[key] = upstream[dep]
+        if stage.command == "generate":
+            payload = external_payload(stage.target, payload)
+        task = self.bridge.wrap(pipeline.source, stage.command, stage.target, payload=payload, priority=stage.priority)
+        self._submit_task(pipeline, name, task)
+
+    def _submit_task(self, pipeline: Pipeline, name: str, task: Task) -> None:
+        task_id = str(task.id)
+        collector = self._collectors[task_id] = _Collector()
+        channel = self.guard.task_channel(task_id)
+        channel.sig_token.connect(collector.on_token)
+        channel.sig_image.connect(collector.on_media)
+        channel.sig_audio.connect(collector.on_media)
+        # Registered first: immediate commands finish inside submit.
+        pipeline.tasks[name] = task
+        self._stages[task_id] = (pipeline, name)
+        result = self.bridge.submit(task)
+        if result.accepted:
+            return
+        del pipeline.tasks[name]
+        self._drop_collector(task_id)
+        if result.status == EnqueueStatus.BLOCKED:
+            self._blocked.append((pipeline, name))
+        else:
+            self._finish(pipeline, PipelineStatus.FAILED, f"stage '{name}' rejected: {result.reason}")
+
+    def _on_engine_ready(self, _engine_key: str) -> None:
+        for entry in list(self._blocked):
+            # An earlier resubmission may have failed the pipeline, dropping its entries.
+            if entry in self._blocked:
+                self._blocked.remove(entry)
+                self._submit_stage(*entry)
+
+    def _on_task_state(self, task_id: str, _old, new: TaskStatus, _timing: dict) -> None:
+        if new not in FINISHED_STATUSES or task_id not in self._stages:
+            return
+        pipeline, name = self._stages[task_id]
+        collector = self._drop_collector(task_id)
+        if pipeline.sink is not None:
+            pipeline.sink("stage", (name, new))
+        if new != TaskStatus.DONE:
+            self._finish(pipeline, PipelineStatus.FAILED, f"stage '{name}' {new.value}")
+            return
+        pipeline.outputs[name] = collector.result() if collector else ""
+        self._advance(pipeline)
+
+    def _drop_collector(self, task_id: str) -> _Collector | None:
+        self._stages.pop(task_id, None)
+        self.guard.release_task_channel(task_id)
+        return self._collectors.pop(task_id, None)
+
+    def _finish(self, pipeline: Pipeline, status: PipelineStatus, error: str = "") -> None:
+        if pipeline.finished:
+            return
+        pipeline.status = status
+        pipeline.error = error
+        self.pipelines.pop(pipeline.id, None)
+        self._blocked = [entry for entry in self._blocked if entry[0] is not pipeline]
+        # Nothing downstream will run; stop stages still queued or running.
+        for task in pipeline.tasks.values():
+            if task.status not in FINISHED_STATUSES:
+                self._drop_collector(str(task.id))
+                self.bridge.cancel(str(task.id))
+        level = TraceLevel.INFO if status == PipelineStatus.DONE else TraceLevel.WARNING
+        self.guard.trace(
+            level, f"pipeline.{status.value.lower()}",
+            f"pipeline={pipeline.id} {status.value}{': ' + error if error else ''}", pipeline=pipeline.id,
+        )
+        if pipeline.sink is not None:
+            pipeline.sink("done", status)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+from typing import Callable, Deque
+
+from PySide6.QtCore import QObject, Signal
+
+from core.task import Task, TaskStatus
+from monokernel.bridge import MonoBridge
+from monokernel.dock import EnqueueResult, EnqueueStatus
+from monokernel.guard import MonoGuard
+
+# sink(kind, data) with kind one of:
+#   "output"   data = str token, image object or audio dict
+#   "done"     data = final TaskStatus
+#   "rejected" data = reason string (task never queued)
+TaskSink = Callable[[str, object], None]
+
+TERMINAL_STATUSES = {TaskStatus.DONE, TaskStatus.FAILED, TaskStatus.CANCELLED}
+
+
+class KernelTaskError(RuntimeError):
+    def __init__(self, task_id: str, status: TaskStatus | None, reason: str = ""):
+        self.task_id = task_id
+        self.status = status
+        label = status.value if status else "REJECTED"
+        super().__init__(f"task {task_id} {label}{': ' + reason if reason else ''}")
+
+
+class TaskFuture(Future):
+    """
+    Handle for a task submitted with TaskRelay.submit_future.
+
+    Resolves with the task's output (joined text, or the last non-text
+    output such as an image) once it is DONE, or with KernelTaskError if it
+    fails, is cancelled or is rejected. cancel() also cancels the kernel task.
+    """
+
+    def __init__(self, relay: "TaskRelay", task: Task):
+        super().__init__()
+        self.relay = relay
+        self.task_id = str(task.id)
+        self._text: list[str] = []
+        self._last: object | None = None
+
+    def cancel(self) -> bool:
+        cancelled = super().cancel()
+        if cancelled:
+            self.relay.cancel_threadsafe(self.task_id)
+        return cancelled
+
+    def _sink(self, kind: str, data: object) -> None:
+        # Runs on the kernel thread.
+        if kind == "output":
+            if isinstance(data, str):
+                self._text.append(data)
+            else:
+                self._last = data
+            return
+        try:
+            if kind == "rejected":
+                self.set_exception(KernelTaskError(self.task_id, None, str(data)))
+            elif data != TaskStatus.DONE:
+                self.set_exception(KernelTaskError(self.task_id, data))
+            else:
+                self.set_result(self._last if self._last is not None else "".join(self._text))
+        except InvalidStateError:
+            # Cancelled by the caller in the meantime.
+            pass
+
+
+class TaskRelay(QObject):
+    """
+    Thread-safe entry point into the kernel for non-UI clients.
+
+    Lives on the kernel (Qt main) thread. Calls made from other threads are
+    marshalled through a queued signal, and every tracked task's output and
+    completion are delivered to the sink it was submitted with. Sinks run on
+    the kernel thread and must hand data off to their own thread themselves.
+
+    Completion is driven by MonoGuard.sig_task_state: a tracked task's sink
+    gets "done" the moment it reaches a terminal status.
+
+    Tasks the dock answers with BLOCKED (a full queue under the "block"
+    policy) are parked here and resubmitted in order whenever an engine
+    becomes ready, so the kernel never waits and the caller simply sees no
+    output until there is room.
+    """
+
+    _sig_call = Signal(object)
+
+    def __init__(self, guard: MonoGuard, bridge: MonoBridge):
+        super().__init__()
+        self.guard = guard
+        self.bridge = bridge
+        self._tracked: dict[str, tuple[Task, TaskSink]] = {}
+        # Parked BLOCKED tasks per addon, in submission order.
+        self._blocked: dict[str, Deque[Task]] = {}
+        self._sig_call.connect(self._run_call)
+        guard.sig_task_state.connect(self._on_task_state)
+        guard.sig_engine_ready.connect(self._on_engine_ready)
+
+    # ---- any thread ----
+
+    def call_threadsafe(self, fn: Callable[[], None]) -> None:
+        self._sig_call.emit(fn)
+
+    def submit_threadsafe(self, task: Task, sink: TaskSink, max_queue: int | None = None) -> None:
+        self.call_threadsafe(lambda: self.submit(task, sink, max_queue))
+
+    def submit_future(self, task: Task, max_queue: int | None = None) -> TaskFuture:
+        """Submit from any thread; the returned future resolves with the task's result."""
+        future = TaskFuture(self, task)
+        self.submit_threadsafe(task, future._sink, max_queue)
+        return future
+
+    def cancel_threadsafe(self, task_id: str) -> None:
+        self.call_threadsafe(lambda: self.cancel(task_id))
+
+    # ---- kernel thread ----
+
+    def submit(self, task: Task, sink: TaskSink, max_queue: int | None = None) -> None:
+        if max_queue is not None and len(self.bridge.dock.queues.get(task.target, ())) >= max_queue:
+            sink("rejected", f"queue for '{task.target}' is full")
+            return
+        task_id = str(task.id)
+        self._tracked[task_id] = (task, sink)
+        channel = self.guard.task_channel(task_id)
+        channel.sig_token.connect(lambda token: self._deliver(task_id, token))
+        channel.sig_image.connect(lambda image: self._deliver(task_id, image))
+        channel.sig_audio.connect(lambda audio: self._deliver(task_id, audio))
+        parked = self._blocked.get(task.addon_pid)
+        if parked:
+            # Keep the caller's submission order behind its tasks waiting for room.
+            parked.append(task)
+            return
+        self._handle_result(self.bridge.submit(task))
+
+    def cancel(self, task_id: str) -> None:
+        entry = self._tracked.pop(task_id, None)
+        if entry is None:
+            return
+        parked = self._blocked.get(entry[0].addon_pid)
+        if parked and entry[0] in parked:
+            parked.remove(entry[0])
+        else:
+            self.bridge.cancel(task_id)
+        self.guard.release_task_channel(task_id)
+
+    def _handle_result(self, result: EnqueueResult) -> bool:
+        task = result.task
+        if result.status == EnqueueStatus.BLOCKED:
+            self._blocked.setdefault(task.addon_pid, deque()).appendleft(task)
+            return False
+        if result.status == EnqueueStatus.REJECTED:
+            task_id = str(task.id)
+            _task, sink = self._tracked.pop(task_id)
+            self.guard.release_task_channel(task_id)
+            sink("rejected", result.reason)
+        return True
+
+    def _resubmit_blocked(self) -> None:
+        for addon_pid, parked in list(self._blocked.items()):
+            while parked:
+                if not self._handle_result(self.bridge.submit(parked.popleft())):
+                    break
+            if not parked:
+                del self._blocked[addon_pid]
+
+    def _run_call(self, fn: Callable[[], None]) -> None:
+        fn()
+
+    def _deliver(self, task_id: str, chunk: object) -> None:
+        entry = self._tracked.get(task_id)
+        if entry is not None:
+            entry[1]("output", chunk)
+
+    def _on_engine_ready(self, _engine_key: str) -> None:
+        self._resubmit_blocked()
+
+    def _on_task_state(self, task_id: str, _old, new: TaskStatus, _timing: dict) -> None:
+        if new not in TERMINAL_STATUSES:
+            return
+        entry = self._tracked.pop(task_id, None)
+        if entry is None:
+            return
+        self.guard.release_task_channel(task_id)
+        entry[1]("done", new)
@@ -0,0 +1,170 @@
+"""
+Numeric time series of kernel activity, rolled up at 1 s, 1 min and 1 h.
+
+MetricsRecorder never touches the token path. Once a second it reads what the
+kernel already maintains:
+- output units from the running tasks' output_units, which the engines'
+  progress signal keeps current, plus KernelMetrics.units() for finished tasks;
+- queue depths from MonoDock.queue_snapshot();
+- latencies from the timing dict of sig_task_state, once per finished task.
+
+Each sample is handed to the sink as a 1 s bucket. It is also folded into
+the open 1 min and 1 h buckets, which are handed over when they close and
+on stop(). Per engine target the series are:
+
+    units_per_sec     tokens/sec for LLMs, steps/sec for vision
+    queue_depth       tasks waiting in MonoDock
+    tasks_finished    tasks that reached a final status
+    queue_wait_p95    seconds, over the tasks finished in the second
+    first_output_p95
+    run_time_p95
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from time import monotonic, time
+from typing import Callable
+
+from PySide6.QtCore import QObject, QTimer
+
+from core.task import TaskStatus
+from monokernel.guard import pool_key
+from monokernel.metrics import LatencyWindow
+
+RESOLUTIONS = (1, 60, 3600)
+SAMPLE_INTERVAL_MS = 1000
+# 1 s points kept in memory per series for live charts.
+RECENT_POINTS = 120
+
+FINISHED_STATUSES = (TaskStatus.DONE, TaskStatus.FAILED, TaskStatus.CANCELLED)
+_LATENCIES = (
+    ("queue_wait_p95", "queue_wait"),
+    ("first_output_p95", "time_to_first_output"),
+    ("run_time_p95", "run_time"),
+)
+
+# sink(resolution, bucket_ts, name, key, count, sum, min, max), e.g. OverseerDB.log_metric
+MetricSink = Callable[[int, int, str, str, int, float, float, float], None]
+
+
+class _Bucket:
+    __slots__ = ("ts", "count", "total", "low", "high")
+
+    def __init__(self, ts: int) -> None:
+        self.ts = ts
+        self.count = 0
+        self.total = 0.0
+        self.low = float("inf")
+        self.high = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.low = min(self.low, value)
+        self.high = max(self.high, value)
+
+
+class MetricsRecorder(QObject):
+    def __init__(self, guard, dock=None, sink: MetricSink | None = None):
+        super().__init__()
+        self.guard = guard
+        self.dock = dock
+        self.sink = sink
+        # Live charts read these: (name, key) -> deque of (unix second, value).
+        self.recent: dict[tuple[str, str], deque[tuple[int, float]]] = {}
+        self._open: dict[tuple[int, str, str], _Bucket] = {}
+        self._last_units: dict[str, float] = {}
+        self._last_sample: float | None = None
+        # Targets of running tasks, to attribute their latencies when they finish.
+        self._targets: dict[str, str] = {}
+        self._finished: dict[str, list[dict]] = {}
+
+        guard.sig_task_state.connect(self._on_task_state)
+        self._timer = QTimer(self)
+        self._timer.setInterval(SAMPLE_INTERVAL_MS)
+        self._timer.timeout.connect(self.sample)
+        self._timer.start()
+
+    def stop(self) -> None:
+        """Stop sampling and hand over the partial 1 min / 1 h buckets."""
+        self._timer.stop()
+        for (resolution, name, key), bucket in list(self._open.items()):
+            self._emit(resolution, name, key, bucket)
+        self._open.clear()
+
+    def series(self) -> list[tuple[str, str]]:
+        return sorted(self.recent)
+
+    # ---- sampling ----
+
+    def _on_task_state(self, task_id: str, _old, new: TaskStatus, timing: dict) -> None:
+        if new == TaskStatus.RUNNING:
+            keys = [key for key, task in self.guard.active_tasks.items() if task is not None and str(task.id) == task_id]
+            if keys:
+                self._targets[task_id] = pool_key(keys[0])
+        elif new in FINISHED_STATUSES:
+            target = self._targets.pop(task_id, None)
+            if target is not None:
+                self._finished.setdefault(target, []).append(timing)
+
+    def sample(self) -> None:
+        now = monotonic()
+        elapsed = None if self._last_sample is None else now - self._last_sample
+        self._last_sample = now
+        second = int(time())
+        values: dict[tuple[str, str], float] = {}
+
+        units = {key: float(count) for key, count in self.guard.metrics.units().items()}
+        seen: set[str] = set()
+        for key, task in self.guard.active_tasks.items():
+            # A broadcast task runs on every replica; count it once.
+            if task is None or str(task.id) in seen:
+                continue
+            seen.add(str(task.id))
+            target = pool_key(key)
+            units[target] = units.get(target, 0.0) + getattr(task, "output_units", 0)
+        for target, total in units.items():
+            last = self._last_units.get(target)
+            if last is not None and elapsed:
+                values[("units_per_sec", target)] = max(0.0, total - last) / elapsed
+        self._last_units = units
+
+        if self.dock is not None:
+            for target, data in self.dock.queue_snapshot()["engines"].items():
+                values[("queue_depth", target)] = float(data["depth"])
+
+        for target, timings in self._finished.items():
+            values[("tasks_finished", target)] = float(len(timings))
+            for name, field in _LATENCIES:
+                window = LatencyWindow(len(timings))
+                for timing in timings:
+                    window.add(timing.get(field))
+                p95 = window.percentiles()["p95"]
+                if p95 is not None:
+                    values[(name, target)] = p95
+        self._finished = {}
+
+        for (name, key), value in values.items():
+            self._record(second, name, key, value)
+
+    def _record(self, second: int, name: str, key: str, value: float) -> None:
+        recent = self.recent.get((name, key))
+        if recent is None:
+            recent = self.recent[(name, key)] = deque(maxlen=RECENT_POINTS)
+        recent.append((second, value))
+        for resolution in RESOLUTIONS:
+            bucket_ts = second - second % resolution
+            bucket = self._open.get((resolution, name, key))
+            if bucket is not None and bucket.ts != bucket_ts:
+                self._emit(resolution, name, key, bucket)
+                bucket = None
+            if bucket is None:
+                bucket = self._open[(resolution, name, key)] = _Bucket(bucket_ts)
+            bucket.add(value)
+        # The 1 s bucket is complete as soon as it has its sample.
+        self._emit(1, name, key, self._open.pop((1, name, key)))
+
+    def _emit(self, resolution: int, name: str, key: str, bucket: _Bucket) -> None:
+        if self.sink is not None and bucket.count:
+            self.sink(resolution, bucket.ts, name, key, bucket.count, bucket.total, bucket.low, bucket.high)
@@ -0,0 +1,212 @@
+"""
+JSONL batch runner.
+
+Each input line is one request:
+
+    {"id": "q1", "prompt": "...", "system": "...", "config": {"max_tokens": 256}}
+    {"id": "q2", "messages": [{"role": "user", "content": "..."}]}
+    {"id": "img1", "target": "vision", "prompt": "...", "config": {"steps": 20}}
+
+Results are appended to the output JSONL as they finish, so a rerun with the
+same output file skips ids that already completed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from core.paths import MONOLITH_ROOT
+from monokernel.aio import AsyncKernel, KernelTaskError
+
+
+@dataclass
+class BatchProgress:
+    total: int
+    skipped: int
+    started_at: float = field(default_factory=time.monotonic)
+    done: int = 0
+    failed: int = 0
+    units: int = 0
+
+    @property
+    def finished(self) -> int:
+        return self.done + self.failed
+
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.finished / elapsed if elapsed > 0 else 0.0
+
+    def eta(self) -> float | None:
+        rate = self.rate()
+        remaining = self.total - self.finished
+        return remaining / rate if rate > 0 else None
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self.started_at
+        eta = self.eta()
+        eta_text = f"{eta:.0f}s" if eta is not None else "?"
+        units_rate = self.units / elapsed if elapsed > 0 else 0.0
+        return (
+            f"BATCH: {self.finished}/{self.total} (failed {self.failed}, skipped {self.skipped}) "
+            f"{self.rate():.2f} req/s {units_rate:.1f} chunks/s eta {eta_text}"
+        )
+
+
+def image_filename(item_id: str) -> str:
+    """Filename for a request's image: a slug of its id, plus a hash so distinct ids never collide."""
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "-", item_id).strip("-")[:64] or "item"
+    digest = hashlib.sha1(item_id.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}.png"
+
+
+def load_requests(path: Path) -> list[dict[str, Any]]:
+    requests = []
+    with path.open("r", encoding="utf-8") as handle:
+        for lineno, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                raise ValueError(f"{path}:{lineno}: each line must be a JSON object")
+            item.setdefault("id", f"line-{lineno}")
+            item["id"] = str(item["id"])
+            requests.append(item)
+    return requests
+
+
+def completed_ids(path: Path) -> set[str]:
+    if not path.exists():
+        return set()
+    done = set()
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue  # torn last line from an interrupted run
+            if isinstance(item, dict) and item.get("status") == "DONE":
+                done.add(str(item.get("id")))
+    return done
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as handle:
+        handle.seek(-1, 2)
+        return handle.read(1) == b"\n"
+
+
+def build_payload(item: dict[str, Any]) -> dict[str, Any]:
+    target = item.get("target", "llm")
+    payload: dict[str, Any] = {"config": dict(item.get("config") or {})}
+    if target != "llm":
+        payload["prompt"] = item.get("prompt", "")
+        return payload
+    if item.get("raw"):
+        payload.update(prompt=item.get("prompt", ""), raw=True)
+        return payload
+    messages = item.get("messages")
+    if not isinstance(messages, list):
+        messages = []
+        if item.get("system"):
+            messages.append({"role": "system", "content": item["system"]})
+        messages.append({"role": "user", "content": item.get("prompt", "")})
+    payload["messages"] = messages
+    return payload
+
+
+async def run_batch(
+    kernel: AsyncKernel,
+    in_path: Path,
+    out_path: Path,
+    per_target: int = 2,
+    priority: int = 3,
+    report: Callable[[BatchProgress], None] | None = None,
+    report_every: float = 5.0,
+) -> BatchProgress:
+    """
+    Run every pending request in in_path through the kernel.
+
+    Engines run one task at a time, so per_target bounds how many requests
+    each engine has submitted at once: with 2, the next request is already
+    queued in MonoDock when the engine turns READY and there is no round trip
+    between tasks, while different targets (llm, vision) run concurrently.
+    """
+    report = report or (lambda progress: print(progress.summary(), file=sys.stderr, flush=True))
+    requests = load_requests(in_path)
+    skip = completed_ids(out_path)
+    pending = [item for item in requests if item["id"] not in skip]
+    progress = BatchProgress(total=len(pending), skipped=len(requests) - len(pending))
+    image_dir = MONOLITH_ROOT / "artifacts" / "batch" / out_path.stem
+    windows: dict[str, asyncio.Semaphore] = {}
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with out_path.open("a", encoding="utf-8") as out:
+        if out.tell() > 0 and not _ends_with_newline(out_path):
+            out.write("\n")
+
+        async def _run_one(item: dict[str, Any]) -> None:
+            target = item.get("target", "llm")
+            window = windows.setdefault(target, asyncio.Semaphore(per_target))
+            async with window:
+                started = time.monotonic()
+                record: dict[str, Any] = {"id": item["id"], "target": target}
+                chunks: list[str] = []
+                image = None
+                try:
+                    async for chunk in kernel.stream(
+                        target=target,
+                        priority=int(item.get("priority", priority)),
+                        **build_payload(item),
+                    ):
+                        if isinstance(chunk, str):
+                            chunks.append(chunk)
+                        else:
+                            image = chunk
+                    record["status"] = "DONE"
+                except KernelTaskError as exc:
+                    record["status"] = exc.status.value if exc.status else "REJECTED"
+                    record["error"] = str(exc)
+
+                if image is not None:
+                    image_path = image_dir / image_filename(item["id"])
+                    try:
+                        image_dir.mkdir(parents=True, exist_ok=True)
+                        image.save(str(image_path))
+                        record["image"] = str(image_path)
+                    except (OSError, ValueError) as exc:
+                        # Failing this item must not abort the gather over the others.
+                        record["status"] = "FAILED"
+                        record["error"] = f"could not save image: {exc}"
+                else:
+                    record["output"] = "".join(chunks)
+                record["elapsed"] = round(time.monotonic() - started, 3)
+
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            progress.units += len(chunks)
+            if record["status"] == "DONE":
+                progress.done += 1
+            else:
+                progress.failed += 1
+
+        async def _reporter() -> None:
+            while True:
+                await asyncio.sleep(report_every)
+                report(progress)
+
+        reporter = asyncio.ensure_future(_reporter())
+        try:
+            await asyncio.gather(*(_run_one(item) for item in pending))
+        finally:
+            reporter.cancel()
+    report(progress)
+    return progress
@@ -0,0 +1,265 @@
+"""
+Kernel daemon: serves a running kernel to UI clients over a local socket.
+
+Started with `main.py --headless --daemon`. The kernel and the engines live
+in the daemon process, so loaded models stay warm while UI clients
+(services.remote.RemoteKernel) attach and detach. Any number of clients may
+be attached at once; each receives the global kernel signals plus the output
+of the addons it subscribed to. See services.wire for the framing.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Callable
+
+from PySide6.QtCore import QObject
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+from core.state import SystemStatus
+from core.trace import TraceLevel
+from engine.process import SYNCED_STATE
+from services.wire import DEFAULT_SOCKET, KIND_MESSAGE, FrameReader, message_frame, token_frame
+
+# A client that stops reading is dropped once this much output is waiting for it.
+MAX_PENDING_BYTES = 64 * 1024 * 1024
+
+
+class KernelDaemon(QObject):
+    def __init__(self, runtime, name: str = DEFAULT_SOCKET):
+        super().__init__()
+        self.runtime = runtime
+        self.guard = runtime.guard
+        self.bridge = runtime.bridge
+        self.relay = runtime.relay
+        self.name = name
+        self.clients: list[_ClientSession] = []
+        # Last status per engine key, replayed to clients as they attach.
+        self._statuses: dict[str, SystemStatus] = {}
+        self._capabilities: dict | None = None
+        # Addon channels subscribed by clients; released with the last subscriber.
+        self._addon_refs: Counter[str] = Counter()
+
+        self.server = QLocalServer(self)
+        # Only the user running the daemon may connect.
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+
+        self.guard.sig_status.connect(self._on_status)
+        self.guard.sig_usage.connect(lambda count: self._broadcast("usage", count))
+        self.guard.sig_trace_event.connect(lambda event: self._broadcast("trace_event", event))
+        self.guard.sig_finished.connect(lambda target, task_id: self._broadcast("finished", target, task_id))
+        self.guard.sig_task_state.connect(self._on_task_state)
+        capabilities = getattr(runtime.state, "sig_model_capabilities", None)
+        if capabilities is not None:
+            capabilities.connect(self._on_capabilities)
+
+    def start(self) -> bool:
+        probe = QLocalSocket()
+        probe.connectToServer(self.name)
+        if probe.waitForConnected(200):
+            probe.disconnectFromServer()
+            self.guard.trace(TraceLevel.ERROR, "daemon.in_use", f"a kernel daemon is already serving {self.name}")
+            return False
+        # Nobody answered: whatever is left at the path is from a daemon that died.
+        QLocalServer.removeServer(self.name)
+        if not self.server.listen(self.name):
+            self.guard.trace(
+                TraceLevel.ERROR, "daemon.listen_failed", f"cannot listen on {self.name}: {self.server.errorString()}"
+            )
+            return False
+        self.guard.trace(TraceLevel.INFO, "daemon.listening", f"kernel daemon listening on {self.name}")
+        return True
+
+    def stop(self) -> None:
+        for client in list(self.clients):
+            client.socket.disconnectFromServer()
+        self.server.close()
+
+    # ---- kernel -> clients ----
+
+    def _broadcast(self, name: str, *args) -> None:
+        if not self.clients:
+            return
+        frame = message_frame(name, *args)
+        for client in list(self.clients):
+            client.send(frame)
+
+    def _state_fields(self) -> dict:
+        return {field: getattr(self.runtime.state, field, None) for field in SYNCED_STATE}
+
+    def _on_status(self, engine_key: str, status: SystemStatus) -> None:
+        self._statuses[engine_key] = status
+        self._broadcast("status", engine_key, status, self._state_fields())
+
+    def _on_capabilities(self, capabilities: dict) -> None:
+        self._capabilities = capabilities
+        self._broadcast("capabilities", capabilities)
+
+    def _on_task_state(self, task_id: str, old, new, timing: dict) -> None:
+        if not self.clients:
+            return
+        engines = [
+            key for key, task in self.guard.active_tasks.items() if task is not None and str(task.id) == task_id
+        ]
+        self._broadcast("task_state", task_id, old, new, timing, engines)
+
+    def welcome(self) -> dict:
+        return {
+            "engines": list(self.guard.engines),
+            "targets": self.guard.targets(),
+            "statuses": dict(self._statuses),
+            "state": self._state_fields(),
+            "capabilities": self._capabilities,
+            "active": {key: str(task.id) for key, task in self.guard.active_tasks.items() if task is not None},
+        }
+
+    def snapshot(self) -> tuple[dict, dict]:
+        metrics = self.guard.metrics.snapshot()
+        for key, engine in self.guard.engines.items():
+            if key in metrics["engines"] and hasattr(engine, "discard_stats"):
+                metrics["engines"][key]["discarded"] = engine.discard_stats()
+        return metrics, self.runtime.dock.queue_snapshot()
+
+    # ---- clients ----
+
+    def _on_new_connection(self) -> None:
+        while self.server.hasPendingConnections():
+            client = _ClientSession(self, self.server.nextPendingConnection())
+            self.clients.append(client)
+
+    def subscribe(self, addon_pid: str):
+        self._addon_refs[addon_pid] += 1
+        return self.guard.addon_channel(addon_pid)
+
+    def unsubscribe(self, addon_pid: str) -> None:
+        self._addon_refs[addon_pid] -= 1
+        if self._addon_refs[addon_pid] <= 0:
+            del self._addon_refs[addon_pid]
+            self.guard.release_addon_channel(addon_pid)
+
+    def detach(self, client: "_ClientSession") -> None:
+        if client in self.clients:
+            self.clients.remove(client)
+
+
+def _ignore_task_events(_kind: str, _data: object) -> None:
+    pass
+
+
+class _ClientSession(QObject):
+    """One attached client: its socket, frame reader and addon subscriptions."""
+
+    def __init__(self, daemon: KernelDaemon, socket: QLocalSocket):
+        super().__init__(daemon)
+        self.daemon = daemon
+        self.socket = socket
+        self.name = "client"
+        self.reader = FrameReader()
+        # subscription id -> (addon_pid, [(signal, slot), ...])
+        self.subscriptions: dict[int, tuple[str, list[tuple[object, Callable]]]] = {}
+        socket.readyRead.connect(self._on_ready_read)
+        socket.disconnected.connect(self._on_disconnected)
+
+    def send(self, frame: bytes) -> None:
+        if self.socket.state() != QLocalSocket.ConnectedState:
+            return
+        if self.socket.bytesToWrite() > MAX_PENDING_BYTES:
+            self.daemon.guard.trace(
+                TraceLevel.WARNING, "daemon.client_stalled", f"dropping {self.name}: not reading its output"
+            )
+            self.socket.abort()
+            return
+        self.socket.write(frame)
+
+    def _on_ready_read(self) -> None:
+        try:
+            frames = self.reader.feed(bytes(self.socket.readAll()))
+        except Exception as exc:
+            self.daemon.guard.trace(TraceLevel.ERROR, "daemon.bad_frame", f"dropping {self.name}: {exc}")
+            self.socket.abort()
+            return
+        for kind, payload in frames:
+            if kind != KIND_MESSAGE:
+                continue
+            name, *args = payload
+            handler = getattr(self, f"_cmd_{name}", None)
+            if handler is None:
+                self.daemon.guard.trace(TraceLevel.WARNING, "daemon.unknown_command", f"{self.name}: {name}")
+                continue
+            handler(*args)
+
+    def _on_disconnected(self) -> None:
+        for subscription in list(self.subscriptions):
+            addon_pid = self.subscriptions[subscription][0]
+            self._cmd_unsubscribe(subscription)
+            if addon_pid not in self.daemon._addon_refs:
+                # Nobody is left to receive this addon's output.
+                self.daemon.bridge.cancel_addon(addon_pid)
+        self.daemon.detach(self)
+        self.daemon.guard.trace(TraceLevel.INFO, "daemon.detached", f"{self.name} detached")
+        self.socket.deleteLater()
+        self.deleteLater()
+
+    # ---- commands ----
+
+    def _cmd_hello(self, name: str) -> None:
+        self.name = name
+        self.daemon.guard.trace(TraceLevel.INFO, "daemon.attached", f"{name} attached")
+        self.send(message_frame("welcome", self.daemon.welcome()))
+
+    def _cmd_submit(self, task) -> None:
+        # Through TaskRelay, so a BLOCKED task is parked and resubmitted once
+        # an engine frees up instead of being lost. Output reaches the client
+        # through its addon subscriptions, and a rejection as the dock.rejected
+        # trace on the addon's channel, so the sink has nothing to forward.
+        self.daemon.relay.submit(task, _ignore_task_events)
+
+    def _cmd_cancel(self, task_id: str) -> None:
+        # The relay also drops the task if it is still parked.
+        self.daemon.relay.cancel(task_id)
+
+    def _cmd_cancel_addon(self, addon_pid: str) -> None:
+        self.daemon.bridge.cancel_addon(addon_pid)
+
+    def _cmd_stop(self, target: str) -> None:
+        self.daemon.bridge.stop(target)
+
+    def _cmd_trace(self, level: TraceLevel, code: str, message: str, fields: dict) -> None:
+        self.daemon.guard.trace(level, code, message, **fields)
+
+    def _cmd_viztracer(self, enabled: bool) -> None:
+        self.daemon.guard.enable_viztracer(enabled)
+
+    def _cmd_query(self) -> None:
+        metrics, queues = self.daemon.snapshot()
+        self.send(message_frame("snapshot", metrics, queues))
+
+    def _cmd_subscribe(self, subscription: int, addon_pid: str) -> None:
+        channel = self.daemon.subscribe(addon_pid)
+        slots = [
+            (channel.sig_token, lambda token: self.send(token_frame(subscription, token))),
+            (channel.sig_trace_event, lambda event: self._forward(subscription, "trace_event", event)),
+            (channel.sig_image, lambda image: self._forward(subscription, "image", image)),
+            (channel.sig_audio, lambda audio: self._forward(subscription, "audio", audio)),
+            (channel.sig_finished, lambda task_id: self._forward(subscription, "finished", task_id)),
+        ]
+        for signal, slot in slots:
+            signal.connect(slot)
+        self.subscriptions[subscription] = (addon_pid, slots)
+
+    def _cmd_unsubscribe(self, subscription: int) -> None:
+        entry = self.subscriptions.pop(subscription, None)
+        if entry is None:
+            return
+        addon_pid, slots = entry
+        for signal, slot in slots:
+            try:
+                signal.disconnect(slot)
+            except RuntimeError:
+                # The channel was already released and deleted.
+                pass
+        self.daemon.unsubscribe(addon_pid)
+
+    def _forward(self, subscription: int, kind: str, data: object) -> None:
+        self.send(message_frame("channel", subscription, kind, data))
@@ -0,0 +1,288 @@
+"""
+Local OpenAI-compatible HTTP API over the Monolith kernel.
+
+Serves /v1/chat/completions, /v1/completions and /v1/models on localhost so
+other tools can reuse the model Monolith already has loaded. Requests are
+parsed on server threads and handed to the kernel through TaskRelay; nothing
+here blocks the Qt loop.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import select
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from core.task import TaskStatus
+from core.trace import TraceLevel
+from monokernel.relay import TaskRelay
+
+KEEPALIVE_SECONDS = 15.0
+# How often a non-streaming request checks whether its client is still there.
+DISCONNECT_POLL_SECONDS = 1.0
+
+
+class OpenAIServer:
+    def __init__(
+        self,
+        relay: TaskRelay,
+        port: int = 8765,
+        target: str = "llm",
+        priority: int = 2,
+        max_inflight: int = 16,
+        max_queue: int = 8,
+    ):
+        self.relay = relay
+        self.port = port
+        self.target = target
+        self.priority = priority
+        self.max_queue = max_queue
+        self._slots = threading.BoundedSemaphore(max_inflight)
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def model_name(self) -> str:
+        path = self.relay.guard.state.gguf_path
+        return Path(path).stem if path else "monolith"
+
+    def start(self) -> None:
+        if self._httpd is not None:
+            return
+        handler = type("_BoundHandler", (_Handler,), {"api": self})
+        # Bound to loopback only; this API has no authentication.
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", self.port), handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="monolith-api", daemon=True
+        )
+        self._thread.start()
+        self.relay.guard.trace(
+            TraceLevel.INFO, "api.listening", f"listening on http://127.0.0.1:{self.port}/v1", port=self.port
+        )
+
+    def stop(self) -> None:
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._httpd = None
+        self._thread = None
+
+    # ---- request mapping ----
+
+    def build_payload(self, route: str, body: dict[str, Any]) -> dict[str, Any]:
+        config: dict[str, Any] = {}
+        for src, dst in (("temperature", "temp"), ("top_p", "top_p"), ("max_tokens", "max_tokens")):
+            if body.get(src) is not None:
+                config[dst] = body[src]
+        if route == "chat":
+            messages = body.get("messages")
+            if not isinstance(messages, list) or not messages:
+                raise ValueError("'messages' must be a non-empty list")
+            return {"messages": messages, "config": config}
+        prompt = body.get("prompt")
+        if isinstance(prompt, list):
+            prompt = "".join(str(p) for p in prompt)
+        if not isinstance(prompt, str):
+            raise ValueError("'prompt' must be a string")
+        return {"prompt": prompt, "raw": True, "config": config}
+
+    def submit(self, payload: dict[str, Any], priority: int) -> tuple[str, "queue.Queue[tuple[str, object]]"]:
+        events: "queue.Queue[tuple[str, object]]" = queue.Queue()
+        task = self.relay.bridge.wrap(
+            "api", "generate", self.target, payload=payload, priority=priority
+        )
+        self.relay.submit_threadsafe(
+            task, lambda kind, data: events.put((kind, data)), max_queue=self.max_queue
+        )
+        return str(task.id), events
+
+
+class _Handler(BaseHTTPRequestHandler):
+    api: OpenAIServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    # ---- plumbing ----
+
+    def _send_json(self, status: int, data: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str, kind: str, headers: dict[str, str] | None = None) -> None:
+        self._send_json(status, {"error": {"message": message, "type": kind}}, headers)
+
+    def _send_event(self, data: dict[str, Any] | str) -> None:
+        text = data if isinstance(data, str) else json.dumps(data)
+        self.wfile.write(f"data: {text}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _client_gone(self) -> bool:
+        # A closed socket is readable and peeks as empty; pipelined request
+        # bytes peek as data and mean the client is still there.
+        try:
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            return bool(readable) and not self.connection.recv(1, socket.MSG_PEEK)
+        except OSError:
+            return True
+
+    def _read_body(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        data = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(data, dict):
+            raise ValueError("request body must be a JSON object")
+        return data
+
+    # ---- routes ----
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/v1/models":
+            self._send_json(
+                200,
+                {"object": "list", "data": [{"id": self.api.model_name, "object": "model", "owned_by": "monolith"}]},
+            )
+            return
+        self._send_error(404, f"unknown route {self.path}", "invalid_request_error")
+
+    def do_POST(self) -> None:
+        route = {"/v1/chat/completions": "chat", "/v1/completions": "text"}.get(self.path.rstrip("/"))
+        if route is None:
+            self._send_error(404, f"unknown route {self.path}", "invalid_request_error")
+            return
+        try:
+            body = self._read_body()
+            payload = self.api.build_payload(route, body)
+            if isinstance(body.get("user"), str):
+                # Same user, same replica: its prompt prefix is likely still cached there.
+                payload["session"] = f"api:{body['user']}"
+            priority = int(body.get("priority", self.api.priority))
+        except (ValueError, TypeError) as exc:
+            self._send_error(400, str(exc), "invalid_request_error")
+            return
+        if priority not in (2, 3):
+            self._send_error(400, "'priority' must be 2 (normal) or 3 (background)", "invalid_request_error")
+            return
+
+        if not self.api._slots.acquire(blocking=False):
+            self._send_error(429, "too many concurrent requests", "rate_limit_error", {"Retry-After": "1"})
+            return
+        try:
+            task_id, events = self.api.submit(payload, priority)
+            if body.get("stream"):
+                self._stream(route, task_id, events)
+            else:
+                self._collect(route, task_id, events)
+        finally:
+            self.api._slots.release()
+
+    # ---- response modes ----
+
+    def _envelope(self, route: str, task_id: str) -> dict[str, Any]:
+        return {
+            "id": f"{'chatcmpl' if route == 'chat' else 'cmpl'}-{task_id}",
+            "object": "chat.completion" if route == "chat" else "text_completion",
+            "created": int(time.time()),
+            "model": self.api.model_name,
+        }
+
+    def _collect(self, route: str, task_id: str, events: "queue.Queue[tuple[str, object]]") -> None:
+        chunks: list[str] = []
+        while True:
+            try:
+                kind, data = events.get(timeout=DISCONNECT_POLL_SECONDS)
+            except queue.Empty:
+                if self._client_gone():
+                    self.api.relay.cancel_threadsafe(task_id)
+                    self.close_connection = True
+                    return
+                continue
+            if kind == "output":
+                chunks.append(str(data))
+                continue
+            if kind == "rejected":
+                self._send_error(429, str(data), "rate_limit_error", {"Retry-After": "1"})
+                return
+            break
+
+        # Partial output of a failed or cancelled task is not a completion:
+        # a 200 with finish_reason "stop" would pass truncated text off as whole.
+        if data == TaskStatus.FAILED:
+            self._send_error(500, "generation failed", "server_error")
+            return
+        if data == TaskStatus.CANCELLED:
+            self._send_error(503, "generation cancelled", "server_error")
+            return
+        text = "".join(chunks)
+        finish_reason = "stop"
+        response = self._envelope(route, task_id)
+        if route == "chat":
+            choice = {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": finish_reason}
+        else:
+            choice = {"index": 0, "text": text, "finish_reason": finish_reason}
+        response["choices"] = [choice]
+        self._send_json(200, response)
+
+    def _stream(self, route: str, task_id: str, events: "queue.Queue[tuple[str, object]]") -> None:
+        first = True
+        envelope = self._envelope(route, task_id)
+        envelope["object"] = "chat.completion.chunk" if route == "chat" else "text_completion"
+        try:
+            while True:
+                try:
+                    kind, data = events.get(timeout=KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    if not first:
+                        # Comment lines keep proxies open and surface disconnects.
+                        self.wfile.write(b": keep-alive\n\n")
+                        self.wfile.flush()
+                    continue
+
+                if kind == "rejected" and first:
+                    self._send_error(429, str(data), "rate_limit_error", {"Retry-After": "1"})
+                    return
+                if data == TaskStatus.CANCELLED and first:
+                    self._send_error(503, "generation cancelled", "server_error")
+                    return
+                if first:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Cache-Control", "no-cache")
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    self.close_connection = True
+                    first = False
+                if kind == "output":
+                    self._send_event(dict(envelope, choices=[self._delta(route, str(data), None)]))
+                    continue
+                if data == TaskStatus.FAILED:
+                    self._send_event({"error": {"message": "generation failed", "type": "server_error"}})
+                elif data == TaskStatus.CANCELLED:
+                    self._send_event({"error": {"message": "generation cancelled", "type": "server_error"}})
+                else:
+                    self._send_event(dict(envelope, choices=[self._delta(route, "", "stop")]))
+                self._send_event("[DONE]")
+                return
+        except (BrokenPipeError, ConnectionResetError):
+            self.api.relay.cancel_threadsafe(task_id)
+
+    @staticmethod
+    def _delta(route: str, text: str, finish_reason: str | None) -> dict[str, Any]:
+        if route == "chat":
+            delta = {"content": text} if text else {}
+            return {"index": 0, "delta": delta, "finish_reason": finish_reason}
+        return {"index": 0, "text": text, "finish_reason": finish_reason}
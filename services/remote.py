@@ -0,0 +1,293 @@
+"""
+Client side of the kernel daemon (services.daemon).
+
+RemoteKernel connects to a running daemon and exposes the same surface the
+UI uses on an in-process kernel: state (an AppState mirrored from the
+daemon), guard (signals, addon channels, traces) and bridge (wrap, submit,
+cancel, stop). bootstrap attaches MonolithUI through it when a daemon is
+running, so closing the window leaves the daemon's models loaded.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from uuid import UUID
+
+from PySide6.QtCore import QElapsedTimer, QObject, Signal
+from PySide6.QtNetwork import QLocalSocket
+
+from core.state import AppState, SystemStatus
+from core.task import Task, TaskStatus
+from core.trace import TraceEvent, TraceLevel
+from monokernel.bridge import MonoBridge
+from monokernel.channels import OutputChannel
+from services.wire import DEFAULT_SOCKET, KIND_TOKEN, FrameReader, message_frame
+
+
+@dataclass
+class RemoteTask:
+    """Stand-in for a task running in the daemon; only its id is known here."""
+
+    id: UUID
+
+
+class RemoteMetrics:
+    def __init__(self, kernel: "RemoteKernel"):
+        self.kernel = kernel
+
+    def snapshot(self) -> dict:
+        return self.kernel.snapshot()[0]
+
+
+class RemoteDock:
+    def __init__(self, kernel: "RemoteKernel"):
+        self.kernel = kernel
+
+    def queue_snapshot(self) -> dict:
+        return self.kernel.snapshot()[1]
+
+
+class RemoteGuard(QObject):
+    """MonoGuard as seen by a UI client: the signals and subscription API, fed from the socket."""
+
+    sig_trace = Signal(str)
+    sig_trace_event = Signal(object)
+    sig_status = Signal(str, SystemStatus)
+    sig_usage = Signal(int)
+    sig_finished = Signal(str, str)
+    sig_task_state = Signal(str, object, object, object)
+
+    def __init__(self, kernel: "RemoteKernel"):
+        super().__init__()
+        self.kernel = kernel
+        self.state = kernel.state
+        self.engines: dict[str, None] = {}
+        self.active_tasks: dict[str, RemoteTask | None] = {}
+        self.metrics = RemoteMetrics(kernel)
+        self._viztracer = None
+        self._targets: list[str] = []
+        self._channels: dict[str, OutputChannel] = {}
+        self._subscriptions: dict[int, OutputChannel] = {}
+        self._subscription_of: dict[str, int] = {}
+        self._next_subscription = 1
+
+    def targets(self) -> list[str]:
+        return list(self._targets)
+
+    def addon_channel(self, addon_pid: str) -> OutputChannel:
+        channel = self._channels.get(addon_pid)
+        if channel is None:
+            channel = self._channels[addon_pid] = OutputChannel(self)
+            subscription = self._next_subscription
+            self._next_subscription += 1
+            self._subscriptions[subscription] = channel
+            self._subscription_of[addon_pid] = subscription
+            self.kernel.send("subscribe", subscription, addon_pid)
+        return channel
+
+    def release_addon_channel(self, addon_pid: str) -> None:
+        channel = self._channels.pop(addon_pid, None)
+        if channel is None:
+            return
+        subscription = self._subscription_of.pop(addon_pid)
+        del self._subscriptions[subscription]
+        self.kernel.send("unsubscribe", subscription)
+        channel.deleteLater()
+
+    def trace(self, level: TraceLevel, code: str, message: str, task: Task | None = None, **fields) -> None:
+        if task is not None:
+            fields.setdefault("task_id", str(task.id))
+        self.kernel.send("trace", level, code, message, fields)
+
+    def enable_viztracer(self, enabled: bool) -> None:
+        self.kernel.send("viztracer", enabled)
+
+    def get_active_task(self, engine_key: str) -> RemoteTask | None:
+        return self.active_tasks.get(engine_key)
+
+    # ---- from the daemon ----
+
+    def _emit_trace(self, event: TraceEvent) -> None:
+        self.sig_trace_event.emit(event)
+        self.sig_trace.emit(event.text())
+
+    def _on_task_state(self, task_id: str, old, new: TaskStatus, timing: dict, engines: list[str]) -> None:
+        if new == TaskStatus.RUNNING:
+            for key in engines:
+                self.active_tasks[key] = RemoteTask(UUID(task_id))
+        self.sig_task_state.emit(task_id, old, new, timing)
+        if new != TaskStatus.RUNNING:
+            for key, task in self.active_tasks.items():
+                if task is not None and str(task.id) == task_id:
+                    self.active_tasks[key] = None
+
+    def _on_channel(self, subscription: int, kind: str, data: object) -> None:
+        channel = self._subscriptions.get(subscription)
+        if channel is None:
+            return
+        if kind == "trace_event":
+            channel.sig_trace_event.emit(data)
+            channel.sig_trace.emit(data.text())
+        else:
+            getattr(channel, f"sig_{kind}").emit(data)
+
+
+class RemoteBridge:
+    """MonoBridge over the socket. submit returns nothing: rejections arrive as traces on the addon channel."""
+
+    def __init__(self, kernel: "RemoteKernel"):
+        self.kernel = kernel
+
+    def wrap(self, source: str, command: str, target: str, **kwargs) -> Task:
+        return MonoBridge.wrap(self, source, command, target, **kwargs)
+
+    def submit(self, task: Task) -> None:
+        self.kernel.send("submit", task)
+
+    def cancel(self, task_id: str) -> None:
+        self.kernel.send("cancel", task_id)
+
+    def cancel_addon(self, addon_pid: str) -> None:
+        self.kernel.send("cancel_addon", addon_pid)
+
+    def stop(self, target: str = "all") -> None:
+        self.kernel.send("stop", target)
+
+
+class RemoteKernel(QObject):
+    sig_model_capabilities = Signal(dict)
+    sig_disconnected = Signal()
+
+    def __init__(self, name: str = DEFAULT_SOCKET):
+        super().__init__()
+        self.name = name
+        self.state = AppState()
+        self.state.sig_model_capabilities = self.sig_model_capabilities
+        self.guard = RemoteGuard(self)
+        self.bridge = RemoteBridge(self)
+        self.dock = RemoteDock(self)
+        self.socket = QLocalSocket(self)
+        self.reader = FrameReader()
+        self._welcome: dict | None = None
+        self._snapshot: tuple[dict, dict] = ({"engines": {}, "addons": {}}, {"engines": {}, "addons": {}})
+        self._query_pending = False
+        self._closing = False
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.socket.disconnected.connect(self._on_disconnected)
+
+    def attach(self, timeout_ms: int = 1000) -> bool:
+        """
+        Connect and wait for the daemon's welcome snapshot.
+
+        Blocks for at most timeout_ms; meant for startup, before the event
+        loop runs. Returns False if no daemon answered.
+        """
+        self.socket.connectToServer(self.name)
+        if not self.socket.waitForConnected(timeout_ms):
+            return False
+        self.send("hello", f"ui:{os.getpid()}")
+        clock = QElapsedTimer()
+        clock.start()
+        while self._welcome is None:
+            remaining = timeout_ms - clock.elapsed()
+            if remaining <= 0 or not self.socket.waitForReadyRead(remaining):
+                self._closing = True
+                self.socket.abort()
+                return False
+        return True
+
+    def replay_status(self) -> None:
+        """Emit the daemon's current engine statuses and model capabilities to newly wired UI."""
+        if self._welcome is None:
+            return
+        for engine_key, status in self._welcome["statuses"].items():
+            self.guard.sig_status.emit(engine_key, status)
+        if self._welcome["capabilities"] is not None:
+            self.sig_model_capabilities.emit(self._welcome["capabilities"])
+
+    def close(self) -> None:
+        self._closing = True
+        self.socket.flush()
+        self.socket.disconnectFromServer()
+
+    def send(self, name: str, *args) -> None:
+        if self.socket.state() == QLocalSocket.ConnectedState:
+            self.socket.write(message_frame(name, *args))
+
+    def snapshot(self) -> tuple[dict, dict]:
+        """Last (metrics, queues) snapshot from the daemon; asks for a fresh one for next time."""
+        if not self._query_pending:
+            self._query_pending = True
+            self.send("query")
+        return self._snapshot
+
+    # ---- from the daemon ----
+
+    def _on_ready_read(self) -> None:
+        try:
+            frames = self.reader.feed(bytes(self.socket.readAll()))
+        except Exception as exc:
+            self.guard._emit_trace(TraceEvent(TraceLevel.ERROR, "remote.bad_frame", str(exc)))
+            self.socket.abort()
+            return
+        for kind, payload in frames:
+            if kind == KIND_TOKEN:
+                subscription, token = payload
+                channel = self.guard._subscriptions.get(subscription)
+                if channel is not None:
+                    channel.sig_token.emit(token)
+                continue
+            name, *args = payload
+            handler = getattr(self, f"_on_{name}", None)
+            if handler is not None:
+                handler(*args)
+
+    def _apply_state(self, fields: dict) -> None:
+        for field, value in fields.items():
+            setattr(self.state, field, value)
+
+    def _on_welcome(self, welcome: dict) -> None:
+        self._welcome = welcome
+        self._apply_state(welcome["state"])
+        self.guard.engines = {key: None for key in welcome["engines"]}
+        self.guard._targets = welcome["targets"]
+        self.guard.active_tasks = {key: None for key in welcome["engines"]}
+        for key, task_id in welcome["active"].items():
+            self.guard.active_tasks[key] = RemoteTask(UUID(task_id))
+
+    def _on_status(self, engine_key: str, status: SystemStatus, fields: dict) -> None:
+        self._apply_state(fields)
+        self.guard.sig_status.emit(engine_key, status)
+
+    def _on_usage(self, count: int) -> None:
+        self.guard.sig_usage.emit(count)
+
+    def _on_trace_event(self, event: TraceEvent) -> None:
+        self.guard._emit_trace(event)
+
+    def _on_finished(self, target: str, task_id: str) -> None:
+        self.guard.sig_finished.emit(target, task_id)
+
+    def _on_task_state(self, *args) -> None:
+        self.guard._on_task_state(*args)
+
+    def _on_capabilities(self, capabilities: dict) -> None:
+        self.sig_model_capabilities.emit(capabilities)
+
+    def _on_channel(self, subscription: int, kind: str, data: object) -> None:
+        self.guard._on_channel(subscription, kind, data)
+
+    def _on_snapshot(self, metrics: dict, queues: dict) -> None:
+        self._query_pending = False
+        self._snapshot = (metrics, queues)
+
+    def _on_disconnected(self) -> None:
+        if self._closing:
+            return
+        self.guard._emit_trace(
+            TraceEvent(TraceLevel.ERROR, "remote.disconnected", f"lost connection to the kernel daemon at {self.name}")
+        )
+        for target in self.guard.targets():
+            self.guard.sig_status.emit(target, SystemStatus.ERROR)
+        self.sig_disconnected.emit()
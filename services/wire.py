@@ -0,0 +1,86 @@
+"""
+Framing for the kernel daemon socket.
+
+Every frame is a 5-byte header (body length, kind) followed by the body:
+
+    KIND_TOKEN    !I subscription id, then the token as UTF-8
+    KIND_MESSAGE  pickled tuple (name, *args)
+
+Tokens are by far the most frequent message, so they skip pickle and carry
+a small integer instead of the addon_pid they belong to. The socket is only
+reachable by the user running the daemon (see KernelDaemon), which is what
+makes pickle acceptable for the rest.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import struct
+
+from core.paths import MONOLITH_ROOT
+
+HEADER = struct.Struct("!IB")
+TOKEN_PREFIX = struct.Struct("!I")
+KIND_TOKEN = 1
+KIND_MESSAGE = 2
+MAX_FRAME = 256 * 1024 * 1024
+
+# A socket path on Unix; on Windows QLocalServer uses a named pipe of this name.
+DEFAULT_SOCKET = os.environ.get(
+    "MONOLITH_SOCKET",
+    "monolith-kernel" if os.name == "nt" else str(MONOLITH_ROOT / "kernel.sock"),
+)
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def token_frame(subscription: int, token: str) -> bytes:
+    body = TOKEN_PREFIX.pack(subscription) + token.encode("utf-8")
+    return HEADER.pack(len(body), KIND_TOKEN) + body
+
+
+def message_frame(name: str, *args) -> bytes:
+    body = pickle.dumps((name, *args), protocol=pickle.HIGHEST_PROTOCOL)
+    return HEADER.pack(len(body), KIND_MESSAGE) + body
+
+
+class FrameReader:
+    """Reassembles frames from socket reads of any size."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[tuple[int, object]]:
+        """
+        Consume data; return the complete frames as (kind, payload).
+
+        payload is (subscription, token) for KIND_TOKEN and the unpickled
+        tuple for KIND_MESSAGE.
+        """
+        self._buffer += data
+        frames = []
+        offset = 0
+        while len(self._buffer) - offset >= HEADER.size:
+            length, kind = HEADER.unpack_from(self._buffer, offset)
+            if length > MAX_FRAME:
+                raise ProtocolError(f"frame of {length} bytes exceeds {MAX_FRAME}")
+            start = offset + HEADER.size
+            end = start + length
+            if len(self._buffer) < end:
+                break
+            body = memoryview(self._buffer)[start:end]
+            if kind == KIND_TOKEN:
+                (subscription,) = TOKEN_PREFIX.unpack_from(body)
+                frames.append((kind, (subscription, bytes(body[TOKEN_PREFIX.size:]).decode("utf-8"))))
+            elif kind == KIND_MESSAGE:
+                frames.append((kind, pickle.loads(body)))
+            else:
+                body.release()
+                raise ProtocolError(f"unknown frame kind {kind}")
+            body.release()
+            offset = end
+        del self._buffer[:offset]
+        return frames
@@ -1,3 +1,5 @@
+import uuid
+
 from ui.addons.context import AddonContext
 from ui.addons.registry import AddonRegistry
 from ui.addons.spec import AddonSpec
@@ -9,44 +11,56 @@ from ui.pages.chat import PageChat
 from ui.pages.databank import PageFiles
 from ui.pages.hub import PageHub
 from core.operators import OperatorManager
+from monokernel.dock import EnqueueStatus
 
 
 def terminal_factory(ctx: AddonContext):
     w = PageChat(ctx.state, ctx.ui_bridge)
+    # each terminal instance gets its own pid so output routes back to it alone
+    pid = f"terminal:{uuid.uuid4().hex[:8]}"
     ctx.ui_bridge.sig_apply_operator.connect(w.apply_operator)
     # outgoing (addon -> bridge)
-    w.sig_generate.connect(
-        lambda prompt, thinking_mode: ctx.bridge.submit(
+
+    def _generate(prompt, thinking_mode):
+        result = ctx.bridge.submit(
             ctx.bridge.wrap(
-                "terminal",
+                pid,
                 "generate",
                 "llm",
-                payload={"prompt": prompt, "config": w.config, "thinking_mode": thinking_mode},
+                # session keeps the conversation on one replica of an engine pool
+                payload={"prompt": prompt, "config": w.config, "thinking_mode": thinking_mode, "session": pid},
             )
         )
-    )
+        # REJECTED reaches the page as a dock.rejected trace on its channel;
+        # a BLOCKED task is not queued and nobody resubmits it for the terminal.
+        if result is not None and result.status == EnqueueStatus.BLOCKED:
+            w.on_generate_rejected(result.reason)
+
+    w.sig_generate.connect(_generate)
     w.sig_load.connect(
-        lambda: ctx.bridge.submit(ctx.bridge.wrap("terminal", "load", "llm"))
+        lambda: ctx.bridge.submit(ctx.bridge.wrap(pid, "load", "llm"))
     )
     w.sig_unload.connect(
-        lambda: ctx.bridge.submit(ctx.bridge.wrap("terminal", "unload", "llm"))
+        lambda: ctx.bridge.submit(ctx.bridge.wrap(pid, "unload", "llm"))
     )
     w.sig_stop.connect(lambda: ctx.bridge.stop("llm"))
     w.sig_sync_history.connect(
         lambda history: ctx.bridge.submit(
             ctx.bridge.wrap(
-                "terminal",
+                pid,
                 "set_history",
                 "llm",
-                payload={"history": history},
+                payload={"history": history, "session": pid},
             )
         )
     )
     ctx.guard.sig_status.connect(w.update_status)
-    # incoming (guard -> addon)
-    ctx.guard.sig_token.connect(w.append_token)
-    ctx.guard.sig_trace.connect(w.append_trace)
-    ctx.guard.sig_finished.connect(w.on_guard_finished)
+    # incoming (guard -> addon), only for tasks this terminal submitted
+    channel = ctx.guard.addon_channel(pid)
+    channel.sig_token.connect(w.append_token)
+    channel.sig_trace_event.connect(w.append_trace)
+    channel.sig_finished.connect(lambda task_id: w.on_guard_finished("llm", task_id))
+    w.destroyed.connect(lambda: ctx.guard.release_addon_channel(pid))
     return w
 
 
@@ -98,7 +112,7 @@ def sd_factory(ctx: AddonContext):
 
 
 def audiogen_factory(ctx: AddonContext):
-    return AudioGenModule()
+    return AudioGenModule(ctx.bridge, ctx.guard)
 
 
 def build_builtin_registry() -> AddonRegistry:
@@ -3,6 +3,7 @@ from typing import Dict, Optional
 
 from PySide6.QtWidgets import QWidget
 
+from core.trace import TraceLevel
 from ui.addons.context import AddonContext
 from ui.addons.registry import AddonRegistry
 
@@ -39,7 +40,7 @@ class AddonHost:
             instance_id = str(uuid.uuid4())
             widget = spec.factory(self.ctx)
         except Exception as e:
-            self.ctx.guard.sig_trace.emit(f"<span style='color:red'>ADDON ERROR: {e}</span>")
+            self.ctx.guard.trace(TraceLevel.ERROR, "addon.launch_failed", str(e), addon_id=addon_id)
             return ""
 
         widget._mod_id = instance_id
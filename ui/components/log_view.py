@@ -0,0 +1,202 @@
+"""
+Ring-buffer log model and view for the Overseer.
+
+LogModel keeps the last `capacity` lines in a fixed-size ring, so memory
+does not grow with uptime, and exposes only the lines passing the severity
+filter. Appends are coalesced and applied to the view every FLUSH_INTERVAL_MS
+as one row insertion. LogView paints lines with LogDelegate: one uniform
+height plain-text row each, so only the rows on screen are ever laid out.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QSize, Qt, QTimer
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QGuiApplication, QKeySequence, QPainter
+from PySide6.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+LOG_CAPACITY = 50_000
+FLUSH_INTERVAL_MS = 50
+
+EntryRole = Qt.UserRole + 1
+
+
+@dataclass
+class LogEntry:
+    time: str
+    severity: str
+    text: str
+
+    def line(self) -> str:
+        return f"[{self.time}] [{self.severity}] {self.text}"
+
+
+class LogModel(QAbstractListModel):
+    def __init__(self, capacity: int = LOG_CAPACITY, parent=None) -> None:
+        super().__init__(parent)
+        self.capacity = capacity
+        self._ring: list[LogEntry | None] = [None] * capacity
+        # Entries hold sequence numbers [_next_seq - _count, _next_seq);
+        # entry seq lives in slot seq % capacity.
+        self._next_seq = 0
+        self._count = 0
+        # Sequence numbers of the rows shown, ascending, from _visible_start on.
+        self._visible: list[int] = []
+        self._visible_start = 0
+        self._hidden: set[str] = set()  # severities filtered out
+        self._pending: list[LogEntry] = []
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    # ---- Qt model ----
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._visible) - self._visible_start
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entry(index.row())
+        if role == EntryRole:
+            return entry
+        if role == Qt.DisplayRole:
+            return entry.line()
+        return None
+
+    def entry(self, row: int) -> LogEntry:
+        return self._ring[self._visible[self._visible_start + row] % self.capacity]
+
+    # ---- log ----
+
+    def append(self, time: str, severity: str, text: str) -> None:
+        self._pending.append(LogEntry(time, severity, text))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        entries, self._pending = self._pending[-self.capacity:], []
+        if not entries:
+            return
+        # Evict the oldest entries the new ones overwrite, then drop their rows.
+        evicted = max(0, self._count + len(entries) - self.capacity)
+        oldest = self._next_seq - self._count + evicted
+        self._count -= evicted
+        gone = bisect_left(self._visible, oldest, self._visible_start) - self._visible_start
+        if gone:
+            self.beginRemoveRows(QModelIndex(), 0, gone - 1)
+            self._visible_start += gone
+            self.endRemoveRows()
+            if self._visible_start > len(self._visible) // 2:
+                del self._visible[: self._visible_start]
+                self._visible_start = 0
+
+        shown = []
+        for entry in entries:
+            seq = self._next_seq
+            self._ring[seq % self.capacity] = entry
+            self._next_seq += 1
+            if entry.severity not in self._hidden:
+                shown.append(seq)
+        self._count += len(entries)
+        if shown:
+            first = self.rowCount()
+            self.beginInsertRows(QModelIndex(), first, first + len(shown) - 1)
+            self._visible.extend(shown)
+            self.endInsertRows()
+
+    def set_hidden(self, severities: set[str]) -> None:
+        """Hide lines of these severities, including the ones already in the buffer."""
+        self.flush()
+        self.beginResetModel()
+        self._hidden = set(severities)
+        start = self._next_seq - self._count
+        self._visible = [
+            seq for seq in range(start, self._next_seq) if self._ring[seq % self.capacity].severity not in self._hidden
+        ]
+        self._visible_start = 0
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._pending.clear()
+        self._ring = [None] * self.capacity
+        self._count = 0
+        self._visible = []
+        self._visible_start = 0
+        self.endResetModel()
+
+
+class LogDelegate(QStyledItemDelegate):
+    """Paints "[time] [SEVERITY] text" on one line, elided to the row width."""
+
+    def __init__(self, font: QFont, colors: dict[str, str], time_color: str, text_color: str, parent=None) -> None:
+        super().__init__(parent)
+        self.font = font
+        self.metrics = QFontMetrics(font)
+        self.colors = {severity: QColor(color) for severity, color in colors.items()}
+        self.time_color = QColor(time_color)
+        self.text_color = QColor(text_color)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(0, self.metrics.height() + 2)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        entry: LogEntry = index.data(EntryRole)
+        if entry is None:
+            return
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        painter.setFont(self.font)
+        rect = option.rect.adjusted(4, 0, -4, 0)
+        flags = Qt.AlignLeft | Qt.AlignVCenter
+        for text, color in (
+            (f"[{entry.time}] ", self.time_color),
+            (f"[{entry.severity}] ", self.colors.get(entry.severity, self.text_color)),
+            (entry.text, self.text_color),
+        ):
+            if rect.width() <= 0:
+                break
+            text = self.metrics.elidedText(text, Qt.ElideRight, rect.width())
+            painter.setPen(color)
+            painter.drawText(rect, flags, text)
+            rect.setLeft(rect.left() + self.metrics.horizontalAdvance(text))
+        painter.restore()
+
+
+class LogView(QListView):
+    """List view over a LogModel that follows the tail while scrolled to the bottom."""
+
+    def __init__(self, model: LogModel, delegate: LogDelegate, parent=None) -> None:
+        super().__init__(parent)
+        self.setModel(model)
+        self.setItemDelegate(delegate)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self._follow = True
+        model.rowsAboutToBeInserted.connect(self._remember_follow)
+        model.rowsInserted.connect(self._scroll_if_following)
+        model.modelReset.connect(self.scrollToBottom)
+
+    def _remember_follow(self, *_args) -> None:
+        bar = self.verticalScrollBar()
+        self._follow = bar.value() >= bar.maximum()
+
+    def _scroll_if_following(self, *_args) -> None:
+        if self._follow:
+            self.scrollToBottom()
+
+    def keyPressEvent(self, event) -> None:
+        if event.matches(QKeySequence.Copy):
+            rows = sorted(index.row() for index in self.selectedIndexes())
+            model = self.model()
+            QGuiApplication.clipboard().setText("\n".join(model.entry(row).line() for row in rows))
+            return
+        super().keyPressEvent(event)
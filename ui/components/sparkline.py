@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QPointF, QSize, Qt
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+
+class Sparkline(QWidget):
+    """A minimal line chart of (x, y) points scaled to the widget, no axes."""
+
+    def __init__(self, color: str, baseline: str, parent=None) -> None:
+        super().__init__(parent)
+        self.color = QColor(color)
+        self.baseline = QColor(baseline)
+        self.points: list[tuple[float, float]] = []
+        self.x_range: tuple[float, float] | None = None
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setFixedHeight(22)
+
+    def sizeHint(self) -> QSize:
+        return QSize(160, 22)
+
+    def set_points(self, points: list[tuple[float, float]], x_range: tuple[float, float] | None = None) -> None:
+        """x_range fixes the horizontal extent (e.g. the last two minutes) so gaps show as gaps."""
+        self.points = points
+        self.x_range = x_range
+        self.update()
+
+    def paintEvent(self, _event) -> None:
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        width, height = self.width() - 2, self.height() - 2
+        painter.setPen(QPen(self.baseline, 1))
+        painter.drawLine(1, height, width, height)
+        if not self.points:
+            return
+        xs = [x for x, _y in self.points]
+        x0, x1 = self.x_range or (min(xs), max(xs))
+        top = max(y for _x, y in self.points) or 1.0
+        span = (x1 - x0) or 1.0
+        line = QPolygonF(
+            [QPointF(1 + (x - x0) / span * (width - 1), 1 + (1 - y / top) * (height - 1)) for x, y in self.points]
+        )
+        painter.setPen(QPen(self.color, 1.2))
+        if len(self.points) == 1:
+            painter.drawEllipse(line[0], 1.5, 1.5)
+        else:
+            painter.drawPolyline(line)
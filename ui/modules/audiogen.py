@@ -1,16 +1,21 @@
 import os
 import json
+import uuid
 from pathlib import Path
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QFrame, QComboBox, QDoubleSpinBox, QFileDialog,
     QAbstractSpinBox
 )
-from PySide6.QtCore import Qt, QThread, Signal, QUrl, QTimer
+from PySide6.QtCore import Qt, QUrl, QTimer
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PySide6.QtGui import QPainter, QPen, QColor
 
+from core.state import SystemStatus
 from core.style import BG_INPUT, BORDER_DARK, FG_DIM, FG_TEXT, FG_ACCENT, FG_ERROR
+from core.trace import TraceEvent, TraceLevel
+from monokernel.bridge import MonoBridge
+from monokernel.guard import MonoGuard
 from ui.components.atoms import SkeetGroupBox, SkeetButton, SkeetTriangleButton, CollapsibleSection
 
 AUDIOCRAFT_AVAILABLE = False
@@ -73,49 +78,13 @@ class WaveformWidget(QFrame):
             painter.drawLine(x1, y1, x2, y2)
 
 
-class AudioGenWorker(QThread):
-    progress = Signal(str)
-    finished = Signal(object, int)
-    error = Signal(str)
-
-    def __init__(self, prompt, model_path, duration, sample_rate):
-        super().__init__()
-        self.prompt = prompt
-        self.model_path = model_path
-        self.duration = duration
-        self.sample_rate = sample_rate
-
-    def run(self):
-        try:
-            try:
-                from audiocraft.models import MusicGen
-            except ImportError:
-                self.error.emit("ERROR: audiocraft not installed. pip install audiocraft")
-                return
-            import torchaudio
-            import torch
-            
-            self.progress.emit("Loading model...")
-            
-            model = MusicGen.get_pretrained(self.model_path)
-            model.set_generation_params(duration=self.duration)
-            
-            self.progress.emit("Generating audio...")
-            
-            wav = model.generate([self.prompt])
-            
-            audio_array = wav[0].cpu().numpy()
-            
-            self.finished.emit(audio_array, self.sample_rate)
-            
-        except Exception as e:
-            self.error.emit(str(e))
-
-
 class AudioGenModule(QWidget):
-    def __init__(self):
+    def __init__(self, bridge: MonoBridge, guard: MonoGuard):
         super().__init__()
-        
+        self.bridge = bridge
+        self.guard = guard
+        self._pid = f"audio:{uuid.uuid4().hex[:8]}"
+
         self.config_path = Path("config/audiogen_config.json")
         self.artifacts_dir = Path("artifacts/audio")
         self.artifacts_dir.mkdir(parents=True, exist_ok=True)
@@ -126,7 +95,6 @@ class AudioGenModule(QWidget):
         self.current_audio = None
         self.current_sample_rate = None
         self.current_filepath = None
-        self.worker = None
         self._config_timer = QTimer(self)
         self._config_timer.setInterval(1000)
         self._config_timer.setSingleShot(True)
@@ -302,6 +270,12 @@ class AudioGenModule(QWidget):
 
         self.inp_duration.valueChanged.connect(self._queue_save_config)
         self.cmb_sr.currentTextChanged.connect(self._queue_save_config)
+        channel = self.guard.addon_channel(self._pid)
+        channel.sig_audio.connect(self._on_audio)
+        channel.sig_trace_event.connect(self._on_trace)
+        self.guard.sig_status.connect(self._on_status)
+        pid, guard = self._pid, self.guard
+        self.destroyed.connect(lambda: guard.release_addon_channel(pid))
 
     def _load_config(self):
         if self.config_path.exists():
@@ -391,20 +365,44 @@ class AudioGenModule(QWidget):
             self._set_status("ERROR: No model selected", FG_ERROR)
             return
 
-        self.worker = AudioGenWorker(
-            prompt,
-            model_path,
-            self.inp_duration.value(),
-            int(self.cmb_sr.currentText())
+        self.bridge.submit(
+            self.bridge.wrap(self._pid, "set_path", "audio", payload={"path": model_path})
+        )
+        self.bridge.submit(
+            self.bridge.wrap(
+                self._pid,
+                "generate",
+                "audio",
+                payload={
+                    "prompt": prompt,
+                    "config": {
+                        "duration": self.inp_duration.value(),
+                        "sample_rate": int(self.cmb_sr.currentText()),
+                    },
+                },
+            )
         )
-        self.worker.progress.connect(self._on_progress)
-        self.worker.finished.connect(self._on_finished)
-        self.worker.error.connect(self._on_error)
-        self.worker.start()
 
     def _on_progress(self, msg):
         self._set_status(msg, FG_ACCENT)
 
+    def _on_audio(self, result: dict) -> None:
+        self._on_finished(result["audio"], result["sample_rate"])
+
+    def _on_trace(self, event: TraceEvent) -> None:
+        if event.source != "audio":
+            return
+        if event.level == TraceLevel.ERROR:
+            self._on_error(event.message)
+        else:
+            self._on_progress(event.message.upper())
+
+    def _on_status(self, engine_key: str, status: SystemStatus) -> None:
+        if engine_key != "audio":
+            return
+        if status in (SystemStatus.READY, SystemStatus.ERROR):
+            self.btn_generate.setEnabled(True)
+
     def _on_finished(self, audio_array, sample_rate):
         self.current_audio = audio_array
         self.current_sample_rate = sample_rate
@@ -1,4 +1,5 @@
 import json
+import uuid
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
@@ -11,6 +12,7 @@ from PySide6.QtGui import QPixmap, QImage
 from core.style import BG_INPUT, BORDER_DARK, FG_DIM, FG_TEXT, FG_ACCENT, FG_ERROR
 from core.state import SystemStatus
 from core.paths import CONFIG_DIR, MONOLITH_ROOT
+from core.trace import TraceEvent, TraceLevel
 from monokernel.bridge import MonoBridge
 from monokernel.guard import MonoGuard
 from ui.components.atoms import SkeetGroupBox, SkeetButton, SkeetTriangleButton, CollapsibleSection
@@ -20,6 +22,7 @@ class SDModule(QWidget):
         super().__init__()
         self.bridge = bridge
         self.guard = guard
+        self._pid = f"vision:{uuid.uuid4().hex[:8]}"
 
         self.config_path = CONFIG_DIR / "vision_config.json"
         self.legacy_config_path = CONFIG_DIR / "sd_config.json"
@@ -43,7 +46,7 @@ class SDModule(QWidget):
         if self.model_path:
             self.bridge.submit(
                 self.bridge.wrap(
-                    "vision",
+                    self._pid,
                     "set_path",
                     "vision",
                     payload={"path": self.model_path},
@@ -239,9 +242,12 @@ class SDModule(QWidget):
         self.inp_steps.valueChanged.connect(self._queue_save_config)
         self.inp_strength.valueChanged.connect(self._queue_save_config)
         self.inp_seed.valueChanged.connect(self._queue_save_config)
-        self.guard.sig_image.connect(self._on_image)
+        channel = self.guard.addon_channel(self._pid)
+        channel.sig_image.connect(self._on_image)
+        channel.sig_trace_event.connect(self._on_trace)
         self.guard.sig_status.connect(self._on_status)
-        self.guard.sig_trace.connect(self._on_trace)
+        pid, guard = self._pid, self.guard
+        self.destroyed.connect(lambda: guard.release_addon_channel(pid))
 
     def _load_config(self):
         if self.config_path.exists():
@@ -320,15 +326,15 @@ class SDModule(QWidget):
             self._queue_save_config()
             self.bridge.submit(
                 self.bridge.wrap(
-                    "vision",
+                    self._pid,
                     "set_path",
                     "vision",
                     payload={"path": path},
                 )
             )
-            self.bridge.submit(self.bridge.wrap("vision", "load", "vision"))
+            self.bridge.submit(self.bridge.wrap(self._pid, "load", "vision"))
         else:
-            self.bridge.submit(self.bridge.wrap("vision", "unload", "vision"))
+            self.bridge.submit(self.bridge.wrap(self._pid, "unload", "vision"))
 
     def _queue_save_config(self):
         self._status_reset_timer.stop()
@@ -360,7 +366,7 @@ class SDModule(QWidget):
         }
         self.bridge.submit(
             self.bridge.wrap(
-                "vision",
+                self._pid,
                 "generate",
                 "vision",
                 payload={"prompt": prompt, "config": config},
@@ -444,6 +450,6 @@ class SDModule(QWidget):
             self.btn_load.setText("LOAD MODEL")
             self.btn_generate.setEnabled(False)
 
-    def _on_trace(self, message: str) -> None:
-        if "VISION: ERROR:" in message:
-            self._set_status(message.replace("VISION: ", ""), FG_ERROR)
+    def _on_trace(self, event: TraceEvent) -> None:
+        if event.source == "vision" and event.level == TraceLevel.ERROR:
+            self._set_status(f"ERROR: {event.message}", FG_ERROR)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import html
+import time
 from datetime import datetime
 
 from PySide6.QtCore import QTimer, Qt
@@ -15,18 +17,26 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
     QFrame,
+    QGridLayout,
     QLabel,
     QHeaderView,
+    QLineEdit,
     QSplitter,
 )
 
 from core.overseer_db import OverseerDB
+from core.task import TaskStatus
+from core.trace import TraceEvent
 from core.style import (
     ACCENT_GOLD, FG_DIM, FG_TEXT, FG_ERROR, FG_WARN, FG_ACCENT,
     OVERSEER_BG, OVERSEER_FG, OVERSEER_DIM, OVERSEER_BORDER, BG_INPUT,
 )
-from monokernel.guard import MonoGuard
+from monokernel.dock import MonoDock
+from monokernel.guard import MonoGuard, pool_key
+from monokernel.timeseries import MetricsRecorder
 from ui.bridge import UIBridge
+from ui.components.log_view import LogDelegate, LogModel, LogView
+from ui.components.sparkline import Sparkline
 
 # Severity colors
 _SEV_COLORS = {
@@ -67,6 +77,47 @@ _RECIPE_PRESETS = {
     "PERFORMANCE": {"INFO", "FINISHED"},
 }
 
+_TABLE_STYLE = f"""
+    QTableWidget {{
+        background: {OVERSEER_BG};
+        color: {OVERSEER_FG};
+        border: 1px solid {OVERSEER_BORDER};
+        gridline-color: {OVERSEER_BORDER};
+        font-family: 'Consolas', monospace;
+        font-size: 10px;
+    }}
+    QTableWidget::item {{
+        padding: 4px;
+        border-bottom: 1px solid {OVERSEER_BORDER};
+    }}
+    QHeaderView::section {{
+        background: {OVERSEER_BG};
+        color: {OVERSEER_DIM};
+        border: none;
+        border-bottom: 1px solid {OVERSEER_BORDER};
+        font-size: 9px;
+        font-weight: bold;
+        padding: 4px;
+    }}
+"""
+
+_PANEL_LABEL_STYLE = (
+    f"color: {OVERSEER_DIM}; font-size: 9px; font-weight: bold; "
+    f"letter-spacing: 2px; background: transparent;"
+)
+
+
+def _fmt_ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f}"
+
+
+def _fmt_rate(rate: float | None) -> str:
+    return "-" if rate is None else f"{rate:.1f}"
+
+
+def _fmt_discarded(stats: dict | None) -> str:
+    return "-" if stats is None else f"{stats['source']}/{stats['bridge']}"
+
 
 class _SeverityFilter(QPushButton):
     """Toggle button for a log severity level."""
@@ -112,10 +163,7 @@ class ActiveTasksPanel(QWidget):
         layout.setSpacing(4)
 
         lbl = QLabel("ACTIVE TASKS")
-        lbl.setStyleSheet(
-            f"color: {OVERSEER_DIM}; font-size: 9px; font-weight: bold; "
-            f"letter-spacing: 2px; background: transparent;"
-        )
+        lbl.setStyleSheet(_PANEL_LABEL_STYLE)
         layout.addWidget(lbl)
 
         self.table = QTableWidget(0, 3)
@@ -125,29 +173,7 @@ class ActiveTasksPanel(QWidget):
         self.table.setSelectionMode(QTableWidget.NoSelection)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setStyleSheet(f"""
-            QTableWidget {{
-                background: {OVERSEER_BG};
-                color: {OVERSEER_FG};
-                border: 1px solid {OVERSEER_BORDER};
-                gridline-color: {OVERSEER_BORDER};
-                font-family: 'Consolas', monospace;
-                font-size: 10px;
-            }}
-            QTableWidget::item {{
-                padding: 4px;
-                border-bottom: 1px solid {OVERSEER_BORDER};
-            }}
-            QHeaderView::section {{
-                background: {OVERSEER_BG};
-                color: {OVERSEER_DIM};
-                border: none;
-                border-bottom: 1px solid {OVERSEER_BORDER};
-                font-size: 9px;
-                font-weight: bold;
-                padding: 4px;
-            }}
-        """)
+        self.table.setStyleSheet(_TABLE_STYLE)
         layout.addWidget(self.table)
 
     def set_tasks(self, rows: list[tuple[str, str, str]]) -> None:
@@ -161,14 +187,326 @@ class ActiveTasksPanel(QWidget):
             self.table.setItem(idx, 2, item)
 
 
+class KernelMetricsPanel(QWidget):
+    """Per-engine and per-addon latency percentiles from MonoGuard.metrics."""
+
+    _COLUMNS = [
+        "SCOPE", "KEY", "N",
+        "WAIT p50", "WAIT p95", "WAIT p99",
+        "TTFO p50", "TTFO p95",
+        "RUN p50", "RUN p95", "RUN p99",
+        "U/S p50", "U/S AVG", "STALE SRC/HOP",
+    ]
+
+    def __init__(self) -> None:
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        lbl = QLabel("KERNEL METRICS (ms / units per sec)")
+        lbl.setStyleSheet(_PANEL_LABEL_STYLE)
+        layout.addWidget(lbl)
+
+        self.table = QTableWidget(0, len(self._COLUMNS))
+        self.table.setHorizontalHeaderLabels(self._COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionMode(QTableWidget.NoSelection)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.setStyleSheet(_TABLE_STYLE)
+        layout.addWidget(self.table)
+
+    def set_snapshot(self, snapshot: dict) -> None:
+        rows = []
+        for scope, group in (("engine", snapshot.get("engines", {})), ("addon", snapshot.get("addons", {}))):
+            for key, data in sorted(group.items()):
+                rows.append(
+                    [
+                        scope,
+                        key,
+                        str(data["samples"]),
+                        _fmt_ms(data["queue_wait"]["p50"]),
+                        _fmt_ms(data["queue_wait"]["p95"]),
+                        _fmt_ms(data["queue_wait"]["p99"]),
+                        _fmt_ms(data["first_output"]["p50"]),
+                        _fmt_ms(data["first_output"]["p95"]),
+                        _fmt_ms(data["run_time"]["p50"]),
+                        _fmt_ms(data["run_time"]["p95"]),
+                        _fmt_ms(data["run_time"]["p99"]),
+                        _fmt_rate(data["units_per_sec"]["p50"]),
+                        _fmt_rate(data["avg_units_per_sec"]),
+                        _fmt_discarded(data.get("discarded")),
+                    ]
+                )
+        self.table.setRowCount(len(rows))
+        for row_idx, values in enumerate(rows):
+            for col_idx, value in enumerate(values):
+                self.table.setItem(row_idx, col_idx, QTableWidgetItem(value))
+
+
+class QueueDepthPanel(QWidget):
+    """Per-engine and per-addon queue depth against MonoDock's limits."""
+
+    _COLUMNS = ["SCOPE", "KEY", "DEPTH", "LIMIT", "POLICY", "REJECTED", "DROPPED", "BLOCKED"]
+
+    def __init__(self) -> None:
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        lbl = QLabel("QUEUES")
+        lbl.setStyleSheet(_PANEL_LABEL_STYLE)
+        layout.addWidget(lbl)
+
+        self.table = QTableWidget(0, len(self._COLUMNS))
+        self.table.setHorizontalHeaderLabels(self._COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionMode(QTableWidget.NoSelection)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.setStyleSheet(_TABLE_STYLE)
+        layout.addWidget(self.table)
+
+    def set_snapshot(self, snapshot: dict) -> None:
+        rows = []
+        for scope, group in (("engine", snapshot.get("engines", {})), ("addon", snapshot.get("addons", {}))):
+            for key, data in group.items():
+                full = data["max_depth"] is not None and data["depth"] >= data["max_depth"]
+                rows.append(
+                    (
+                        [
+                            scope,
+                            key,
+                            str(data["depth"]),
+                            "-" if data["max_depth"] is None else str(data["max_depth"]),
+                            data["policy"],
+                            str(data["rejected"]),
+                            str(data["dropped"]),
+                            str(data["blocked"]),
+                        ],
+                        full,
+                    )
+                )
+        self.table.setRowCount(len(rows))
+        for row_idx, (values, full) in enumerate(rows):
+            for col_idx, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if full:
+                    item.setForeground(QColor(FG_WARN))
+                self.table.setItem(row_idx, col_idx, item)
+
+
+# Series charted in the TRENDS panel: name -> (label, value formatter).
+_TREND_SERIES = {
+    "units_per_sec": ("units/s", _fmt_rate),
+    "queue_depth": ("queue", lambda value: f"{value:.0f}"),
+    "first_output_p95": ("ttft p95 ms", _fmt_ms),
+    "run_time_p95": ("run p95 ms", _fmt_ms),
+}
+# Buckets shown per chart: 2 min at 1 s, 2 h at 1 min, 5 days at 1 h.
+_TREND_POINTS = {1: 120, 60: 120, 3600: 120}
+
+
+class TrendsPanel(QWidget):
+    """
+    Sparklines of the kernel's time series: live 1 s points from the
+    in-process MetricsRecorder, or buckets from OverseerDB (1 min / 1 h, and
+    1 s too when attached to a daemon, which records into the same file).
+    """
+
+    def __init__(self, recorder: MetricsRecorder | None, db: OverseerDB) -> None:
+        super().__init__()
+        self.recorder = recorder
+        self.db = db
+        self.resolution = 1
+        self._rows: dict[tuple[str, str], tuple[Sparkline, QLabel]] = {}
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        header = QHBoxLayout()
+        lbl = QLabel("TRENDS")
+        lbl.setStyleSheet(_PANEL_LABEL_STYLE)
+        header.addWidget(lbl)
+        header.addStretch()
+        self._buttons: dict[int, QPushButton] = {}
+        for resolution, text in ((1, "1S"), (60, "1M"), (3600, "1H")):
+            btn = QPushButton(text)
+            btn.setCheckable(True)
+            btn.setChecked(resolution == self.resolution)
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.setFixedHeight(18)
+            btn.setStyleSheet(f"""
+                QPushButton {{
+                    background: transparent; border: 1px solid {OVERSEER_BORDER};
+                    color: {OVERSEER_DIM}; padding: 0 6px; font-size: 8px; font-weight: bold;
+                }}
+                QPushButton:checked {{ border: 1px solid {OVERSEER_FG}; color: {OVERSEER_FG}; }}
+            """)
+            btn.clicked.connect(lambda _=False, r=resolution: self._set_resolution(r))
+            self._buttons[resolution] = btn
+            header.addWidget(btn)
+        layout.addLayout(header)
+
+        self.grid = QGridLayout()
+        self.grid.setHorizontalSpacing(6)
+        self.grid.setVerticalSpacing(2)
+        layout.addLayout(self.grid)
+        layout.addStretch()
+
+    def _set_resolution(self, resolution: int) -> None:
+        self.resolution = resolution
+        for value, btn in self._buttons.items():
+            btn.setChecked(value == resolution)
+        self.refresh()
+
+    def refresh(self) -> None:
+        now = int(time.time())
+        span = _TREND_POINTS[self.resolution] * self.resolution
+        x_range = (now - span, now)
+        if self.resolution == 1 and self.recorder is not None:
+            series = [(name, key) for name, key in self.recorder.series() if name in _TREND_SERIES]
+            points = {
+                (name, key): [(ts, value) for ts, value in self.recorder.recent[(name, key)] if ts >= now - span]
+                for name, key in series
+            }
+        else:
+            points = {}
+            for name in _TREND_SERIES:
+                for row in self.db.query_metrics(name, self.resolution, now - span):
+                    points.setdefault((name, row["key"]), []).append((row["ts"], row["value"]))
+        for name, key in sorted(points, key=lambda item: (item[1], list(_TREND_SERIES).index(item[0]))):
+            chart, value_label = self._row(name, key)
+            chart.set_points(points[(name, key)], x_range)
+            last = points[(name, key)][-1][1] if points[(name, key)] else None
+            value_label.setText("-" if last is None else _TREND_SERIES[name][1](last))
+
+    def _row(self, name: str, key: str) -> tuple[Sparkline, QLabel]:
+        row = self._rows.get((name, key))
+        if row is None:
+            index = len(self._rows)
+            label = QLabel(f"{key} {_TREND_SERIES[name][0]}")
+            label.setStyleSheet(f"color: {OVERSEER_DIM}; font-size: 9px; background: transparent;")
+            chart = Sparkline(OVERSEER_FG, OVERSEER_BORDER)
+            value_label = QLabel("-")
+            value_label.setStyleSheet(f"color: {OVERSEER_FG}; font-size: 9px; background: transparent;")
+            value_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            value_label.setMinimumWidth(48)
+            self.grid.addWidget(label, index, 0)
+            self.grid.addWidget(chart, index, 1)
+            self.grid.addWidget(value_label, index, 2)
+            row = self._rows[(name, key)] = (chart, value_label)
+        return row
+
+
+def _ts_label(ts: str) -> str:
+    try:
+        return datetime.fromisoformat(ts).astimezone().strftime("%m-%d %H:%M:%S")
+    except ValueError:
+        return ts
+
+
+class LogSearchPanel(QWidget):
+    """Ranked full-text hits from OverseerDB; selecting one shows the log lines around it."""
+
+    _COLUMNS = ["TIME", "LEVEL", "ENGINE", "CODE", "MATCH"]
+
+    def __init__(self, db: OverseerDB) -> None:
+        super().__init__()
+        self.db = db
+        self._hits: list[dict] = []
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        self.lbl = QLabel("SEARCH")
+        self.lbl.setStyleSheet(_PANEL_LABEL_STYLE)
+        layout.addWidget(self.lbl)
+
+        self.table = QTableWidget(0, len(self._COLUMNS))
+        self.table.setHorizontalHeaderLabels(self._COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setStretchLastSection(True)
+        self.table.setStyleSheet(_TABLE_STYLE)
+        self.table.currentCellChanged.connect(self._on_hit_selected)
+        layout.addWidget(self.table, 2)
+
+        self.context = QPlainTextEdit()
+        self.context.setReadOnly(True)
+        self.context.setFont(QFont("Consolas", 9))
+        self.context.setStyleSheet(
+            f"background: {OVERSEER_BG}; color: {OVERSEER_FG}; border: 1px solid {OVERSEER_BORDER};"
+        )
+        layout.addWidget(self.context, 1)
+
+    def search(self, text: str) -> None:
+        began = time.perf_counter()
+        self._hits = self.db.search(text)
+        elapsed = (time.perf_counter() - began) * 1000
+        if not self.db.search_enabled:
+            self.lbl.setText("SEARCH  (unavailable: SQLite without FTS5)")
+        else:
+            self.lbl.setText(f"SEARCH  {len(self._hits)} hits · {elapsed:.0f} ms")
+        self.context.clear()
+        self.table.setRowCount(len(self._hits))
+        for row_idx, hit in enumerate(self._hits):
+            values = [_ts_label(hit["ts"]), hit["level"], hit["engine_key"], hit["code"], hit["snippet"] or ""]
+            color = _SEV_COLORS.get(hit["level"], OVERSEER_FG)
+            for col_idx, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col_idx == 1:
+                    item.setForeground(QColor(color))
+                self.table.setItem(row_idx, col_idx, item)
+
+    def _on_hit_selected(self, row: int, _col: int, _prev_row: int, _prev_col: int) -> None:
+        if not 0 <= row < len(self._hits):
+            return
+        hit = self._hits[row]
+        self.context.clear()
+        for entry in self.db.context(hit["table"], hit["id"]):
+            if hit["table"] == "traces":
+                severity = entry["level"]
+                text = f"{entry['engine_key']} {entry['code']}: {entry['message']}"
+            else:
+                severity = entry["event"].upper()
+                text = f"{entry['engine_key']} {entry['event']} {entry['payload']}"
+            line = (
+                f'<span style="color:{OVERSEER_DIM}">[{_ts_label(entry["ts"])}]</span> '
+                f'<span style="color:{_SEV_COLORS.get(severity, OVERSEER_FG)}">[{severity}]</span> '
+                f"{html.escape(text)}"
+            )
+            if entry["id"] == hit["id"]:
+                line = f'<span style="background:#1a3a1a">{line}</span>'
+            self.context.appendHtml(line)
+
+
 class OverseerWindow(QMainWindow):
-    def __init__(self, guard: MonoGuard, ui_bridge: UIBridge):
+    def __init__(
+        self,
+        guard: MonoGuard,
+        ui_bridge: UIBridge,
+        dock: MonoDock | None = None,
+        db: OverseerDB | None = None,
+        recorder: MetricsRecorder | None = None,
+    ):
         super().__init__()
         self.guard = guard
+        self.dock = dock
         self.ui_bridge = ui_bridge
-        self.db = OverseerDB()
+        # The kernel runtime's database and recorder when it runs in-process;
+        # attached to a daemon, the window opens the same file itself.
+        self.db = db or OverseerDB()
+        self.recorder = recorder
         self._paused = False
-        self._last_task_state: dict[str, tuple[str, str]] = {}
+        # Running tasks shown in the panel: task_id -> (engine_key, status).
+        self._running: dict[str, tuple[str, str]] = {}
         self._severity_filters: dict[str, _SeverityFilter] = {}
 
         self.setWindowTitle("OVERSEER")
@@ -219,6 +557,7 @@ class OverseerWindow(QMainWindow):
         filter_row.setSpacing(4)
         for sev, color in _SEV_COLORS.items():
             f = _SeverityFilter(sev, color)
+            f.clicked.connect(self._apply_filters)
             self._severity_filters[sev] = f
             filter_row.addWidget(f)
         filter_row.addStretch()
@@ -237,8 +576,21 @@ class OverseerWindow(QMainWindow):
         """)
         content_split.setChildrenCollapsible(False)
 
+        side_split = QSplitter(Qt.Vertical)
+        side_split.setStyleSheet(f"""
+            QSplitter::handle {{ background: {OVERSEER_BORDER}; height: 1px; }}
+        """)
+        side_split.setChildrenCollapsible(False)
         self.panel = ActiveTasksPanel()
-        content_split.addWidget(self.panel)
+        side_split.addWidget(self.panel)
+        self.metrics_panel = KernelMetricsPanel()
+        side_split.addWidget(self.metrics_panel)
+        self.queue_panel = QueueDepthPanel()
+        side_split.addWidget(self.queue_panel)
+        self.queue_panel.setVisible(dock is not None)
+        self.trends_panel = TrendsPanel(self.recorder, self.db)
+        side_split.addWidget(self.trends_panel)
+        content_split.addWidget(side_split)
 
         # Log display — command prompt style
         log_wrap = QWidget()
@@ -246,30 +598,52 @@ class OverseerWindow(QMainWindow):
         log_layout.setContentsMargins(0, 0, 0, 0)
         log_layout.setSpacing(4)
 
+        log_header = QHBoxLayout()
         lbl_log = QLabel("EVENT LOG")
-        lbl_log.setStyleSheet(
-            f"color: {OVERSEER_DIM}; font-size: 9px; font-weight: bold; "
-            f"letter-spacing: 2px; background: transparent;"
+        lbl_log.setStyleSheet(_PANEL_LABEL_STYLE)
+        log_header.addWidget(lbl_log)
+        log_header.addStretch()
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("search log…")
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setFixedWidth(260)
+        self.search_box.setStyleSheet(
+            f"background: {BG_INPUT}; color: {OVERSEER_FG}; border: 1px solid {OVERSEER_BORDER}; "
+            f"padding: 2px 6px; font-size: 10px;"
         )
-        log_layout.addWidget(lbl_log)
+        log_header.addWidget(self.search_box)
+        log_layout.addLayout(log_header)
+
+        log_split = QSplitter(Qt.Vertical)
+        log_split.setStyleSheet(f"QSplitter::handle {{ background: {OVERSEER_BORDER}; height: 1px; }}")
+        log_split.setChildrenCollapsible(False)
 
-        self.log_display = QPlainTextEdit()
-        self.log_display.setReadOnly(True)
-        self.log_display.setFont(QFont("Consolas", 10))
+        self.log_model = LogModel(parent=self)
+        self.log_display = LogView(
+            self.log_model, LogDelegate(QFont("Consolas", 10), _SEV_COLORS, OVERSEER_DIM, OVERSEER_FG)
+        )
         self.log_display.setStyleSheet(f"""
-            QPlainTextEdit {{
+            QListView {{
                 background: {OVERSEER_BG};
-                color: {OVERSEER_FG};
                 border: 1px solid {OVERSEER_BORDER};
                 selection-background-color: #1a3a1a;
             }}
-            QPlainTextEdit::viewport {{
-                background: {OVERSEER_BG};
-            }}
         """)
-        log_layout.addWidget(self.log_display)
+        log_split.addWidget(self.log_display)
+        self.search_panel = LogSearchPanel(self.db)
+        self.search_panel.setVisible(False)
+        log_split.addWidget(self.search_panel)
+        log_layout.addWidget(log_split)
         content_split.addWidget(log_wrap)
 
+        # Search as you type, once typing pauses.
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(200)
+        self._search_timer.timeout.connect(self._run_search)
+        self.search_box.textChanged.connect(lambda _text: self._search_timer.start())
+        self.search_box.returnPressed.connect(self._run_search)
+
         content_split.setStretchFactor(0, 1)
         content_split.setStretchFactor(1, 3)
         content_split.setSizes([250, 700])
@@ -313,7 +687,7 @@ class OverseerWindow(QMainWindow):
             }}
             QPushButton:hover {{ border: 1px solid {FG_ERROR}; color: {FG_ERROR}; }}
         """)
-        self.btn_clear.clicked.connect(self.log_display.clear)
+        self.btn_clear.clicked.connect(self.log_model.clear)
 
         self.chk_viz = QCheckBox("VIZTRACER")
         self.chk_viz.setStyleSheet(ctrl_style)
@@ -323,42 +697,40 @@ class OverseerWindow(QMainWindow):
         controls_layout.addWidget(self.btn_clear)
         controls_layout.addWidget(self.chk_viz)
         controls_layout.addStretch()
+
+        self.lbl_db = QLabel()
+        self.lbl_db.setStyleSheet(f"color: {OVERSEER_DIM}; font-size: 9px; background: transparent;")
+        controls_layout.addWidget(self.lbl_db)
         main_layout.addLayout(controls_layout)
 
         # --- Signal connections ---
-        self.guard.sig_trace.connect(self._on_trace)
+        self.guard.sig_trace_event.connect(self._on_trace)
         self.guard.sig_status.connect(self._on_status)
         self.guard.sig_finished.connect(self._on_finished)
+        self.guard.sig_task_state.connect(self._on_task_state)
 
-        self._poll_timer = QTimer(self)
-        self._poll_timer.setInterval(300)
-        self._poll_timer.timeout.connect(self._refresh_active_tasks)
-        self._poll_timer.start()
+        self._metrics_timer = QTimer(self)
+        self._metrics_timer.setInterval(1000)
+        self._metrics_timer.timeout.connect(self._refresh_metrics)
+        self._metrics_timer.start()
 
     # ---- Filtering ----
 
-    def _is_severity_visible(self, severity: str) -> bool:
-        f = self._severity_filters.get(severity.upper())
-        return f.is_active() if f else True
+    def _apply_filters(self) -> None:
+        self.log_model.set_hidden({sev for sev, filt in self._severity_filters.items() if not filt.is_active()})
 
     def _apply_recipe(self, recipe_name: str):
         active = _RECIPE_PRESETS.get(recipe_name, set())
         for sev, filt in self._severity_filters.items():
             filt.set_active(sev in active)
+        self._apply_filters()
 
     # ---- Log helpers ----
 
     def _append_line(self, severity: str, text: str) -> None:
         if self._paused:
             return
-        if not self._is_severity_visible(severity):
-            return
-        color = _SEV_COLORS.get(severity.upper(), OVERSEER_FG)
-        self.log_display.appendHtml(
-            f'<span style="color:{OVERSEER_DIM}">[{self._now_label()}]</span> '
-            f'<span style="color:{color}">[{severity}]</span> '
-            f'<span style="color:{OVERSEER_FG}">{text}</span>'
-        )
+        self.log_model.append(self._now_label(), severity.upper(), text)
 
     def _now_label(self) -> str:
         return datetime.now().strftime("%H:%M:%S")
@@ -366,17 +738,18 @@ class OverseerWindow(QMainWindow):
     def _on_pause_toggled(self, checked: bool) -> None:
         self._paused = checked
 
+    def _run_search(self) -> None:
+        self._search_timer.stop()
+        text = self.search_box.text().strip()
+        self.search_panel.setVisible(bool(text))
+        if text:
+            self.search_panel.search(text)
+
     # ---- Signal handlers ----
 
-    def _on_trace(self, msg: str) -> None:
-        self.db.log_event("guard", "trace", {"message": msg})
-        sev = "INFO"
-        lowered = msg.lower()
-        if "error" in lowered:
-            sev = "ERROR"
-        elif "warn" in lowered:
-            sev = "WARNING"
-        self._append_line(sev, msg)
+    def _on_trace(self, event: TraceEvent) -> None:
+        self.db.log_trace(event)
+        self._append_line(event.level.value, event.text())
 
     def _on_status(self, engine_key: str, status) -> None:
         status_val = status.value if hasattr(status, "value") else str(status)
@@ -384,29 +757,49 @@ class OverseerWindow(QMainWindow):
         self._append_line("STATUS", f"{engine_key} → {status_val}")
 
     def _on_finished(self, engine_key: str, task_id: str) -> None:
-        self.db.log_task(str(task_id), engine_key, "DONE")
         self.db.log_event(engine_key, "finished", {"task_id": str(task_id)})
         self._append_line("FINISHED", f"{engine_key} task={task_id}")
 
-    def _refresh_active_tasks(self) -> None:
-        rows = []
-        for engine_key, task in self.guard.active_tasks.items():
-            if task is None:
-                if engine_key in self._last_task_state:
-                    prev = self._last_task_state.pop(engine_key)
-                    self.db.log_task(prev[0], engine_key, "CLEARED")
-                continue
-            status_val = task.status.value if hasattr(task.status, "value") else str(task.status)
-            current = (str(task.id), status_val)
-            if self._last_task_state.get(engine_key) != current:
-                self._last_task_state[engine_key] = current
-                self.db.log_task(str(task.id), engine_key, status_val)
-            rows.append((str(task.id), engine_key, status_val))
-        self.panel.set_tasks(rows)
+    def _on_task_state(self, task_id: str, _old, new: TaskStatus, _timing: dict) -> None:
+        previous = self._running.pop(task_id, None)
+        engine_key = self._engine_of(task_id) or (previous[0] if previous else "")
+        self.db.log_task(task_id, engine_key, new.value)
+        if new == TaskStatus.RUNNING:
+            self._running[task_id] = (engine_key, new.value)
+        if new == TaskStatus.RUNNING or previous is not None:
+            self.panel.set_tasks([(tid, key, status) for tid, (key, status) in self._running.items()])
+
+    def _engine_of(self, task_id: str) -> str:
+        # A broadcast pool task occupies every replica; show the pool.
+        keys = [key for key, task in self.guard.active_tasks.items() if task is not None and str(task.id) == task_id]
+        if not keys:
+            return ""
+        return keys[0] if len(keys) == 1 else pool_key(keys[0])
+
+    def _refresh_metrics(self) -> None:
+        if not self.isVisible():
+            return
+        snapshot = self.guard.metrics.snapshot()
+        for key, engine in self.guard.engines.items():
+            if key in snapshot["engines"] and hasattr(engine, "discard_stats"):
+                snapshot["engines"][key]["discarded"] = engine.discard_stats()
+        self.metrics_panel.set_snapshot(snapshot)
+        db = self.db.stats()
+        queues = self.dock.queue_snapshot() if self.dock is not None else {}
+        journal_failed = queues.get("journal", {}).get("failed", 0)
+        text = f"DB queued {db['queued']} · written {db['written']} · dropped {db['dropped']} · pruned {db['pruned']}"
+        if journal_failed:
+            text += f" · JOURNAL FAILED {journal_failed}"
+        self.lbl_db.setText(text)
+        color = FG_WARN if db["dropped"] or db["failed"] or journal_failed else OVERSEER_DIM
+        self.lbl_db.setStyleSheet(f"color: {color}; font-size: 9px; background: transparent;")
+        if self.dock is not None:
+            self.queue_panel.set_snapshot(queues)
+        self.trends_panel.refresh()
 
     def closeEvent(self, event: QCloseEvent) -> None:
-        self._poll_timer.stop()
+        # Only hides the window: logging and metrics continue, and the
+        # database is closed by the shutdown plan (bootstrap).
         if getattr(self.guard, "_viztracer", None) is not None:
             self.guard.enable_viztracer(False)
-        self.db.close()
         super().closeEvent(event)
@@ -19,6 +19,22 @@ from ui.components.complex import BehaviorTagInput
 from ui.components.message_widget import MessageWidget
 from core.llm_config import DEFAULT_CONFIG, MASTER_PROMPT, load_config, save_config
 from core.paths import ARCHIVE_DIR
+from core.trace import TraceLevel
+
+# Trace panel category per event code; unlisted codes show as INFO.
+_TRACE_STATES = {
+    "llm.load.init": "MODEL",
+    "llm.load.online": "MODEL",
+    "llm.load.cancelled": "MODEL",
+    "llm.load.cancel_requested": "MODEL",
+    "llm.unload.done": "MODEL",
+    "llm.inference.started": "INFERENCE",
+    "llm.inference.complete": "COMPLETE",
+    "llm.inference.aborted": "COMPLETE",
+}
+
+# Dock traces meaning a generate of this terminal will never produce output.
+_REJECTION_CODES = {"dock.rejected", "dock.dropped"}
 
 class PageChat(QWidget):
     sig_generate = Signal(str, bool)
@@ -560,38 +576,33 @@ Continue from the interruption point. Do not repeat earlier content.
         except Exception:
             pass
 
-    def append_trace(self, trace_msg):
-        lowered = trace_msg.lower()
+    def on_generate_rejected(self, reason):
+        # The kernel refused or dropped the generate: no output and no status
+        # change will follow, so stop waiting for it.
+        self.trace.appendPlainText(f"[REJECTED] {reason}")
+        self._awaiting_update_restart = False
+        self._pending_update_text = None
+        self._rewrite_assistant_index = None
+        if self._active_widget is not None:
+            self._active_widget.finalize()
+        self._active_widget = None
+        if self._update_trace_state == "streaming":
+            self._finalize_update_progress()
+        self._set_send_button_state(is_running=False)
 
+    def append_trace(self, event):
+        # Only generate tasks are subject to queue limits, so a rejection on
+        # this terminal's channel is always its own generate.
+        if event.code in _REJECTION_CODES:
+            self.on_generate_rejected(event.message)
+            return
         # --- Filter: only show LLM-relevant trace info ---
-        # Skip guard internals, status transitions, and noise
-        skip_patterns = [
-            "guard", "dispatch", "route", "bridge", "dock",
-            "addon", "registry", "host", "mount",
-        ]
-        for pat in skip_patterns:
-            if pat in lowered and "error" not in lowered:
-                return
-
-        # Categorize what we show
-        if "error" in lowered:
-            state = "ERROR"
-        elif "token" in lowered:
-            state = "TOKENIZING"
-        elif "inference started" in lowered:
-            state = "INFERENCE"
-        elif "inference" in lowered and ("complete" in lowered or "aborted" in lowered):
-            state = "COMPLETE"
-        elif "init backend" in lowered or "system online" in lowered:
-            state = "MODEL"
-        elif "unload" in lowered or "cancel" in lowered:
-            state = "MODEL"
-        elif "ctx" in lowered or "context" in lowered:
-            state = "CTX"
-        else:
-            state = "INFO"
-
-        self.trace.appendPlainText(f"[{state}] {trace_msg}")
+        # Kernel internals (guard, dispatch, addons) only surface as errors.
+        is_error = event.level == TraceLevel.ERROR
+        if event.source != "llm" and not is_error:
+            return
+        state = "ERROR" if is_error else _TRACE_STATES.get(event.code, "INFO")
+        self.trace.appendPlainText(f"[{state}] {event.message}")
 
     def clear_chat(self):
         self._set_current_session(self._create_session(), show_reset=True, sync_history=True)